@@ -4,23 +4,47 @@ import hashlib
 import os
 import time
 from werkzeug.utils import secure_filename
-import json
 from datetime import datetime
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email_config import get_email_config
-import re
-import math
+import heapq
 from collections import Counter
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from skill_matching import SkillMatcher, CompatibilityCache, SKILL_VECTORIZER_PATH
+from skill_vector_store import SkillVectorStore, SKILL_VECTORS_SCHEMA, VECTOR_SOURCES
+from skill_index import SkillInvertedIndex, RecommendationCache, read_data_version
+from skill_embeddings import SkillEmbeddings, IVFIndex
+from matcher_strategies import build_registry
+from skill_requirements import (
+    SkillRequirementStore, ProfileSkillIndex, JOB_SKILL_REQUIREMENTS_SCHEMA,
+    parse_skill_requirements, weighted_pair_score
+)
+from db_pool import SQLiteConnectionPool
+from db_migrations import migrate, run_migrations
+from match_details_store import MatchDetailsStore, APPLICATION_MATCH_DETAILS_SCHEMA, breakdown_counts
+from job_listing import JOB_TYPES, fetch_jobs_page, decode_cursor, parse_page_size
+from job_search import search_jobs, SEARCH_PAGE_SIZE, MAX_SEARCH_PAGE_SIZE, MAX_SEARCH_RESULTS
+from model_registry import model_registry
+from resume_parse_queue import (
+    ResumeParseQueue, RESUME_PARSE_JOBS_SCHEMA, RESUME_PARSE_JOBS_INDEXES, PARSE_WORKERS,
+)
 
 # AI Resume Parser Integration
 try:
-    from resume_ai_integration import JobSyncResumeAI
-    ai_resume_parser = JobSyncResumeAI()
+    from resume_ai_integration import get_resume_ai, MAX_INFERENCE_TOKENS
+    # JOBSYNC_RESUME_CACHE_MB=0 turns the parse cache off
+    ai_resume_parser = get_resume_ai(
+        cache_max_bytes=int(os.environ.get('JOBSYNC_RESUME_CACHE_MB', '256')) * 1024 * 1024,
+        # Long PDFs are split over this many processes; 0 extracts in the parse thread
+        pdf_workers=int(os.environ.get('JOBSYNC_PDF_WORKERS', '2')),
+        # Resumes are cut to this many tokens before NER; 0 parses them whole
+        ner_max_tokens=int(os.environ.get('JOBSYNC_NER_MAX_TOKENS', str(MAX_INFERENCE_TOKENS)))
+    )
+    # The NER model loads on the first parse unless preloaded, e.g. in the
+    # gunicorn master so that workers share it (see gunicorn.conf.py)
+    if os.environ.get('JOBSYNC_PRELOAD_MODELS') == '1':
+        ai_resume_parser.preload()
     AI_PARSING_ENABLED = True
     print("✅ AI Resume Parser loaded successfully")
 except ImportError as e:
@@ -46,6 +70,14 @@ app.config['MAIL_USERNAME'] = email_config['MAIL_USERNAME']
 app.config['MAIL_PASSWORD'] = email_config['MAIL_PASSWORD']
 app.config['MAIL_USE_REAL_EMAIL'] = email_config['USE_REAL_EMAIL']
 
+# Compatibility scoring strategy (tfidf, basic, report, embedding) and an
+# optional second strategy scored alongside it on a sample of requests
+app.config['MATCHER_STRATEGY'] = os.environ.get('JOBSYNC_MATCHER', 'tfidf')
+app.config['MATCHER_SHADOW'] = os.environ.get('JOBSYNC_MATCHER_SHADOW')
+app.config['MATCHER_SHADOW_RATE'] = float(os.environ.get('JOBSYNC_MATCHER_SHADOW_RATE', '0.1'))
+# Resume parser threads per process; 0 leaves parsing to other processes
+app.config['RESUME_PARSE_WORKERS'] = int(os.environ.get('JOBSYNC_PARSE_WORKERS', str(PARSE_WORKERS)))
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -172,9 +204,105 @@ def init_db():
         )
     ''')
 
+    # Precomputed skill vectors for jobs and profiles
+    cursor.execute(SKILL_VECTORS_SCHEMA)
+
+    # Compatibility breakdown stored per application
+    cursor.execute(APPLICATION_MATCH_DETAILS_SCHEMA)
+
+    # Per-skill weights and must-have flags of jobs
+    cursor.execute(JOB_SKILL_REQUIREMENTS_SCHEMA)
+
+    # Queue of background resume parse jobs
+    cursor.execute(RESUME_PARSE_JOBS_SCHEMA)
+    for statement in RESUME_PARSE_JOBS_INDEXES:
+        cursor.execute(statement)
+
     conn.commit()
+
+    # Columns and indexes added after the tables above were created
+    migrate(conn)
     conn.close()
 
+# SQL of the hot route queries; test_query_plans.py checks that each one
+# keeps using the index added for it
+LOGIN_QUERY = 'SELECT * FROM users WHERE email = ? AND password = ?'
+
+PROFILE_QUERY = 'SELECT * FROM user_profiles WHERE user_id = ?'
+
+# Duplicate-application check in apply_job
+APPLICATION_EXISTS_QUERY = 'SELECT id FROM applications WHERE job_id = ? AND applicant_id = ?'
+
+JOBSEEKER_APPLICATIONS_QUERY = '''
+    SELECT a.*, j.title as job_title, j.location, u.company_name
+    FROM applications a
+    JOIN jobs j ON a.job_id = j.id
+    JOIN users u ON a.employer_id = u.id
+    WHERE a.applicant_id = ?
+    ORDER BY a.applied_at DESC
+    LIMIT 10
+'''
+
+EMPLOYER_JOBS_QUERY = 'SELECT * FROM jobs WHERE employer_id = ? ORDER BY posted_at DESC'
+
+EMPLOYER_APPLICATIONS_QUERY = '''
+    SELECT a.*, j.title as job_title, u.id as applicant_user_id, u.username as applicant_name, u.email as applicant_email
+    FROM applications a
+    JOIN jobs j ON a.job_id = j.id
+    JOIN users u ON a.applicant_id = u.id
+    WHERE a.employer_id = ?
+    ORDER BY a.applied_at DESC
+    LIMIT 20
+'''
+
+# Latest applications with their stored match details; rows the backfill
+# has not reached yet come back with NULL details
+EVALUATION_APPLICATIONS_QUERY = '''
+    SELECT
+        a.job_id,
+        j.title,
+        j.skills as job_skills,
+        a.compatibility_score,
+        a.status,
+        a.applied_at,
+        u.username as candidate_name,
+        up.skills as candidate_skills,
+        md.semantic_score,
+        md.exact_matches,
+        md.semantic_matches,
+        md.missing_skills,
+        md.coverage_percentage
+    FROM applications a
+    JOIN jobs j ON a.job_id = j.id
+    JOIN users u ON a.applicant_id = u.id
+    LEFT JOIN user_profiles up ON up.user_id = a.applicant_id
+    LEFT JOIN application_match_details md ON md.application_id = a.id
+    ORDER BY a.applied_at DESC
+    LIMIT 50
+'''
+
+CHAT_HISTORY_QUERY = '''
+    SELECT * FROM chat_messages
+    ORDER BY timestamp DESC
+    LIMIT 50
+'''
+
+NEWSFEED_QUERY = '''
+    SELECT np.*,
+           (SELECT COUNT(*) FROM post_likes pl WHERE pl.post_id = np.id) as actual_likes_count,
+           (SELECT COUNT(*) FROM post_comments pc WHERE pc.post_id = np.id) as actual_comments_count,
+           (SELECT COUNT(*) FROM post_likes pl WHERE pl.post_id = np.id AND pl.user_id = ?) as user_liked
+    FROM news_posts np
+    ORDER BY np.created_at DESC
+    LIMIT 50
+'''
+
+POST_COMMENTS_QUERY = '''
+    SELECT * FROM post_comments
+    WHERE post_id = ?
+    ORDER BY created_at ASC
+'''
+
 # Helper functions
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
@@ -424,16 +552,25 @@ The JobSync Team
 
     return send_email(employer_email, subject, body)
 
+# Bring an existing database to the latest schema version, or create a new
+# one, before the background workers started below read its tables
+if os.path.exists('jobportal.db'):
+    run_migrations('jobportal.db')
+else:
+    init_db()
+
+# Pooled connections, configured once when created and bound to the
+# request that checked them out
+db_pool = SQLiteConnectionPool(
+    'jobportal.db',
+    max_size=int(os.environ.get('JOBSYNC_DB_POOL_SIZE', '10')),
+    timeout=30
+)
+db_pool.init_app(app)
+
 def get_db_connection():
-    """Get database connection with improved settings to prevent locks"""
-    conn = sqlite3.connect('jobportal.db', timeout=30)
-    conn.row_factory = sqlite3.Row
-    # Enable WAL mode for better concurrency
-    conn.execute('PRAGMA journal_mode=WAL;')
-    conn.execute('PRAGMA synchronous=NORMAL;')
-    conn.execute('PRAGMA cache_size=10000;')
-    conn.execute('PRAGMA temp_store=memory;')
-    return conn
+    """Get a pooled database connection; close() returns it to the pool"""
+    return db_pool.connection()
 
 class DatabaseConnection:
     """Context manager for database connections to ensure proper cleanup"""
@@ -452,233 +589,495 @@ class DatabaseConnection:
                 self.conn.rollback()
             self.conn.close()
 
-class SkillMatcher:
-    """Advanced skill matching using TF-IDF and cosine similarity"""
+# Initialize global skill matcher
+skill_matcher = SkillMatcher(vectorizer_path=SKILL_VECTORIZER_PATH)
 
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            lowercase=True,
-            stop_words='english',
-            ngram_range=(1, 2),  # Include both unigrams and bigrams
-            max_features=1000,
-            token_pattern=r'\b[a-zA-Z][a-zA-Z0-9+#.]*\b'  # Include tech terms like C++, C#, .NET
-        )
-        self.skill_synonyms = {
-            'js': 'javascript',
-            'ts': 'typescript',
-            'py': 'python',
-            'ml': 'machine learning',
-            'ai': 'artificial intelligence',
-            'db': 'database',
-            'sql': 'structured query language',
-            'nosql': 'non relational database',
-            'api': 'application programming interface',
-            'ui': 'user interface',
-            'ux': 'user experience',
-            'css3': 'css',
-            'html5': 'html',
-            'es6': 'javascript',
-            'react.js': 'react',
-            'vue.js': 'vue',
-            'node.js': 'nodejs',
-            'express.js': 'express',
-            'mongodb': 'mongo database',
-            'postgresql': 'postgres',
-            'mysql': 'my sql database',
-            'aws': 'amazon web services',
-            'gcp': 'google cloud platform',
-            'k8s': 'kubernetes',
-            'docker': 'containerization',
-            'ci/cd': 'continuous integration continuous deployment',
-            'devops': 'development operations',
-            'frontend': 'front end development',
-            'backend': 'back end development',
-            'fullstack': 'full stack development'
-        }
+def load_skill_corpus():
+    """Load every job and jobseeker skills string for vocabulary fitting"""
+    try:
+        conn = get_db_connection()
+        rows = conn.execute('''
+            SELECT skills FROM jobs WHERE skills IS NOT NULL AND skills != ''
+            UNION ALL
+            SELECT skills FROM user_profiles WHERE skills IS NOT NULL AND skills != ''
+        ''').fetchall()
+        conn.close()
+        return [row['skills'] for row in rows]
+    except sqlite3.Error as e:
+        print(f"Error loading skill corpus: {e}")
+        return []
+
+skill_vector_store = SkillVectorStore(skill_matcher)
+
+# Inverted indexes over stored skill vectors, keyed by owner type
+skill_indexes = {
+    'profile': SkillInvertedIndex('profile'),
+    'job': SkillInvertedIndex('job'),
+}
+
+# Ranked job recommendations per jobseeker
+recommendation_cache = RecommendationCache()
+# Index hits fetched per recommendation, before requirements drop some
+RECOMMENDATION_POOL_FACTOR = 3
+
+# Weighted / must-have job skills and the profile postings used to prune
+# candidates that miss a must-have
+skill_requirement_store = SkillRequirementStore(skill_matcher)
+profile_skill_index = ProfileSkillIndex()
+
+def get_profile_skill_index(conn):
+    """Canonical skill postings of all profiles, rebuilt when synonyms or profiles change"""
+    data_version = read_data_version(conn, 'profile')
+    if profile_skill_index.version != skill_matcher.synonyms_version \
+            or profile_skill_index.data_version != data_version:
+        rows = conn.execute("SELECT user_id, skills FROM user_profiles WHERE skills IS NOT NULL AND skills != ''")
+        profile_skill_index.build(skill_matcher.synonyms_version, {
+            row[0]: skill_matcher.normalizer.skill_ids(row[1]) for row in rows
+        }, data_version)
+    return profile_skill_index
+
+# Optional dense embedding engine; unavailable until skill_embeddings.py has
+# been run, in which case the TF-IDF path is used
+skill_embeddings = SkillEmbeddings(skill_matcher)
+skill_embeddings.load()
+
+embedding_indexes = {
+    'profile': IVFIndex('profile'),
+    'job': IVFIndex('job'),
+}
+
+def get_embedding_index(conn, owner_type):
+    """ANN index of embedded jobs or profiles, rebuilt when the embeddings or rows change"""
+    index = embedding_indexes[owner_type]
+    data_version = read_data_version(conn, owner_type)
+    if index.version != skill_embeddings.version or index.data_version != data_version:
+        table, key = VECTOR_SOURCES[owner_type]
+        vectors = {}
+        for row in conn.execute(f"SELECT {key}, skills FROM {table} WHERE skills IS NOT NULL AND skills != ''"):
+            vector = skill_embeddings.embed(row[1])
+            if vector is not None:
+                vectors[row[0]] = vector
+        index.build(skill_embeddings.version, vectors, data_version)
+    return index
+
+def rank_by_embedding(conn, owner_type, skills_text, k):
+    """Top-k (owner_id, score) by embedding similarity, or None if unavailable"""
+    query = skill_embeddings.embed(skills_text) if skills_text else None
+    if query is None:
+        return None
+    ranked = get_embedding_index(conn, owner_type).top_k(query, k)
+    return [(owner_id, int(round(max(0, min(100, similarity * 100))))) for owner_id, similarity in ranked]
+
+def get_skill_index(conn, owner_type):
+    """Inverted index for an owner type, rebuilt when the vocabulary or rows change"""
+    index = skill_indexes[owner_type]
+    # Read before loading vectors so a write meanwhile triggers another rebuild
+    data_version = read_data_version(conn, owner_type)
+    if index.vocabulary != skill_vector_store.vocabulary or index.data_version != data_version:
+        table, key = VECTOR_SOURCES[owner_type]
+        owner_ids = [row[0] for row in conn.execute(f'SELECT {key} FROM {table}').fetchall()]
+        vectors = skill_vector_store.get_vectors(conn, owner_type, owner_ids)
+        index.build(skill_vector_store.vocabulary, vectors, data_version)
+    return index
+
+def adopt_own_write(index, data_version):
+    """Whether an index may apply our own write in place instead of rebuilding
+
+    Our write bumped the data version by one; any larger gap means another
+    process wrote too, and the index is left stale so it is rebuilt.
+    """
+    if data_version is None or index.data_version != data_version - 1:
+        return False
+    index.data_version = data_version
+    return True
 
-    def preprocess_skills(self, skills_text):
-        """Preprocess and normalize skills text"""
-        if not skills_text:
-            return ""
-
-        # Convert to lowercase and split by common delimiters
-        skills = re.split(r'[,;|/\n\r]+', skills_text.lower())
-
-        # Clean and normalize each skill
-        processed_skills = []
-        for skill in skills:
-            skill = skill.strip()
-            if skill:
-                # Replace synonyms
-                skill = self.skill_synonyms.get(skill, skill)
-                # Remove special characters except + and #
-                skill = re.sub(r'[^\w\s+#.]', ' ', skill)
-                # Normalize whitespace
-                skill = ' '.join(skill.split())
-                if skill:
-                    processed_skills.append(skill)
-
-        return ' '.join(processed_skills)
-
-    def calculate_semantic_similarity(self, job_skills, candidate_skills):
-        """Calculate semantic similarity using TF-IDF and cosine similarity"""
-        if not job_skills or not candidate_skills:
-            return 0
+def rebuild_stored_vectors():
+    """Re-encode stored skill vectors that are missing or stale for the vocabulary"""
+    try:
+        conn = get_db_connection()
+        count = skill_vector_store.rebuild(conn)
+        conn.close()
+        print(f"✅ Rebuilt {count} skill vectors")
+    except sqlite3.Error as e:
+        print(f"Error rebuilding skill vectors: {e}")
+
+def rebuild_skill_vectors(matcher):
+    """Re-encode stored skill vectors after the vocabulary was refitted"""
+    rebuild_stored_vectors()
+    # Stored match details were computed with the previous vocabulary
+    match_details_store.start_backfill()
+
+def on_skills_changed(conn, owner_type, owner_id, skills_text):
+    """Hook for every write to jobs.skills or user_profiles.skills"""
+    data_version = read_data_version(conn, owner_type)
+    try:
+        vector = skill_vector_store.upsert(conn, owner_type, owner_id, skills_text)
+        conn.commit()
 
-        # Preprocess skills
-        job_text = self.preprocess_skills(job_skills)
-        candidate_text = self.preprocess_skills(candidate_skills)
+        # Keep a built index current instead of rebuilding it
+        index = skill_indexes.get(owner_type)
+        if vector is not None and index is not None and index.vocabulary == skill_vector_store.vocabulary \
+                and adopt_own_write(index, data_version):
+            index.add(owner_id, vector)
+    except sqlite3.Error as e:
+        print(f"Error storing skill vector for {owner_type} {owner_id}: {e}")
+
+    # Same for the embedding index
+    embedding_index = embedding_indexes.get(owner_type)
+    if embedding_index is not None and embedding_index.version is not None \
+            and embedding_index.version == skill_embeddings.version \
+            and adopt_own_write(embedding_index, data_version):
+        embedding_vector = skill_embeddings.embed(skills_text)
+        if embedding_vector is not None:
+            embedding_index.add(owner_id, embedding_vector)
+        else:
+            embedding_index.remove(owner_id)
 
-        if not job_text or not candidate_text:
-            return 0
+    if owner_type == 'profile' and profile_skill_index.version == skill_matcher.synonyms_version \
+            and adopt_own_write(profile_skill_index, data_version):
+        profile_skill_index.add(owner_id, skill_matcher.normalizer.skill_ids(skills_text))
 
-        try:
-            # Create TF-IDF vectors
-            documents = [job_text, candidate_text]
-            tfidf_matrix = self.vectorizer.fit_transform(documents)
+    # Job writes move the jobs counter, which every cached entry is keyed on
+    if owner_type == 'profile':
+        recommendation_cache.invalidate_user(owner_id)
 
-            # Calculate cosine similarity
-            similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-            similarity_score = similarity_matrix[0][0]
+    if skill_matcher.note_corpus_change(skills_text):
+        skill_matcher.refit_in_background(load_skill_corpus, on_refit=rebuild_skill_vectors)
 
-            # Convert to percentage and ensure it's between 0-100
-            percentage = max(0, min(100, similarity_score * 100))
+def weighted_job_score(conn, job_id, user_skills):
+    """Weighted coverage score for a job with requirements, None for a plain job"""
+    requirements = skill_requirement_store.load(conn, [job_id]).get(job_id)
+    if not requirements:
+        return None
+    return weighted_pair_score(requirements, skill_matcher.normalizer.known_skill_ids(user_skills))
 
-            return int(round(percentage))
+def calculate_stored_compatibility(conn, job, user_profile):
+    """Score a job/profile pair from stored vectors, falling back to text"""
+    # Weighted / must-have jobs are scored on their requirements
+    score = weighted_job_score(conn, job['id'], user_profile['skills'])
+    if score is not None:
+        return score
 
-        except Exception as e:
-            print(f"Error calculating semantic similarity: {e}")
-            # Fallback to basic matching
-            return self._basic_compatibility(job_skills, candidate_skills)
-
-    def _basic_compatibility(self, job_skills, user_skills):
-        """Fallback basic compatibility calculation"""
-        if not job_skills or not user_skills:
-            return 0
-
-        job_skills_list = [skill.strip().lower() for skill in job_skills.split(',')]
-        user_skills_list = [skill.strip().lower() for skill in user_skills.split(',')]
-
-        # Exact matches
-        exact_matches = set(job_skills_list) & set(user_skills_list)
-
-        # Partial matches (for similar skills)
-        partial_matches = 0
-        for job_skill in job_skills_list:
-            if job_skill not in exact_matches:
-                for user_skill in user_skills_list:
-                    if user_skill not in exact_matches:
-                        # Check for partial matches
-                        if (job_skill in user_skill or user_skill in job_skill) and len(job_skill) > 2:
-                            partial_matches += 0.5
-                            break
-
-        # Calculate compatibility
-        total_matches = len(exact_matches) + partial_matches
-        compatibility = (total_matches / len(job_skills_list)) * 100 if job_skills_list else 0
-
-        return min(int(compatibility), 100)
+    # Stored vectors are precomputed TF-IDF; other strategies score the text
+    if matcher_registry.active != 'tfidf':
+        return calculate_compatibility(job['skills'], user_profile['skills'])
 
-# Initialize global skill matcher
-skill_matcher = SkillMatcher()
+    try:
+        score = skill_vector_store.score(conn, job['id'], user_profile['user_id'])
+        if score is not None:
+            return score
+    except sqlite3.Error as e:
+        print(f"Error reading stored skill vectors: {e}")
+    return calculate_compatibility(job['skills'], user_profile['skills'])
+
+def score_jobs_for_candidate(conn, user_profile, jobs):
+    """Score a jobseeker against a list of jobs in one batch; {job_id: score}"""
+    if not user_profile or not user_profile['skills'] or not jobs:
+        return {}
+
+    scores = score_jobs_by_similarity(conn, user_profile, jobs)
+
+    # Jobs with weights or must-haves override the similarity score
+    requirements = skill_requirement_store.load(conn, scores)
+    if requirements:
+        skill_ids = skill_matcher.normalizer.known_skill_ids(user_profile['skills'])
+        for job_id, job_requirements in requirements.items():
+            scores[job_id] = weighted_pair_score(job_requirements, skill_ids)
+    return scores
+
+def score_jobs_by_similarity(conn, user_profile, jobs):
+    """Similarity scores of a jobseeker against a list of jobs; {job_id: score}"""
+    job_ids = [job['id'] for job in jobs]
+    if matcher_registry.active != 'tfidf':
+        return {job['id']: calculate_compatibility(job['skills'], user_profile['skills']) for job in jobs}
+
+    try:
+        scores = skill_vector_store.score_many(conn, user_profile['user_id'], job_ids)
+        if scores is not None:
+            return scores
+    except sqlite3.Error as e:
+        print(f"Error reading stored skill vectors: {e}")
+
+    return dict(zip(job_ids, skill_matcher.score_many(user_profile['skills'], [job['skills'] for job in jobs])))
+
+def rank_candidates_for_job(conn, job, k, engine='tfidf'):
+    """Top-k (user_id, score) jobseekers for a job, best first"""
+    # Must-haves prune the pool before any scoring happens
+    requirements = skill_requirement_store.load(conn, [job['id']]).get(job['id'])
+    if requirements:
+        return get_profile_skill_index(conn).rank(requirements, k)
+
+    if engine == 'embedding':
+        ranked = rank_by_embedding(conn, 'profile', job['skills'], k)
+        if ranked is not None:
+            return ranked
+
+    # Stored vectors are precomputed TF-IDF; other strategies score the text
+    if matcher_registry.active == 'tfidf':
+        try:
+            job_vector = skill_vector_store.get_vector(conn, 'job', job['id'])
+            if job_vector is not None:
+                ranked = get_skill_index(conn, 'profile').top_k(job_vector, k)
+                return [(user_id, int(round(max(0, min(100, similarity * 100))))) for user_id, similarity in ranked]
+        except sqlite3.Error as e:
+            print(f"Error reading stored skill vectors: {e}")
+
+    # No vocabulary yet, or another strategy: score every profile the slow way
+    profiles = conn.execute(
+        "SELECT user_id, skills FROM user_profiles WHERE skills IS NOT NULL AND skills != ''"
+    ).fetchall()
+    scored = ((profile['user_id'], calculate_compatibility(job['skills'], profile['skills'])) for profile in profiles)
+    return [item for item in heapq.nlargest(k, scored, key=lambda item: item[1]) if item[1] > 0]
+
+def apply_job_requirements(conn, user_skills, ranked):
+    """Re-score ranked (job_id, score) pairs of jobs with requirements, best first
+
+    Weighted jobs take their weighted score, as in score_jobs_for_candidate,
+    and jobs scoring 0 (a missing must-have) are dropped.
+    """
+    requirements = skill_requirement_store.load(conn, [job_id for job_id, _ in ranked])
+    if not requirements:
+        return ranked
+    skill_ids = skill_matcher.normalizer.known_skill_ids(user_skills)
+    rescored = [
+        (job_id, weighted_pair_score(requirements[job_id], skill_ids) if job_id in requirements else score)
+        for job_id, score in ranked
+    ]
+    # Stable sort: jobs without requirements keep their index order
+    rescored.sort(key=lambda item: item[1], reverse=True)
+    return [item for item in rescored if item[1] > 0]
+
+def recommend_jobs(conn, user_profile, k, engine='tfidf'):
+    """Top-k recommended jobs for a jobseeker, served from cache when valid"""
+    if not user_profile or not user_profile['skills']:
+        return []
+
+    # Embedding results are cached apart from TF-IDF ones
+    use_embedding = engine == 'embedding' and skill_embeddings.embed(user_profile['skills']) is not None
+    vocabulary = (f"embedding:{skill_embeddings.version}" if use_embedding
+                  else f"{matcher_registry.active}:{skill_vector_store.vocabulary}")
+
+    # Read before ranking so a job posted meanwhile invalidates this entry
+    user_id = user_profile['user_id']
+    jobs_version = read_data_version(conn, 'job')
+    cached = recommendation_cache.get(user_id, user_profile['skills'], vocabulary, jobs_version, k)
+    if cached is not None:
+        return cached
+
+    # Index hits are re-scored on job requirements, which can drop some of
+    # them, so the indexes are asked for a larger pool
+    pool_size = k * RECOMMENDATION_POOL_FACTOR
+    ranked = rank_by_embedding(conn, 'job', user_profile['skills'], pool_size) if use_embedding else None
+    if ranked is None and matcher_registry.active == 'tfidf':
+        try:
+            profile_vector = skill_vector_store.get_vector(conn, 'profile', user_id)
+            if profile_vector is not None:
+                ranked = [(job_id, int(round(max(0, min(100, similarity * 100)))))
+                          for job_id, similarity in get_skill_index(conn, 'job').top_k(profile_vector, pool_size)]
+        except sqlite3.Error as e:
+            print(f"Error reading stored skill vectors: {e}")
+
+    if ranked is not None:
+        ranked = apply_job_requirements(conn, user_profile['skills'], ranked)[:k]
+    else:
+        # No vocabulary yet, or another strategy: score the full jobs table in one batch
+        jobs_list = conn.execute('SELECT id, skills FROM jobs').fetchall()
+        scores = score_jobs_for_candidate(conn, user_profile, jobs_list)
+        ranked = [item for item in heapq.nlargest(k, scores.items(), key=lambda item: item[1]) if item[1] > 0]
+
+    # Load display fields for the ranked jobs only
+    jobs_by_id = {}
+    if ranked:
+        placeholders = ','.join('?' * len(ranked))
+        rows = conn.execute(f'''
+            SELECT j.id, j.title, j.location, j.job_type, j.salary, u.company_name
+            FROM jobs j
+            JOIN users u ON j.employer_id = u.id
+            WHERE j.id IN ({placeholders})
+        ''', [job_id for job_id, _ in ranked]).fetchall()
+        jobs_by_id = {row['id']: row for row in rows}
+
+    results = []
+    for job_id, score in ranked:
+        job = jobs_by_id.get(job_id)
+        if job:
+            results.append({
+                'job_id': job_id,
+                'title': job['title'],
+                'company_name': job['company_name'],
+                'location': job['location'],
+                'job_type': job['job_type'],
+                'salary': job['salary'],
+                'compatibility_score': score
+            })
+
+    recommendation_cache.put(user_id, user_profile['skills'], vocabulary, jobs_version, k, results)
+    return results
+
+# Memoized compatibility results, invalidated when the matcher version changes
+compatibility_cache = CompatibilityCache()
+
+# Scoring strategies behind one interface, selected by configuration
+try:
+    matcher_registry = build_registry(
+        skill_matcher, skill_embeddings,
+        app.config['MATCHER_STRATEGY'], app.config['MATCHER_SHADOW'], app.config['MATCHER_SHADOW_RATE']
+    )
+except ValueError as e:
+    print(f"⚠️ {e}; using tfidf")
+    matcher_registry = build_registry(skill_matcher, skill_embeddings)
 
 def calculate_compatibility(job_skills, user_skills):
     """Main compatibility calculation function using advanced semantic matching"""
-    return skill_matcher.calculate_semantic_similarity(job_skills, user_skills)
+    if not job_skills or not user_skills:
+        return 0
+
+    # Scores from different strategies are cached apart, each under the
+    # form of the skills strings that strategy actually reads
+    name = matcher_registry.active
+    strategy = matcher_registry.strategies[name]
+    return compatibility_cache.get_or_compute(
+        f'score:{name}', skill_matcher.version,
+        strategy.cache_text(job_skills), strategy.cache_text(user_skills),
+        lambda: matcher_registry.score(job_skills, user_skills)
+    )
 
 def get_compatibility_details(job_skills, user_skills):
     """Get detailed compatibility information with semantic analysis"""
     if not job_skills or not user_skills:
-        return {'score': 0, 'matched': [], 'missing': job_skills.split(',') if job_skills else [], 'semantic_analysis': {}}
-
-    # Get semantic similarity score
-    score = calculate_compatibility(job_skills, user_skills)
-
-    # Parse skills for detailed analysis
-    job_skills_list = [skill.strip() for skill in job_skills.split(',')]
-    user_skills_list = [skill.strip().lower() for skill in user_skills.split(',')]
-
-    # Find exact and partial matches
-    matched_skills = []
-    missing_skills = []
-    semantic_matches = []
-
-    for job_skill in job_skills_list:
-        job_skill_lower = job_skill.lower()
-        found = False
-
-        # Check for exact matches
-        for user_skill in user_skills_list:
-            if user_skill == job_skill_lower:
-                matched_skills.append(job_skill)
-                found = True
-                break
-
-        # Check for partial/semantic matches
-        if not found:
-            for user_skill in user_skills_list:
-                # Check synonyms
-                job_normalized = skill_matcher.skill_synonyms.get(job_skill_lower, job_skill_lower)
-                user_normalized = skill_matcher.skill_synonyms.get(user_skill, user_skill)
-
-                if (user_skill in job_skill_lower or job_skill_lower in user_skill or
-                    user_normalized in job_normalized or job_normalized in user_normalized):
-                    semantic_matches.append({
-                        'required': job_skill,
-                        'candidate': user_skill,
-                        'match_type': 'semantic'
-                    })
-                    found = True
-                    break
-
-        if not found:
-            missing_skills.append(job_skill)
-
-    # Calculate TF-IDF similarity for additional insights
-    try:
-        job_text = skill_matcher.preprocess_skills(job_skills)
-        user_text = skill_matcher.preprocess_skills(user_skills)
-
-        if job_text and user_text:
-            documents = [job_text, user_text]
-            tfidf_matrix = skill_matcher.vectorizer.fit_transform(documents)
-            feature_names = skill_matcher.vectorizer.get_feature_names_out()
-
-            # Get top terms for each document
-            job_tfidf = tfidf_matrix[0].toarray()[0]
-            user_tfidf = tfidf_matrix[1].toarray()[0]
-
-            # Find top terms
-            job_top_terms = [(feature_names[i], job_tfidf[i]) for i in job_tfidf.argsort()[-10:][::-1] if job_tfidf[i] > 0]
-            user_top_terms = [(feature_names[i], user_tfidf[i]) for i in user_tfidf.argsort()[-10:][::-1] if user_tfidf[i] > 0]
-
-            semantic_analysis = {
-                'job_key_terms': job_top_terms[:5],
-                'candidate_key_terms': user_top_terms[:5],
-                'tfidf_similarity': score / 100.0
-            }
-        else:
-            semantic_analysis = {}
+        return skill_matcher.match_details(job_skills, user_skills)
+
+    def compute():
+        details = skill_matcher.match_details(job_skills, user_skills)
+        # The breakdown is strategy-independent; the score is the active strategy's
+        if strategy != 'tfidf':
+            details['score'] = calculate_compatibility(job_skills, user_skills)
+        details['strategy'] = strategy
+        return details
+
+    # Keyed on the raw strings: the breakdown echoes skills as entered
+    strategy = matcher_registry.active
+    return compatibility_cache.get_or_compute(
+        f'details:{strategy}', skill_matcher.version, job_skills, user_skills, compute
+    )
 
+def get_job_compatibility_details(conn, job_id, job_skills, user_skills):
+    """Details for a stored job, scored like calculate_stored_compatibility"""
+    details = get_compatibility_details(job_skills, user_skills)
+    score = weighted_job_score(conn, job_id, user_skills)
+    if score is not None:
+        # Cached details are shared; override the score on a copy
+        details = dict(details, score=score)
+    return details
+
+# Per-application compatibility breakdowns, recomputed in the background
+# whenever the matcher version or the active strategy changes
+match_details_store = MatchDetailsStore(
+    get_db_connection, get_job_compatibility_details,
+    lambda: f'{matcher_registry.active}:{skill_matcher.version_tag}'
+)
+
+# Reuse the persisted vocabulary; otherwise one is fitted from the database
+# by start_background_workers without blocking startup
+SKILL_VECTORIZER_LOADED = skill_matcher.load_vectorizer()
+# Set once run_startup_maintenance has done the one-time fit and backfill
+STARTUP_MAINTENANCE_DONE = False
+
+# Default profile fields when a resume cannot be parsed with AI
+BASIC_RESUME_FIELDS = {
+    'skills': "Python, JavaScript, React, Flask, SQL, Git, HTML, CSS",
+    'experience': "3+ years of web development experience",
+    'education': "Bachelor's degree in Computer Science",
+}
+
+def parse_resume_file(file_path):
+    """Profile fields extracted from a resume, with a message for the user"""
+    if not (AI_PARSING_ENABLED and ai_resume_parser):
+        # Basic parsing when AI is not available
+        return {**BASIC_RESUME_FIELDS, 'confidence': None,
+                'message': 'Resume uploaded and parsed successfully!', 'level': 'success'}
+
+    print(f"🤖 Parsing resume with AI: {os.path.basename(file_path)}")
+    try:
+        ai_result = ai_resume_parser.parse_resume_with_ai(file_path)
     except Exception as e:
-        print(f"Error in semantic analysis: {e}")
-        semantic_analysis = {}
+        print(f"❌ AI parsing error: {e}")
+        return {**BASIC_RESUME_FIELDS, 'confidence': None,
+                'message': 'Resume uploaded! AI parsing failed - using basic extraction.', 'level': 'warning'}
+
+    if not ai_result or 'jobsync_formatted' not in ai_result:
+        return {**BASIC_RESUME_FIELDS, 'confidence': None,
+                'message': 'Resume uploaded! AI parsing unavailable - using basic extraction.', 'level': 'warning'}
 
+    parsed_data = ai_result['jobsync_formatted']
+    confidence_score = parsed_data.get('parsing_confidence', 0)
+    print(f"✅ AI parsing successful - Confidence: {confidence_score}%")
     return {
-        'score': score,
-        'matched': matched_skills,
-        'missing': missing_skills,
-        'semantic_matches': semantic_matches,
-        'total_required': len(job_skills_list),
-        'semantic_analysis': semantic_analysis,
-        'match_breakdown': {
-            'exact_matches': len(matched_skills),
-            'semantic_matches': len(semantic_matches),
-            'missing_skills': len(missing_skills),
-            'coverage_percentage': ((len(matched_skills) + len(semantic_matches)) / len(job_skills_list) * 100) if job_skills_list else 0
-        }
+        'skills': parsed_data.get('skills', 'Python, JavaScript, React, Flask, SQL'),
+        'experience': parsed_data.get('experience', '2+ years of experience'),
+        'education': parsed_data.get('education', 'Bachelor\'s degree'),
+        'confidence': confidence_score,
+        'message': f'Resume parsed with AI! (Confidence: {confidence_score}%)',
+        'level': 'success',
     }
 
+def apply_parsed_resume(conn, job, result):
+    """Write a finished parse to the profile unless a newer upload already landed"""
+    newer = conn.execute('''
+        SELECT 1 FROM resume_parse_jobs
+        WHERE user_id = ? AND id > ? AND status = 'done'
+    ''', (job['user_id'], job['id'])).fetchone()
+    if newer:
+        return
+
+    # resume_filename was already stored by the upload
+    conn.execute('''
+        UPDATE user_profiles
+        SET skills = ?, experience = ?, education = ?
+        WHERE user_id = ?
+    ''', (result['skills'], result['experience'], result['education'], job['user_id']))
+    conn.commit()
+    on_skills_changed(conn, 'profile', job['user_id'], result['skills'])
+
+# Uploads only enqueue; worker threads parse and update the profile
+resume_parse_queue = ResumeParseQueue(
+    get_db_connection, parse_resume_file, apply_parsed_resume,
+    workers=app.config['RESUME_PARSE_WORKERS'],
+)
+
+def run_startup_maintenance():
+    """Fit the vocabulary if none was saved and backfill match details; blocks
+
+    A gunicorn master that preloads the app runs this once before forking
+    (see gunicorn.conf.py), so its workers inherit the vocabulary and find
+    the stored vectors and details current instead of each redoing the work.
+    """
+    global STARTUP_MAINTENANCE_DONE
+    if not SKILL_VECTORIZER_LOADED and skill_matcher.refit(load_skill_corpus):
+        rebuild_stored_vectors()
+    match_details_store.run_backfill()
+    STARTUP_MAINTENANCE_DONE = True
+
+def start_background_workers():
+    """Start the vocabulary fit or match details backfill, and the resume parse workers
+
+    Threads do not survive fork, so when gunicorn preloads the app in its
+    master this runs in every worker instead (see gunicorn.conf.py); the
+    fit and backfill are then skipped, since the master already did them.
+    """
+    # The PDF pool forks, so it goes first, while this is the only thread
+    if ai_resume_parser:
+        ai_resume_parser.pdf_extractor.start_pool()
+    if not STARTUP_MAINTENANCE_DONE:
+        if not SKILL_VECTORIZER_LOADED:
+            skill_matcher.refit_in_background(load_skill_corpus, on_refit=rebuild_skill_vectors)
+        else:
+            match_details_store.start_backfill()
+    resume_parse_queue.start()
+
+if os.environ.get('JOBSYNC_DEFER_BACKGROUND_WORKERS') != '1':
+    start_background_workers()
+
 # This function is replaced by the enhanced email system above
 
 # Routes
@@ -774,10 +1173,7 @@ def login():
         hashed_password = hash_password(password)
 
         conn = get_db_connection()
-        user = conn.execute(
-            'SELECT * FROM users WHERE email = ? AND password = ?',
-            (email, hashed_password)
-        ).fetchone()
+        user = conn.execute(LOGIN_QUERY, (email, hashed_password)).fetchone()
         conn.close()
 
         if user:
@@ -823,25 +1219,21 @@ def jobseeker_dashboard():
     conn = get_db_connection()
 
     # Get user profile
-    profile = conn.execute(
-        'SELECT * FROM user_profiles WHERE user_id = ?',
-        (session['user_id'],)
-    ).fetchone()
+    profile = conn.execute(PROFILE_QUERY, (session['user_id'],)).fetchone()
 
     # Get recent applications
-    applications = conn.execute('''
-        SELECT a.*, j.title as job_title, j.location, u.company_name
-        FROM applications a
-        JOIN jobs j ON a.job_id = j.id
-        JOIN users u ON a.employer_id = u.id
-        WHERE a.applicant_id = ?
-        ORDER BY a.applied_at DESC
-        LIMIT 10
-    ''', (session['user_id'],)).fetchall()
+    applications = conn.execute(JOBSEEKER_APPLICATIONS_QUERY, (session['user_id'],)).fetchall()
+
+    # Personalized job recommendations
+    recommendations = recommend_jobs(conn, profile, 5)
+
+    # A resume still being parsed is followed from the page
+    parse_job_id = resume_parse_queue.latest_pending(conn, session['user_id'])
 
     conn.close()
 
-    return render_template('jobseeker_dashboard.html', profile=profile, applications=applications)
+    return render_template('jobseeker_dashboard.html', profile=profile, applications=applications,
+                           recommendations=recommendations, parse_job_id=parse_job_id)
 
 @app.route('/employer_dashboard')
 def employer_dashboard():
@@ -851,21 +1243,10 @@ def employer_dashboard():
     conn = get_db_connection()
 
     # Get employer's jobs
-    jobs = conn.execute(
-        'SELECT * FROM jobs WHERE employer_id = ? ORDER BY posted_at DESC',
-        (session['user_id'],)
-    ).fetchall()
+    jobs = conn.execute(EMPLOYER_JOBS_QUERY, (session['user_id'],)).fetchall()
 
     # Get applications for employer's jobs
-    applications = conn.execute('''
-        SELECT a.*, j.title as job_title, u.id as applicant_user_id, u.username as applicant_name, u.email as applicant_email
-        FROM applications a
-        JOIN jobs j ON a.job_id = j.id
-        JOIN users u ON a.applicant_id = u.id
-        WHERE a.employer_id = ?
-        ORDER BY a.applied_at DESC
-        LIMIT 20
-    ''', (session['user_id'],)).fetchall()
+    applications = conn.execute(EMPLOYER_APPLICATIONS_QUERY, (session['user_id'],)).fetchall()
 
     conn.close()
 
@@ -893,9 +1274,12 @@ def profile():
         flash('Profile updated successfully!', 'success')
         conn.commit()
 
+        if session['user_type'] == 'jobseeker':
+            on_skills_changed(conn, 'profile', session['user_id'], skills)
+
     # Get user data
     user = conn.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],)).fetchone()
-    profile = conn.execute('SELECT * FROM user_profiles WHERE user_id = ?', (session['user_id'],)).fetchone()
+    profile = conn.execute(PROFILE_QUERY, (session['user_id'],)).fetchone()
 
     conn.close()
 
@@ -920,105 +1304,74 @@ def upload_resume():
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(file_path)
 
-        # AI Resume Parsing
-        if AI_PARSING_ENABLED and ai_resume_parser:
-            try:
-                print(f"🤖 Parsing resume with AI: {filename}")
-                ai_result = ai_resume_parser.parse_resume_with_ai(file_path)
-
-                if ai_result and 'jobsync_formatted' in ai_result:
-                    parsed_data = ai_result['jobsync_formatted']
-
-                    # Extract parsed information
-                    extracted_skills = parsed_data.get('skills', 'Python, JavaScript, React, Flask, SQL')
-                    extracted_experience = parsed_data.get('experience', '2+ years of experience')
-                    extracted_education = parsed_data.get('education', 'Bachelor\'s degree')
-                    confidence_score = parsed_data.get('parsing_confidence', 0)
-
-                    print(f"✅ AI parsing successful - Confidence: {confidence_score}%")
-                    print(f"   Skills: {extracted_skills[:50]}...")
-
-                    flash_message = f'Resume uploaded and parsed with AI! (Confidence: {confidence_score}%)'
-                    flash_type = 'success'
-
-                else:
-                    # Fallback to basic parsing
-                    extracted_skills = "Python, JavaScript, React, Flask, SQL, Git, HTML, CSS"
-                    extracted_experience = "3+ years of web development experience"
-                    extracted_education = "Bachelor's degree in Computer Science"
-
-                    flash_message = 'Resume uploaded! AI parsing unavailable - using basic extraction.'
-                    flash_type = 'warning'
-
-            except Exception as e:
-                print(f"❌ AI parsing error: {e}")
-                # Fallback to basic parsing
-                extracted_skills = "Python, JavaScript, React, Flask, SQL, Git, HTML, CSS"
-                extracted_experience = "3+ years of web development experience"
-                extracted_education = "Bachelor's degree in Computer Science"
-
-                flash_message = 'Resume uploaded! AI parsing failed - using basic extraction.'
-                flash_type = 'warning'
-        else:
-            # Basic parsing when AI is not available
-            extracted_skills = "Python, JavaScript, React, Flask, SQL, Git, HTML, CSS"
-            extracted_experience = "3+ years of web development experience"
-            extracted_education = "Bachelor's degree in Computer Science"
-
-            flash_message = 'Resume uploaded and parsed successfully!'
-            flash_type = 'success'
-
-        # Update user profile
+        # The resume is on file right away, so the jobseeker can apply while
+        # parsing runs in the background; the dashboard follows its progress
         conn = get_db_connection()
-        conn.execute('''
-            UPDATE user_profiles
-            SET skills = ?, experience = ?, education = ?, resume_filename = ?
-            WHERE user_id = ?
-        ''', (extracted_skills, extracted_experience, extracted_education, filename, session['user_id']))
+        conn.execute('UPDATE user_profiles SET resume_filename = ? WHERE user_id = ?',
+                     (filename, session['user_id']))
         conn.commit()
+        resume_parse_queue.enqueue(conn, session['user_id'], file_path, filename)
         conn.close()
 
-        flash(flash_message, flash_type)
+        flash('Resume uploaded! Extracting your skills in the background...', 'info')
     else:
         flash('Please upload a PDF, DOC, or DOCX file only!', 'error')
 
     return redirect(url_for('jobseeker_dashboard'))
 
+@app.route('/api/resume_parse/<int:job_id>')
+def resume_parse_status(job_id):
+    """Status of one of the jobseeker's resume parse jobs"""
+    if 'user_id' not in session or session['user_type'] != 'jobseeker':
+        return jsonify({'error': 'Not authorized'}), 403
+
+    conn = get_db_connection()
+    status = resume_parse_queue.status(conn, job_id, session['user_id'])
+    conn.close()
+
+    if status is None:
+        return jsonify({'error': 'Parse job not found'}), 404
+    return jsonify({'success': True, **status})
+
 @app.route('/jobs')
 def jobs():
     if 'user_id' not in session:
         return redirect(url_for('login'))
 
+    filters = {
+        'keyword': request.args.get('q', '').strip(),
+        'location': request.args.get('location', '').strip(),
+        'job_type': request.args.get('job_type', '').strip(),
+    }
+    if filters['job_type'] not in JOB_TYPES:
+        filters['job_type'] = ''
+    limit = parse_page_size(request.args.get('limit'))
+
     conn = get_db_connection()
 
-    # Get all jobs (except those posted by current user if they're an employer)
-    if session['user_type'] == 'employer':
-        jobs_list = conn.execute('''
-            SELECT j.*, u.company_name, u.username as employer_name
-            FROM jobs j
-            JOIN users u ON j.employer_id = u.id
-            WHERE j.employer_id != ?
-            ORDER BY j.posted_at DESC
-        ''', (session['user_id'],)).fetchall()
-    else:
-        jobs_list = conn.execute('''
-            SELECT j.*, u.company_name, u.username as employer_name
-            FROM jobs j
-            JOIN users u ON j.employer_id = u.id
-            ORDER BY j.posted_at DESC
-        ''').fetchall()
+    # One page of jobs (except those posted by current user if they're an employer)
+    jobs_list, next_cursor = fetch_jobs_page(
+        conn,
+        after=decode_cursor(request.args.get('after')),
+        exclude_employer_id=session['user_id'] if session['user_type'] == 'employer' else None,
+        limit=limit,
+        **filters,
+    )
 
     # Get user profile for compatibility scoring (if jobseeker)
     user_profile = None
     if session['user_type'] == 'jobseeker':
-        user_profile = conn.execute(
-            'SELECT * FROM user_profiles WHERE user_id = ?',
-            (session['user_id'],)
-        ).fetchone()
+        user_profile = conn.execute(PROFILE_QUERY, (session['user_id'],)).fetchone()
+
+    # Score the jobs on this page in one batch instead of once per card
+    compatibility_scores = score_jobs_for_candidate(conn, user_profile, jobs_list)
 
     conn.close()
 
-    return render_template('jobs.html', jobs=jobs_list, user_profile=user_profile, calculate_compatibility=calculate_compatibility)
+    return render_template('jobs.html', jobs=jobs_list, user_profile=user_profile,
+                           compatibility_scores=compatibility_scores, filters=filters,
+                           limit=limit, next_cursor=next_cursor,
+                           is_first_page=not request.args.get('after'))
 
 @app.route('/post_job', methods=['GET', 'POST'])
 def post_job():
@@ -1041,7 +1394,17 @@ def post_job():
         ''', (session['user_id'], title, description, requirements, skills, salary, location, job_type))
 
         job_id = cursor.lastrowid
+
+        # Optional per-skill weights and must-have skills
+        requirements = parse_skill_requirements(
+            skill_matcher.normalizer, skills,
+            request.form.get('required_skills', ''), request.form.get('skill_weights', '')
+        )
+        if requirements:
+            skill_requirement_store.save(conn, job_id, requirements)
+
         conn.commit()
+        on_skills_changed(conn, 'job', job_id, skills)
         conn.close()
 
         # Send email notification to employer
@@ -1065,10 +1428,7 @@ def apply_job(job_id):
     conn = get_db_connection()
 
     # Check if already applied
-    existing_application = conn.execute(
-        'SELECT id FROM applications WHERE job_id = ? AND applicant_id = ?',
-        (job_id, session['user_id'])
-    ).fetchone()
+    existing_application = conn.execute(APPLICATION_EXISTS_QUERY, (job_id, session['user_id'])).fetchone()
 
     if existing_application:
         flash('You have already applied for this job!', 'warning')
@@ -1083,10 +1443,7 @@ def apply_job(job_id):
         return redirect(url_for('jobs'))
 
     # Get user profile for compatibility scoring
-    user_profile = conn.execute(
-        'SELECT * FROM user_profiles WHERE user_id = ?',
-        (session['user_id'],)
-    ).fetchone()
+    user_profile = conn.execute(PROFILE_QUERY, (session['user_id'],)).fetchone()
 
     if not user_profile or not user_profile['resume_filename']:
         flash('Please upload your resume before applying!', 'error')
@@ -1094,7 +1451,7 @@ def apply_job(job_id):
         return redirect(url_for('jobseeker_dashboard'))
 
     # Calculate compatibility score
-    compatibility_score = calculate_compatibility(job['skills'], user_profile['skills'])
+    compatibility_score = calculate_stored_compatibility(conn, job, user_profile)
 
     # Get employer details for email notification
     employer = conn.execute(
@@ -1103,10 +1460,15 @@ def apply_job(job_id):
     ).fetchone()
 
     # Create application
-    conn.execute('''
+    cursor = conn.execute('''
         INSERT INTO applications (job_id, applicant_id, employer_id, compatibility_score)
         VALUES (?, ?, ?, ?)
     ''', (job_id, session['user_id'], job['employer_id'], compatibility_score))
+
+    # Store the breakdown so reports never recompute it
+    if job['skills'] and user_profile['skills']:
+        details = get_job_compatibility_details(conn, job_id, job['skills'], user_profile['skills'])
+        match_details_store.store(conn, cursor.lastrowid, details)
     conn.commit()
     conn.close()
 
@@ -1151,11 +1513,7 @@ def chat():
     conn = get_db_connection()
 
     # Get recent chat messages
-    messages = conn.execute('''
-        SELECT * FROM chat_messages
-        ORDER BY timestamp DESC
-        LIMIT 50
-    ''').fetchall()
+    messages = conn.execute(CHAT_HISTORY_QUERY).fetchall()
 
     # Reverse to show oldest first
     messages = list(reversed(messages))
@@ -1189,11 +1547,7 @@ def get_messages():
         return jsonify({'error': 'Not logged in'}), 401
 
     conn = get_db_connection()
-    messages = conn.execute('''
-        SELECT * FROM chat_messages
-        ORDER BY timestamp DESC
-        LIMIT 50
-    ''').fetchall()
+    messages = conn.execute(CHAT_HISTORY_QUERY).fetchall()
     conn.close()
 
     # Convert to list of dicts
@@ -1356,10 +1710,7 @@ def applicant_profile(applicant_id):
         (applicant_id,)
     ).fetchone()
 
-    user_profile = conn.execute(
-        'SELECT * FROM user_profiles WHERE user_id = ?',
-        (applicant_id,)
-    ).fetchone()
+    user_profile = conn.execute(PROFILE_QUERY, (applicant_id,)).fetchone()
 
     # Get applicant's applications to this employer's jobs
     applications = conn.execute('''
@@ -1382,6 +1733,124 @@ def applicant_profile(applicant_id):
                          applications=applications,
                          calculate_compatibility=calculate_compatibility)
 
+@app.route('/api/recommendations')
+def get_recommendations():
+    """Top-k jobs for the logged-in jobseeker by compatibility"""
+    if 'user_id' not in session or session['user_type'] != 'jobseeker':
+        return jsonify({'error': 'Not authorized'}), 403
+
+    k = min(max(request.args.get('k', 10, type=int), 1), 50)
+    engine = request.args.get('engine', 'tfidf')
+
+    conn = get_db_connection()
+    profile = conn.execute(PROFILE_QUERY, (session['user_id'],)).fetchone()
+    results = recommend_jobs(conn, profile, k, engine)
+    conn.close()
+
+    return jsonify({
+        'success': True,
+        'recommendations': results
+    })
+
+@app.route('/api/jobs/search')
+def search_jobs_api():
+    """Full-text job search ranked by bm25, optionally blended with compatibility"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authorized'}), 403
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+
+    limit = min(max(request.args.get('limit', SEARCH_PAGE_SIZE, type=int), 1), MAX_SEARCH_PAGE_SIZE)
+    offset = min(max(request.args.get('offset', 0, type=int), 0), MAX_SEARCH_RESULTS)
+    blend = request.args.get('blend', 0.0, type=float)
+
+    conn = get_db_connection()
+
+    # Blending needs the jobseeker's skills; others get the plain text rank
+    score_jobs = None
+    if blend > 0 and session['user_type'] == 'jobseeker':
+        profile = conn.execute(PROFILE_QUERY, (session['user_id'],)).fetchone()
+        if profile and profile['skills']:
+            score_jobs = lambda rows: score_jobs_for_candidate(conn, profile, rows)
+
+    try:
+        results, next_offset = search_jobs(
+            conn, query, limit=limit, offset=offset,
+            exclude_employer_id=session['user_id'] if session['user_type'] == 'employer' else None,
+            score_jobs=score_jobs, blend=blend,
+        )
+    except sqlite3.OperationalError as e:
+        conn.close()
+        print(f"Error searching jobs: {e}")
+        return jsonify({'error': 'Job search is unavailable'}), 503
+
+    conn.close()
+
+    return jsonify({
+        'success': True,
+        'query': query,
+        'blended': score_jobs is not None,
+        'results': results,
+        'next_offset': next_offset,
+    })
+
+@app.route('/api/jobs/<int:job_id>/top_candidates')
+def top_candidates(job_id):
+    """Rank the best matching jobseekers for one of the employer's jobs"""
+    if 'user_id' not in session or session['user_type'] != 'employer':
+        return jsonify({'error': 'Not authorized'}), 403
+
+    k = min(max(request.args.get('k', 50, type=int), 1), 200)
+    engine = request.args.get('engine', 'tfidf')
+
+    conn = get_db_connection()
+    job = conn.execute(
+        'SELECT * FROM jobs WHERE id = ? AND employer_id = ?',
+        (job_id, session['user_id'])
+    ).fetchone()
+
+    if not job:
+        conn.close()
+        return jsonify({'error': 'Job not found'}), 404
+
+    ranked = rank_candidates_for_job(conn, job, k, engine)
+
+    # Load names and skills for the top hits only
+    candidates = {}
+    if ranked:
+        placeholders = ','.join('?' * len(ranked))
+        rows = conn.execute(f'''
+            SELECT u.id, u.username, up.skills
+            FROM users u
+            JOIN user_profiles up ON up.user_id = u.id
+            WHERE u.id IN ({placeholders})
+        ''', [user_id for user_id, _ in ranked]).fetchall()
+        candidates = {row['id']: row for row in rows}
+
+    results = []
+    for user_id, score in ranked:
+        candidate = candidates.get(user_id)
+        if not candidate:
+            continue
+        results.append({
+            'rank': len(results) + 1,
+            'user_id': user_id,
+            'username': candidate['username'],
+            'compatibility_score': score,
+            'details': get_job_compatibility_details(conn, job_id, job['skills'], candidate['skills'])
+        })
+
+    conn.close()
+
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'job_title': job['title'],
+        'candidates': results
+    })
+
 @app.route('/forgot_password', methods=['POST'])
 def forgot_password():
     """Handle password reset requests (Demo version)"""
@@ -1512,15 +1981,12 @@ def test_similarity():
         if not job_skills or not candidate_skills:
             return jsonify({'error': 'Both job_skills and candidate_skills are required'}), 400
 
-        # Calculate compatibility
-        compatibility_score = calculate_compatibility(job_skills, candidate_skills)
-
-        # Get detailed analysis
+        # Detailed analysis includes the compatibility score
         details = get_compatibility_details(job_skills, candidate_skills)
 
         return jsonify({
             'success': True,
-            'compatibility_score': compatibility_score,
+            'compatibility_score': details['score'],
             'details': details,
             'job_skills_processed': skill_matcher.preprocess_skills(job_skills),
             'candidate_skills_processed': skill_matcher.preprocess_skills(candidate_skills)
@@ -1529,6 +1995,60 @@ def test_similarity():
     except Exception as e:
         return jsonify({'error': f'Error calculating similarity: {str(e)}'}), 500
 
+@app.route('/api/matcher_stats')
+def matcher_stats():
+    """Runtime statistics of the skill matching engine"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+
+    return jsonify({
+        'success': True,
+        'vocabulary': {
+            'corpus_mode': skill_matcher.corpus_mode,
+            'corpus_size': skill_matcher.corpus_size,
+            'signature': skill_matcher.corpus_signature,
+            'changes_since_fit': skill_matcher.changes_since_fit
+        },
+        'compatibility_cache': compatibility_cache.stats(),
+        'strategies': matcher_registry.stats(),
+        'embeddings': {
+            'available': skill_embeddings.available,
+            'skills': len(skill_embeddings.skills),
+            'indexed_jobs': len(embedding_indexes['job']),
+            'indexed_profiles': len(embedding_indexes['profile'])
+        },
+        'match_details_backfill': {
+            'running': match_details_store.backfill_running,
+            'last_run': match_details_store.last_backfill
+        }
+    })
+
+@app.route('/api/db_stats')
+def db_stats():
+    """Connection pool and resume pipeline metrics"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+
+    conn = get_db_connection()
+    parse_queue = resume_parse_queue.stats(conn)
+    conn.close()
+
+    return jsonify({
+        'success': True,
+        'pool': db_pool.stats(),
+        'resume_parse_queue': parse_queue,
+        'resume_parse_cache': ai_resume_parser.cache.stats() if ai_resume_parser and ai_resume_parser.cache else None,
+        'pdf_extraction': ai_resume_parser.pdf_extractor.stats() if ai_resume_parser else None
+    })
+
+@app.route('/api/model_stats')
+def model_stats():
+    """Load time and resident memory of the models loaded in this worker"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+
+    return jsonify({'success': True, **model_registry.stats()})
+
 @app.route('/similarity_test')
 def similarity_test():
     """Test page for semantic similarity"""
@@ -1867,44 +2387,40 @@ def get_evaluation_data():
     try:
         conn = get_db_connection()
 
-        # Get application statistics
-        applications_data = conn.execute('''
-            SELECT
-                j.title,
-                j.skills as job_skills,
-                up.skills as candidate_skills,
-                a.compatibility_score,
-                a.status,
-                a.applied_at,
-                u.username as candidate_name
-            FROM applications a
-            JOIN jobs j ON a.job_id = j.id
-            JOIN users u ON a.applicant_id = u.id
-            LEFT JOIN user_profiles up ON a.applicant_id = up.user_id
-            ORDER BY a.applied_at DESC
-            LIMIT 50
-        ''').fetchall()
+        # Get application statistics with their stored match details
+        applications_data = conn.execute(EVALUATION_APPLICATIONS_QUERY).fetchall()
 
-        # Calculate enhanced metrics for each application
         enhanced_applications = []
         for app in applications_data:
-            if app['job_skills'] and app['candidate_skills']:
-                # Recalculate with semantic analysis
-                semantic_score = calculate_compatibility(app['job_skills'], app['candidate_skills'])
-                details = get_compatibility_details(app['job_skills'], app['candidate_skills'])
-
-                enhanced_applications.append({
-                    'title': app['title'],
-                    'candidate_name': app['candidate_name'],
-                    'original_score': app['compatibility_score'] or 0,
-                    'semantic_score': semantic_score,
-                    'exact_matches': len(details['matched']),
-                    'semantic_matches': len(details['semantic_matches']),
-                    'missing_skills': len(details['missing']),
-                    'coverage_percentage': details['match_breakdown']['coverage_percentage'],
-                    'status': app['status'],
-                    'applied_at': app['applied_at']
-                })
+            # Pairs without skills on both sides have nothing to evaluate
+            if not (app['job_skills'] and app['candidate_skills']):
+                continue
+            if app['semantic_score'] is not None:
+                details = {
+                    'score': app['semantic_score'],
+                    'match_breakdown': {
+                        'exact_matches': app['exact_matches'],
+                        'semantic_matches': app['semantic_matches'],
+                        'missing_skills': app['missing_skills'],
+                        'coverage_percentage': app['coverage_percentage'],
+                    },
+                }
+            else:
+                # Not backfilled yet: compute it here rather than leave it out
+                details = get_job_compatibility_details(conn, app['job_id'], app['job_skills'], app['candidate_skills'])
+            breakdown = breakdown_counts(details)
+            enhanced_applications.append({
+                'title': app['title'],
+                'candidate_name': app['candidate_name'],
+                'original_score': app['compatibility_score'] or 0,
+                'semantic_score': details.get('score', 0),
+                'exact_matches': breakdown['exact_matches'],
+                'semantic_matches': breakdown['semantic_matches'],
+                'missing_skills': breakdown['missing_skills'],
+                'coverage_percentage': breakdown['coverage_percentage'],
+                'status': app['status'],
+                'applied_at': app['applied_at']
+            })
 
         # Get job statistics
         jobs_data = conn.execute('''
@@ -1926,7 +2442,6 @@ def get_evaluation_data():
                 skills = [skill.strip() for skill in job['skills'].split(',')]
                 all_skills.extend(skills)
 
-        from collections import Counter
         skill_frequency = Counter(all_skills)
         top_skills = dict(skill_frequency.most_common(15))
 
@@ -1996,15 +2511,7 @@ def get_posts():
         return jsonify({'error': 'Not authenticated'}), 401
 
     conn = get_db_connection()
-    posts = conn.execute('''
-        SELECT np.*,
-               (SELECT COUNT(*) FROM post_likes pl WHERE pl.post_id = np.id) as actual_likes_count,
-               (SELECT COUNT(*) FROM post_comments pc WHERE pc.post_id = np.id) as actual_comments_count,
-               (SELECT COUNT(*) FROM post_likes pl WHERE pl.post_id = np.id AND pl.user_id = ?) as user_liked
-        FROM news_posts np
-        ORDER BY np.created_at DESC
-        LIMIT 50
-    ''', (session['user_id'],)).fetchall()
+    posts = conn.execute(NEWSFEED_QUERY, (session['user_id'],)).fetchall()
 
     posts_list = []
     for post in posts:
@@ -2126,11 +2633,7 @@ def get_comments(post_id):
         return jsonify({'error': 'Not authenticated'}), 401
 
     conn = get_db_connection()
-    comments = conn.execute('''
-        SELECT * FROM post_comments
-        WHERE post_id = ?
-        ORDER BY created_at ASC
-    ''', (post_id,)).fetchall()
+    comments = conn.execute(POST_COMMENTS_QUERY, (post_id,)).fetchall()
 
     comments_list = []
     for comment in comments:
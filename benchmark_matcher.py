@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+JobSync Matching Engine Benchmark
+=================================
+
+Builds synthetic corpora of jobseeker profiles (ResumeGenerator) and jobs
+(JobSyncReportGenerator job categories) in a throwaway database, then times
+the matching engine end to end:
+
+- calculate_compatibility and get_compatibility_details on random pairs
+- /jobs rendering for a logged-in jobseeker
+- top-K ranking of candidates for a job and of jobs for a candidate
+
+Latency percentiles, throughput and peak RSS are reported as JSON, so runs
+before and after a matcher change can be compared directly.
+
+Usage:
+    python benchmark_matcher.py --sizes 1000,10000 --output benchmark.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from generate_excel_report import JobSyncReportGenerator
+from resume_generator import ResumeGenerator
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return round(usage / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def summarize(latencies):
+    """p50/p99 latency in ms and throughput in ops/sec"""
+    latencies = np.array(latencies)
+    total = latencies.sum()
+    return {
+        'count': len(latencies),
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 3),
+        'mean_ms': round(float(latencies.mean()) * 1000, 3),
+        'throughput_per_sec': round(len(latencies) / total, 1) if total else None,
+    }
+
+
+def time_calls(func, args_list):
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def build_corpus(size):
+    """(profile skills, job skills) lists of ``size`` entries each"""
+    resumes, _ = ResumeGenerator().generate_dataset(size)
+    profiles = [', '.join(resume['skills']) for resume in resumes]
+
+    report = JobSyncReportGenerator()
+    categories = list(report.job_categories)
+    jobs = []
+    for _ in range(size):
+        category = random.choice(categories)
+        extra = random.sample(report.all_skills, random.randint(0, 4))
+        jobs.append((category, ', '.join(dict.fromkeys(report.job_categories[category] + extra))))
+    return profiles, jobs
+
+
+def populate_database(app_module, profiles, jobs):
+    """Fill a fresh database with one employer, the jobs and the profiles"""
+    conn = app_module.get_db_connection()
+    employer_id = conn.execute('''
+        INSERT INTO users (username, email, password, user_type, company_name)
+        VALUES ('bench_employer', 'employer@bench.local', 'x', 'employer', 'Bench Corp')
+    ''').lastrowid
+
+    conn.executemany('''
+        INSERT INTO jobs (employer_id, title, description, requirements, skills, location, job_type)
+        VALUES (?, ?, 'Benchmark job', 'Benchmark requirements', ?, 'Remote', 'full-time')
+    ''', [(employer_id, title, skills) for title, skills in jobs])
+
+    for i, skills in enumerate(profiles):
+        user_id = conn.execute('''
+            INSERT INTO users (username, email, password, user_type)
+            VALUES (?, ?, 'x', 'jobseeker')
+        ''', (f'bench_user_{i}', f'user{i}@bench.local')).lastrowid
+        conn.execute(
+            'INSERT INTO user_profiles (user_id, skills, resume_filename) VALUES (?, ?, ?)',
+            (user_id, skills, 'bench.pdf')
+        )
+    conn.commit()
+
+    job_ids = [row[0] for row in conn.execute('SELECT id FROM jobs')]
+    user_ids = [row[0] for row in conn.execute('SELECT user_id FROM user_profiles')]
+    conn.close()
+    return job_ids, user_ids
+
+
+def run_size(app_module, size, samples, render_requests, k):
+    """Benchmark one corpus size; returns the result dict"""
+    A = app_module
+    profiles, jobs = build_corpus(size)
+
+    setup_start = time.perf_counter()
+    job_ids, user_ids = populate_database(A, profiles, jobs)
+
+    # Fit the vocabulary and store vectors synchronously, as after a refit
+    A.skill_matcher.fit_corpus(A.load_skill_corpus())
+    conn = A.get_db_connection()
+    A.skill_vector_store.rebuild(conn)
+    conn.close()
+    setup_seconds = time.perf_counter() - setup_start
+
+    job_skills = [skills for _, skills in jobs]
+    pairs = [(random.choice(job_skills), random.choice(profiles)) for _ in range(samples)]
+
+    results = {
+        'size': size,
+        'setup_seconds': round(setup_seconds, 2),
+    }
+
+    # Cold: every pair is new to the compatibility cache
+    A.compatibility_cache.clear()
+    results['calculate_compatibility'] = time_calls(A.calculate_compatibility, pairs)
+    results['get_compatibility_details'] = time_calls(A.get_compatibility_details, pairs)
+    # Warm: the same pairs again, served from the cache
+    results['calculate_compatibility_cached'] = time_calls(A.calculate_compatibility, pairs)
+
+    client = A.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_ids[0]
+        sess['user_type'] = 'jobseeker'
+    results['jobs_page'] = time_calls(lambda: client.get('/jobs'), [()] * render_requests)
+
+    conn = A.get_db_connection()
+    sample_jobs = [conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+                   for job_id in random.sample(job_ids, min(samples, len(job_ids)))]
+    sample_profiles = [conn.execute('SELECT * FROM user_profiles WHERE user_id = ?', (user_id,)).fetchone()
+                       for user_id in random.sample(user_ids, min(samples, len(user_ids)))]
+
+    # The first call of each also builds the inverted index; time it apart
+    start = time.perf_counter()
+    A.get_skill_index(conn, 'profile')
+    A.get_skill_index(conn, 'job')
+    results['index_build_seconds'] = round(time.perf_counter() - start, 3)
+
+    results['top_k_candidates'] = time_calls(
+        lambda job: A.rank_candidates_for_job(conn, job, k), [(job,) for job in sample_jobs]
+    )
+
+    def recommend(profile):
+        A.recommendation_cache.invalidate_user(profile['user_id'])
+        return A.recommend_jobs(conn, profile, k)
+
+    results['top_k_jobs'] = time_calls(recommend, [(profile,) for profile in sample_profiles])
+    conn.close()
+
+    # Process-wide high-water mark, so sizes should run in ascending order
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the JobSync skill matching engine')
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='comma-separated corpus sizes (profiles and jobs each), e.g. 1000,10000,100000')
+    parser.add_argument('--samples', type=int, default=500, help='calls timed per operation')
+    parser.add_argument('--render-requests', type=int, default=20, help='/jobs requests timed')
+    parser.add_argument('-k', type=int, default=10, help='top-K size')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output) if args.output else None
+    random.seed(args.seed)
+    from faker import Faker
+    Faker.seed(args.seed)
+
+    report = {
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'samples': args.samples,
+        'k': args.k,
+        'results': [],
+    }
+
+    # The app module is re-imported per size against a new working directory;
+    # it must not start threads (vocabulary refit, match details backfill,
+    # resume parse workers) that would outlive it and run against the next
+    # size's database. run_size fits the vocabulary synchronously instead.
+    os.environ['JOBSYNC_DEFER_BACKGROUND_WORKERS'] = '1'
+    os.environ['JOBSYNC_PARSE_WORKERS'] = '0'
+
+    # Progress output of the generators and the app goes to stderr so
+    # stdout carries only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        for size in (int(size) for size in args.sizes.split(',')):
+            # Each size gets a fresh database and a fresh app module, with the
+            # schema created before anything reads the skill corpus
+            workdir = tempfile.mkdtemp(prefix=f'jobsync_bench_{size}_')
+            os.chdir(workdir)
+            sys.modules.pop('app', None)
+            import app as app_module
+            app_module.init_db()
+
+            print(f"⏱️  Benchmarking {size} profiles x {size} jobs in {workdir}")
+            report['results'].append(run_size(app_module, size, args.samples, args.render_requests, args.k))
+            app_module.db_pool.close_all()
+
+    output = json.dumps(report, indent=2)
+    if output_path:
+        with open(output_path, 'w') as f:
+            f.write(output)
+        print(f"💾 Benchmark report saved to {output_path}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+JobSync PDF Extraction Benchmark
+================================
+
+Runs every PDF of a corpus (the 118 real resumes in ENGINEERING/ by
+default) through each extraction backend on its own and through the
+default fast-path-with-fallback chain, and reports as JSON:
+
+- per-document latency percentiles and documents per second
+- characters extracted and documents hitting a budget
+- for the chain: fallback rate and which backend served each document
+- word-level agreement of every configuration with pdfplumber, the
+  extractor resumes were parsed with before the fast path
+
+Usage:
+    python benchmark_pdf_extraction.py --corpus ENGINEERING --output pdf_bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from pdf_extraction import PDFExtractor, PDF_BACKENDS, DEFAULT_BACKENDS, MIN_CHARS_PER_PAGE
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def corpus_files(corpus):
+    return sorted(
+        os.path.join(corpus, name) for name in os.listdir(corpus) if name.lower().endswith('.pdf')
+    )
+
+
+def word_set(text):
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def run_configuration(name, backends, files, min_chars, workers, reference=None):
+    """Extract the corpus with one backend chain; returns (report, {path: text})"""
+    extractor = PDFExtractor(workers=workers, backends=backends, min_chars_per_page=min_chars)
+    latencies = []
+    texts = {}
+    served_by = {}
+    truncated = 0
+    failed = 0
+
+    started = time.perf_counter()
+    try:
+        for path in files:
+            doc_started = time.perf_counter()
+            try:
+                result = extractor.extract(path)
+            except Exception as e:
+                print(f"❌ {name}: {os.path.basename(path)}: {e}")
+                failed += 1
+                texts[path] = ''
+                continue
+            latencies.append((time.perf_counter() - doc_started) * 1000)
+            texts[path] = result['text']
+            served_by[result['backend']] = served_by.get(result['backend'], 0) + 1
+            truncated += bool(result['truncated'])
+    finally:
+        extractor.close()
+    elapsed = time.perf_counter() - started
+
+    report = {
+        'configuration': name,
+        'backends': extractor.backends,
+        'documents': len(files),
+        'failed': failed,
+        'truncated': truncated,
+        'total_seconds': round(elapsed, 3),
+        'docs_per_second': round(len(files) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': round(float(np.percentile(latencies, 50)), 2) if latencies else None,
+            'p95': round(float(np.percentile(latencies, 95)), 2) if latencies else None,
+            'max': round(max(latencies), 2) if latencies else None,
+        },
+        'chars': sum(len(text) for text in texts.values()),
+        'served_by': served_by,
+        'extractor_stats': extractor.stats(),
+    }
+    if reference is not None:
+        agreement = [jaccard(word_set(texts[path]), word_set(reference[path])) for path in files]
+        report['word_agreement_with_pdfplumber'] = {
+            'mean': round(float(np.mean(agreement)), 4),
+            'min': round(float(np.min(agreement)), 4),
+        }
+    return report, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PDF text extraction backends')
+    parser.add_argument('--corpus', default=os.path.join(REPO_DIR, 'ENGINEERING'))
+    parser.add_argument('--min-chars', type=int, default=MIN_CHARS_PER_PAGE,
+                        help='characters per page below which the chain falls back')
+    parser.add_argument('--workers', type=int, default=0, help='page-parallel pool size')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    files = corpus_files(args.corpus)
+    if not files:
+        parser.error(f'no PDFs found in {args.corpus}')
+
+    report = {
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'corpus': os.path.abspath(args.corpus),
+        'documents': len(files),
+        'min_chars_per_page': args.min_chars,
+        'results': [],
+    }
+
+    # Progress and extraction warnings go to stderr so stdout carries only the report
+    with contextlib.redirect_stdout(sys.stderr):
+        print(f"⏱️  Extracting {len(files)} PDFs with pdfplumber (reference)")
+        result, reference = run_configuration('pdfplumber', ['pdfplumber'], files, args.min_chars, args.workers)
+        report['results'].append(result)
+
+        for name, backend in PDF_BACKENDS.items():
+            if name == 'pdfplumber':
+                continue
+            if not backend.available:
+                print(f"⚠️ Skipping {name}: not installed")
+                continue
+            print(f"⏱️  Extracting {len(files)} PDFs with {name}")
+            result, _ = run_configuration(name, [name], files, args.min_chars, args.workers, reference)
+            report['results'].append(result)
+
+        chain = '+'.join(DEFAULT_BACKENDS)
+        print(f"⏱️  Extracting {len(files)} PDFs with {chain}")
+        result, _ = run_configuration(chain, list(DEFAULT_BACKENDS), files, args.min_chars, args.workers, reference)
+        report['results'].append(result)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+        print(f"💾 Benchmark report saved to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+JobSync Resume Parser Benchmark
+===============================
+
+Parses the resumes of resume_dataset/resumes_text.txt with the NER model
+and reports as JSON, per configuration:
+
+- ``full``: whole documents, NER results first (the parse path before the
+  inference mode)
+- ``inference``: documents cut to the token budget, email and phone from
+  regexes first, NER only where they find nothing
+- ``inference_batched``: the inference mode through ``nlp.pipe``, as bulk
+  ingestion runs it
+
+For each: documents per second, per-document latency percentiles, accuracy
+of name, email and phone against resumes_structured.json, and skill
+agreement with ``full``.
+
+Usage:
+    python benchmark_resume_parser.py --output parser_bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from resume_ai_integration import JobSyncResumeAI, RULE_BASED_FIELDS
+from train_resume_parser import MAX_INFERENCE_TOKENS
+
+RESUME_SEPARATOR = re.compile(r'^=== RESUME (\d+) ===$', re.MULTILINE)
+WARMUP_DOCS = 20
+
+
+def load_resumes(dataset_dir):
+    """(resume id, text) pairs of resumes_text.txt and the structured records by id"""
+    with open(os.path.join(dataset_dir, 'resumes_text.txt'), encoding='utf-8') as f:
+        parts = RESUME_SEPARATOR.split(f.read())
+    resumes = [(int(number), text.strip()) for number, text in zip(parts[1::2], parts[2::2])]
+
+    with open(os.path.join(dataset_dir, 'resumes_structured.json'), encoding='utf-8') as f:
+        truth = {record['id']: record for record in json.load(f)}
+    return resumes, truth
+
+
+def digits(value):
+    return re.sub(r'\D', '', value or '')
+
+
+def field_accuracy(results, truth):
+    """Share of resumes whose parsed name, email and phone match the records"""
+    matches = {'name': 0, 'email': 0, 'phone': 0}
+    for resume_id, result in results.items():
+        record = truth.get(resume_id, {})
+        matches['name'] += (result.get('name') or '').strip() == record.get('name')
+        matches['email'] += (result.get('email') or '').lower() == (record.get('email') or '').lower()
+        # Parsed phones are reformatted, and the regex drops country codes
+        phone = digits(result.get('phone'))
+        matches['phone'] += bool(phone) and digits(record.get('phone')).endswith(phone)
+    return {field: round(count / len(results), 4) for field, count in matches.items()}
+
+
+def skill_agreement(results, reference):
+    scores = []
+    for resume_id, result in results.items():
+        a = {skill.lower() for skill in result.get('skills', [])}
+        b = {skill.lower() for skill in reference[resume_id].get('skills', [])}
+        scores.append(len(a & b) / len(a | b) if a or b else 1.0)
+    return round(float(np.mean(scores)), 4)
+
+
+def run_configuration(name, ai, resumes, batch_size=None):
+    """Parse every resume; returns (report, {resume id: result})"""
+    for _, text in resumes[:WARMUP_DOCS]:
+        ai.parser.parse_resume(text)
+
+    results = {}
+    latencies = []
+    started = time.perf_counter()
+    if batch_size:
+        items = ((text, resume_id) for resume_id, text in resumes)
+        for result, resume_id in ai.parse_texts(items, batch_size):
+            results[resume_id] = result
+    else:
+        # The path of parse_resume_with_ai once the text is extracted
+        for resume_id, text in resumes:
+            doc_started = time.perf_counter()
+            results[resume_id] = ai.enhance_parse_result(ai.parser.parse_resume(text), text)
+            latencies.append((time.perf_counter() - doc_started) * 1000)
+    elapsed = time.perf_counter() - started
+
+    report = {
+        'configuration': name,
+        'inference_settings': ai.inference_settings(),
+        'batch_size': batch_size,
+        'documents': len(resumes),
+        'total_seconds': round(elapsed, 3),
+        'docs_per_second': round(len(resumes) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': round(float(np.percentile(latencies, 50)), 3),
+            'p95': round(float(np.percentile(latencies, 95)), 3),
+            'max': round(max(latencies), 3),
+        } if latencies else None,
+    }
+    return report, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the resume NER parse path')
+    parser.add_argument('--dataset', default=os.path.join(REPO_DIR, 'resume_dataset'))
+    parser.add_argument('--limit', type=int, help='only parse the first N resumes')
+    parser.add_argument('--max-tokens', type=int, default=MAX_INFERENCE_TOKENS,
+                        help='token budget of the inference configurations')
+    parser.add_argument('--batch-size', type=int, default=32, help='nlp.pipe batch size')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    resumes, truth = load_resumes(args.dataset)
+    resumes = resumes[:args.limit]
+    if not resumes:
+        parser.error(f'no resumes found in {args.dataset}')
+
+    report = {
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'dataset': os.path.abspath(args.dataset),
+        'documents': len(resumes),
+        'results': [],
+    }
+
+    # Progress and model messages go to stderr so stdout carries only the report
+    with contextlib.redirect_stdout(sys.stderr):
+        full = JobSyncResumeAI(cache_max_bytes=0, ner_max_tokens=0, rule_based_fields=())
+        inference = JobSyncResumeAI(cache_max_bytes=0, ner_max_tokens=args.max_tokens,
+                                    rule_based_fields=RULE_BASED_FIELDS)
+        if not full.preload():
+            parser.error('could not load resume_parser_model')
+
+        configurations = [
+            ('full', full, None),
+            ('inference', inference, None),
+            ('inference_batched', inference, args.batch_size),
+        ]
+        reference = None
+        for name, ai, batch_size in configurations:
+            print(f"⏱️  Parsing {len(resumes)} resumes ({name})")
+            result, results = run_configuration(name, ai, resumes, batch_size)
+            result['field_accuracy'] = field_accuracy(results, truth)
+            if reference is None:
+                reference = results
+            else:
+                result['skill_agreement_with_full'] = skill_agreement(results, reference)
+            report['results'].append(result)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+        print(f"💾 Benchmark report saved to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
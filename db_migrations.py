@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Database Migrations for JobSync
+===============================
+
+Versioned schema migrations on top of the tables created by ``init_db``.
+Applied versions are recorded in ``schema_migrations``; each pending
+migration runs in its own write transaction, so concurrent workers starting
+at once apply it exactly once.
+
+Usage:
+    python db_migrations.py            # apply pending migrations
+    python db_migrations.py --status   # show the current schema version
+"""
+
+import argparse
+import sqlite3
+
+from match_details_store import APPLICATION_MATCH_DETAILS_SCHEMA
+
+DATABASE_PATH = 'jobportal.db'
+
+SCHEMA_MIGRATIONS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _add_column(table, column, definition):
+    """Migration step adding a column unless the table already has it
+
+    A table that does not exist yet is skipped; its CREATE statement
+    already includes the column.
+    """
+    def step(conn):
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        if columns and column not in columns:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return step
+
+
+def _change_counter_triggers(table, owner_type):
+    """Triggers bumping the data_versions row of an owner type on every skills write"""
+    events = {'insert': 'INSERT', 'delete': 'DELETE', 'update': 'UPDATE OF skills'}
+    return [f'''CREATE TRIGGER IF NOT EXISTS {table}_version_{name} AFTER {event} ON {table} BEGIN
+            UPDATE data_versions SET version = version + 1 WHERE owner_type = '{owner_type}';
+        END''' for name, event in events.items()]
+
+
+# (version, name, steps); a step is an SQL string or a callable taking the connection
+MIGRATIONS = [
+    (1, 'applications.updated_at', [
+        # update_application_status already writes this column
+        _add_column('applications', 'updated_at', 'TIMESTAMP'),
+    ]),
+    (2, 'indexes for hot query predicates', [
+        # Jobseeker dashboard and applicant profile: by applicant, newest first
+        'CREATE INDEX IF NOT EXISTS idx_applications_applicant ON applications (applicant_id, applied_at)',
+        # Employer dashboard and status updates: by employer, newest first
+        'CREATE INDEX IF NOT EXISTS idx_applications_employer ON applications (employer_id, applied_at)',
+        # Duplicate-application check in apply_job
+        'CREATE INDEX IF NOT EXISTS idx_applications_job_applicant ON applications (job_id, applicant_id)',
+        # Evaluation data: latest applications overall
+        'CREATE INDEX IF NOT EXISTS idx_applications_applied_at ON applications (applied_at)',
+        # Profile lookups on nearly every jobseeker route
+        'CREATE INDEX IF NOT EXISTS idx_user_profiles_user ON user_profiles (user_id)',
+        # Job listing and employer dashboard ordering
+        'CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs (posted_at)',
+        'CREATE INDEX IF NOT EXISTS idx_jobs_employer ON jobs (employer_id, posted_at)',
+        # Newsfeed ordering and per-post comments
+        'CREATE INDEX IF NOT EXISTS idx_news_posts_created_at ON news_posts (created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_post_comments_post ON post_comments (post_id, created_at)',
+        # Chat history ordering
+        'CREATE INDEX IF NOT EXISTS idx_chat_messages_timestamp ON chat_messages (timestamp)',
+    ]),
+    (3, 'job listing keyset index by job type', [
+        # /jobs filtered by type pages through (posted_at, id) within one type;
+        # unfiltered pages use idx_jobs_posted_at, whose rowid is the job id
+        'CREATE INDEX IF NOT EXISTS idx_jobs_type_posted_at ON jobs (job_type, posted_at)',
+    ]),
+    (4, 'jobs_fts full-text index', [
+        # External-content FTS5 table: the text lives in jobs, only the index here
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, description, requirements, skills,
+            content='jobs', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )''',
+        '''CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, description, requirements, skills)
+            VALUES (new.id, new.title, new.description, new.requirements, new.skills);
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, description, requirements, skills)
+            VALUES ('delete', old.id, old.title, old.description, old.requirements, old.skills);
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description, requirements, skills ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, description, requirements, skills)
+            VALUES ('delete', old.id, old.title, old.description, old.requirements, old.skills);
+            INSERT INTO jobs_fts (rowid, title, description, requirements, skills)
+            VALUES (new.id, new.title, new.description, new.requirements, new.skills);
+        END''',
+        # Index the jobs that existed before the triggers
+        "INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')",
+    ]),
+    (5, 'skill_vectors.skills_hash', [
+        # Vectors without a hash are re-encoded on first read
+        _add_column('skill_vectors', 'skills_hash', 'TEXT'),
+    ]),
+    (6, 'data_versions change counters', [
+        # In-memory indexes compare these counters to notice jobs and profiles
+        # written by other processes (gunicorn workers, CLIs, seeding scripts)
+        '''CREATE TABLE IF NOT EXISTS data_versions (
+            owner_type TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )''',
+        "INSERT OR IGNORE INTO data_versions (owner_type) VALUES ('job'), ('profile')",
+        *_change_counter_triggers('jobs', 'job'),
+        *_change_counter_triggers('user_profiles', 'profile'),
+    ]),
+    (7, 'application_match_details table', [
+        # Read by /api/evaluation_data, which no longer creates it per request
+        APPLICATION_MATCH_DETAILS_SCHEMA,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Highest applied migration version, 0 for an unmigrated database"""
+    conn.execute(SCHEMA_MIGRATIONS_SCHEMA)
+    row = conn.execute('SELECT MAX(version) FROM schema_migrations').fetchone()
+    return row[0] or 0
+
+
+def migrate(conn):
+    """Apply every pending migration; returns the versions applied"""
+    applied = []
+    for version, name, steps in MIGRATIONS:
+        if version <= get_schema_version(conn):
+            continue
+
+        # IMMEDIATE takes the write lock before re-checking the version, so a
+        # worker racing us either sees our migration or waits for it
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute('SELECT 1 FROM schema_migrations WHERE version = ?', (version,)).fetchone():
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute('INSERT INTO schema_migrations (version, name) VALUES (?, ?)', (version, name))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        print(f"✅ Applied migration {version}: {name}")
+        applied.append(version)
+    return applied
+
+
+def run_migrations(database=DATABASE_PATH):
+    """Open the database, migrate it and close it; errors are reported, not raised"""
+    try:
+        conn = sqlite3.connect(database, timeout=30)
+        try:
+            return migrate(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Error running database migrations: {e}")
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply JobSync database migrations')
+    parser.add_argument('--database', default=DATABASE_PATH)
+    parser.add_argument('--status', action='store_true', help='only print the schema version')
+    args = parser.parse_args()
+
+    if args.status:
+        conn = sqlite3.connect(args.database)
+        print(f"📋 Schema version {get_schema_version(conn)} (latest {LATEST_VERSION})")
+        conn.close()
+        return
+
+    applied = run_migrations(args.database)
+    if not applied:
+        print(f"✅ Database is up to date (version {LATEST_VERSION})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Pool for JobSync
+==================================
+
+Thread-safe pool of pre-configured SQLite connections. PRAGMAs run once when
+a connection is created instead of on every checkout.
+
+Inside a Flask request every ``connection()`` call shares one connection,
+checked out on first use and returned to the pool on app-context teardown.
+``flask.g`` is per app context, so with gevent workers this is also per
+greenlet. Outside a request (background threads, CLI scripts) each call
+checks out its own connection.
+
+Callers keep the usual ``conn = ...; ...; conn.close()`` pattern: the
+returned wrapper behaves like ``sqlite3.Connection`` and ``close()`` hands
+the connection back instead of closing it.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from flask import g, has_app_context
+
+DEFAULT_PRAGMAS = (
+    'PRAGMA journal_mode=WAL;',
+    'PRAGMA synchronous=NORMAL;',
+    'PRAGMA cache_size=10000;',
+    'PRAGMA temp_store=memory;',
+)
+
+# Connections idle longer than this are checked with SELECT 1 on checkout
+HEALTH_CHECK_INTERVAL = 30  # seconds
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """No connection became available within the checkout timeout"""
+
+
+class PooledConnection:
+    """sqlite3.Connection proxy whose close() releases it to the pool"""
+
+    def __init__(self, pool, conn, request_bound=False):
+        self._pool = pool
+        self._conn = conn
+        self._request_bound = request_bound
+        self._closed = False
+
+    def __getattr__(self, name):
+        if self._closed:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._conn.__exit__(exc_type, exc_val, exc_tb)
+
+    def close(self):
+        """Release the connection; safe to call more than once"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._request_bound:
+            self._pool._close_request_handle()
+        else:
+            self._pool.release(self._conn)
+
+
+class SQLiteConnectionPool:
+    """Bounded pool of configured SQLite connections with metrics"""
+
+    def __init__(self, database, max_size=10, timeout=30, pragmas=DEFAULT_PRAGMAS,
+                 health_check_interval=HEALTH_CHECK_INTERVAL):
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = pragmas
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()  # (connection, released_at)
+        self._size = 0
+        self._condition = threading.Condition()
+        self._metrics = {
+            'created': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'timeouts': 0,
+            'health_checks': 0,
+            'health_check_failures': 0,
+            'discarded': 0,
+        }
+
+    def init_app(self, app):
+        """Return request-bound connections when the app context ends"""
+        app.teardown_appcontext(self._teardown)
+
+    def _create(self):
+        conn = sqlite3.connect(self.database, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        with self._condition:
+            self._metrics['created'] += 1
+        return conn
+
+    def _healthy(self, conn):
+        try:
+            conn.execute('SELECT 1').fetchone()
+            healthy = True
+        except sqlite3.Error:
+            healthy = False
+        with self._condition:
+            self._metrics['health_checks'] += 1
+            if not healthy:
+                self._metrics['health_check_failures'] += 1
+        return healthy
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._metrics['discarded'] += 1
+            self._condition.notify()
+
+    def acquire(self):
+        """Check out a raw connection, waiting up to ``timeout`` seconds"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics['timeouts'] += 1
+                        raise PoolTimeoutError(f'No database connection available after {self.timeout}s')
+                    waited = True
+                    self._condition.wait(remaining)
+
+                if waited:
+                    self._metrics['waits'] += 1
+                    self._metrics['wait_seconds'] += time.monotonic() - started
+                    waited = False
+                self._metrics['checkouts'] += 1
+
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                else:
+                    self._size += 1
+                    conn, released_at = None, None
+
+            if conn is None:
+                try:
+                    return self._create()
+                except sqlite3.Error:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+
+            if time.monotonic() - released_at < self.health_check_interval or self._healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn):
+        """Return a raw connection, discarding any uncommitted work"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._condition:
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def connection(self):
+        """Connection wrapper, shared for the duration of a Flask request"""
+        if not has_app_context():
+            return PooledConnection(self, self.acquire())
+
+        if g.get('_db_conn') is None:
+            g._db_conn = self.acquire()
+            g._db_handles = 0
+        g._db_handles += 1
+        return PooledConnection(self, g._db_conn, request_bound=True)
+
+    def _close_request_handle(self):
+        # Like closing a plain connection, the last close drops uncommitted work
+        if not has_app_context() or g.get('_db_conn') is None:
+            return
+        g._db_handles -= 1
+        if g._db_handles == 0 and g._db_conn.in_transaction:
+            g._db_conn.rollback()
+
+    def _teardown(self, exception=None):
+        conn = g.pop('_db_conn', None)
+        g.pop('_db_handles', None)
+        if conn is not None:
+            self.release(conn)
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for conn, _ in idle:
+            conn.close()
+
+    def stats(self):
+        with self._condition:
+            metrics = dict(self._metrics)
+            idle = len(self._idle)
+            size = self._size
+        waits = metrics.pop('wait_seconds')
+        return {
+            'database': self.database,
+            'max_size': self.max_size,
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'avg_wait_ms': round(waits / metrics['waits'] * 1000, 3) if metrics['waits'] else 0,
+            **metrics,
+        }
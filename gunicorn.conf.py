@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration for JobSync
+==================================
+
+The app is imported once in the master, with the resume NER model loaded,
+and workers are forked from it so they share the model's memory
+copy-on-write instead of each loading a copy.
+
+Only the master imports the app, so threads and database connections it
+would open are deferred to the workers:
+
+- the one-time vocabulary fit and match details backfill run in the master
+  in ``when_ready``, before any worker is forked, so N workers do not all
+  repeat them; workers inherit the fitted vocabulary
+- background threads (resume parse workers) start in ``post_fork``, after
+  the PDF extraction pool has been forked, so the pool never forks a
+  process that runs threads
+- pooled SQLite connections the import opened are closed before forking
+
+JOBSYNC_PRELOAD_MODELS=0 turns preloading off; every worker then imports
+the app itself and loads the model on its first parse.
+"""
+
+import gc
+import os
+import time
+
+preload_app = os.environ.get('JOBSYNC_PRELOAD_MODELS', '1') == '1'
+
+if preload_app:
+    os.environ['JOBSYNC_PRELOAD_MODELS'] = '1'
+    os.environ['JOBSYNC_DEFER_BACKGROUND_WORKERS'] = '1'
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    import app as jobsync_app
+
+    started = time.perf_counter()
+    jobsync_app.run_startup_maintenance()
+    server.log.info("Startup maintenance done in %.2fs", time.perf_counter() - started)
+
+    # SQLite connections must not be shared across fork
+    jobsync_app.db_pool.close_all()
+    # Keep the collector from touching (and so copying) every preloaded object in each worker
+    gc.freeze()
+
+    stats = jobsync_app.model_registry.stats()
+    for name, model in stats['models'].items():
+        server.log.info("Preloaded %s in %.2fs (+%.1f MB RSS)", name, model['load_seconds'], model['rss_delta_mb'])
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    import app as jobsync_app
+
+    jobsync_app.start_background_workers()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Bulk Resume Ingestion for JobSync
+=================================
+
+Onboards a directory of resumes (PDF, DOCX or TXT) at once:
+
+1. a process pool extracts the text of the files in parallel, looking each
+   file up in the resume parse cache first
+2. the texts are streamed through the NER model with
+   ``nlp.pipe(batch_size=..., n_process=...)``
+3. every ``jobsync_formatted`` result is written as a JSONL line, or
+   straight into ``user_profiles``
+
+With ``--database``, a resume is matched to a jobseeker by the email found
+in it; if there is none, an account is created with an unusable password,
+to be claimed later. Profiles of existing jobseekers are left alone unless
+``--update-existing`` is given. Every written profile gets its skill
+vector in the same transaction, when a fitted vocabulary is saved.
+Throughput is reported in documents per second.
+
+Usage:
+    python ingest_resumes.py ENGINEERING --output profiles.jsonl
+    python ingest_resumes.py ENGINEERING --database jobportal.db --workers 4 --n-process 2
+    python ingest_resumes.py ENGINEERING --database jobportal.db --update-existing --max-tokens 0
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import secrets
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from db_migrations import migrate
+from resume_ai_integration import JobSyncResumeAI, MAX_INFERENCE_TOKENS
+from resume_parse_cache import (
+    ResumeParseCache, file_sha256, model_fingerprint, RESUME_PARSE_CACHE_DIR, RESUME_PARSE_CACHE_MAX_BYTES,
+)
+from skill_matching import SkillMatcher, SKILL_VECTORIZER_PATH
+from skill_vector_store import SkillVectorStore
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+NER_BATCH_SIZE = 32
+COMMIT_EVERY = 200
+
+EMAIL_PATTERN = re.compile(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$')
+IMPORTED_EMAIL_DOMAIN = 'imported.jobsync.local'
+
+# Text extractor and cache of each worker process, set by the pool initializer
+_worker_extractor = None
+_worker_cache = None
+
+
+def _init_worker(fingerprint, cache_dir):
+    global _worker_extractor, _worker_cache
+    # Extraction warnings must not end up in JSONL written to stdout
+    sys.stdout = sys.stderr
+    _worker_extractor = JobSyncResumeAI(load_parser=False)
+    if fingerprint:
+        _worker_cache = ResumeParseCache(fingerprint, cache_dir, RESUME_PARSE_CACHE_MAX_BYTES)
+
+
+def _extract(path):
+    """(path, file hash, text, cached result) of one resume; runs in a worker"""
+    try:
+        sha = file_sha256(path)
+    except OSError as e:
+        return path, None, '', {'error': str(e)}
+
+    if _worker_cache is not None:
+        cached = _worker_cache.get(sha)
+        if cached:
+            return path, sha, cached['text'], cached['result']
+    return path, sha, _worker_extractor.extract_text_from_file(path), None
+
+
+def resume_files(directory):
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.lower().endswith(RESUME_EXTENSIONS)
+    )
+
+
+def ingest(ai, files, workers, batch_size, n_process, cache=None):
+    """Yield (path, parse result, from_cache) for every file
+
+    Cache hits are yielded as soon as their extraction task returns;
+    the rest in NER batch order.
+    """
+    ready = deque()
+    # (file hash, text) of the files in flight, for caching their results
+    pending = {}
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(cache.fingerprint if cache else None, cache.cache_dir if cache else RESUME_PARSE_CACHE_DIR)
+    ) as pool:
+        def texts():
+            for path, sha, text, cached in pool.map(_extract, files, chunksize=4):
+                if cached is not None:
+                    ready.append((path, cached, True))
+                    continue
+                pending[path] = (sha, text)
+                yield text, path
+
+        for result, path in ai.parse_texts(texts(), batch_size, n_process):
+            while ready:
+                yield ready.popleft()
+            # Only model parses are cached, as in parse_resume_with_ai
+            sha, text = pending.pop(path)
+            if cache is not None and sha and text and 'error' not in result:
+                cache.put(sha, text, result)
+            yield path, result, False
+        while ready:
+            yield ready.popleft()
+
+
+def profile_fields(result):
+    formatted = result.get('jobsync_formatted', {})
+    return formatted.get('skills', ''), formatted.get('experience', ''), formatted.get('education', '')
+
+
+def find_or_create_jobseeker(conn, path, formatted):
+    """(user id, created) for a resume; the id is None if its email belongs to an employer"""
+    email = (formatted.get('email') or '').strip().lower()
+    stem = re.sub(r'[^a-z0-9]+', '.', os.path.splitext(os.path.basename(path))[0].lower()).strip('.')
+    if not EMAIL_PATTERN.match(email):
+        email = f'{stem}@{IMPORTED_EMAIL_DOMAIN}'
+
+    row = conn.execute('SELECT id, user_type FROM users WHERE email = ?', (email,)).fetchone()
+    if row:
+        return (row[0] if row[1] == 'jobseeker' else None), False
+
+    base = (formatted.get('name') or stem or 'jobseeker').strip()[:40]
+    # The password is not a SHA-256 digest, so nobody can log in with it
+    password = '!' + secrets.token_hex(16)
+    for attempt in range(100):
+        username = base if attempt == 0 else f'{base} {attempt + 1}'
+        try:
+            cursor = conn.execute(
+                "INSERT INTO users (username, email, password, user_type) VALUES (?, ?, ?, 'jobseeker')",
+                (username, email, password)
+            )
+            return cursor.lastrowid, True
+        except sqlite3.IntegrityError:
+            continue
+    raise sqlite3.IntegrityError(f'No free username for {base}')
+
+
+def store_profile(conn, path, result, vector_store=None, update_existing=False):
+    """Write the profile of one parsed resume; returns what was done
+
+    'created' or 'updated', or 'existing' or 'employer' when the resume was
+    skipped. The caller commits.
+    """
+    user_id, created = find_or_create_jobseeker(conn, path, result.get('jobsync_formatted', {}))
+    if user_id is None:
+        return 'employer'
+    if not created and not update_existing:
+        return 'existing'
+
+    skills, experience, education = profile_fields(result)
+    filename = os.path.basename(path)
+    cursor = conn.execute('''
+        UPDATE user_profiles
+        SET skills = ?, experience = ?, education = ?, resume_filename = ?
+        WHERE user_id = ?
+    ''', (skills, experience, education, filename, user_id))
+    if cursor.rowcount == 0:
+        conn.execute('''
+            INSERT INTO user_profiles (user_id, skills, experience, education, resume_filename)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (user_id, skills, experience, education, filename))
+    if vector_store is not None:
+        vector_store.upsert(conn, 'profile', user_id, skills)
+    return 'created' if created else 'updated'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse a directory of resumes in bulk')
+    parser.add_argument('directory')
+    parser.add_argument('--output', help='JSONL file for the results (default: stdout)')
+    parser.add_argument('--database', help='write profiles into this JobSync database instead')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='text extraction processes')
+    parser.add_argument('--batch-size', type=int, default=NER_BATCH_SIZE, help='nlp.pipe batch size')
+    parser.add_argument('--n-process', type=int, default=1, help='nlp.pipe processes')
+    parser.add_argument('--limit', type=int, help='only ingest the first N files')
+    parser.add_argument('--no-cache', action='store_true', help='ignore the resume parse cache')
+    parser.add_argument('--update-existing', action='store_true',
+                        help='overwrite the profiles of jobseekers that already exist')
+    parser.add_argument('--max-tokens', type=int,
+                        default=int(os.environ.get('JOBSYNC_NER_MAX_TOKENS', str(MAX_INFERENCE_TOKENS))),
+                        help='cut resumes to this many tokens before NER; 0 parses them whole')
+    args = parser.parse_args()
+
+    files = resume_files(args.directory)[:args.limit]
+    if not files:
+        parser.error(f'no resumes found in {args.directory}')
+
+    with contextlib.redirect_stdout(sys.stderr):
+        ai = JobSyncResumeAI(cache_max_bytes=0, ner_max_tokens=args.max_tokens)
+    if not ai.parser or not ai.parser.nlp:
+        print("⚠️ Resume parser model not available - using fallback keyword parsing", file=sys.stderr)
+    cache = None
+    if not args.no_cache and ai.parser and ai.parser.nlp:
+        cache = ResumeParseCache(model_fingerprint(ai.parser.model_path, ai.inference_settings()),
+                                 RESUME_PARSE_CACHE_DIR, RESUME_PARSE_CACHE_MAX_BYTES)
+
+    out = None
+    conn = None
+    vector_store = None
+    if args.database:
+        conn = sqlite3.connect(args.database, timeout=30)
+        # Vectors are stored with their skills hash, a column added by a migration
+        migrate(conn)
+        matcher = SkillMatcher(vectorizer_path=SKILL_VECTORIZER_PATH)
+        if matcher.load_vectorizer():
+            vector_store = SkillVectorStore(matcher)
+        else:
+            print("⚠️ No saved skill vocabulary - the app encodes the new profiles when it starts",
+                  file=sys.stderr)
+    else:
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    print(f"🚀 Ingesting {len(files)} resumes from {args.directory} "
+          f"({args.workers} extraction workers, batch {args.batch_size}, {args.n_process} NER processes)",
+          file=sys.stderr)
+
+    started = time.perf_counter()
+    counts = {'parsed': 0, 'cached': 0, 'empty': 0, 'created': 0, 'updated': 0, 'existing': 0, 'employer': 0}
+    try:
+        for path, result, from_cache in ingest(ai, files, args.workers, args.batch_size, args.n_process, cache):
+            counts['cached' if from_cache else 'parsed'] += 1
+            if not result.get('jobsync_formatted', {}).get('skills'):
+                counts['empty'] += 1
+
+            if conn is not None:
+                counts[store_profile(conn, path, result, vector_store, args.update_existing)] += 1
+                if (counts['parsed'] + counts['cached']) % COMMIT_EVERY == 0:
+                    conn.commit()
+            else:
+                out.write(json.dumps({
+                    'file': os.path.relpath(path, args.directory),
+                    'cached': from_cache,
+                    'jobsync_formatted': result.get('jobsync_formatted', {}),
+                }) + '\n')
+
+            done = counts['parsed'] + counts['cached']
+            if done % 100 == 0:
+                rate = done / (time.perf_counter() - started)
+                print(f"   {done}/{len(files)} resumes ({rate:.1f} docs/sec)", file=sys.stderr)
+        if conn is not None:
+            conn.commit()
+    finally:
+        if conn is not None:
+            conn.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    total = counts['parsed'] + counts['cached']
+    print(f"✅ Ingested {total} resumes in {elapsed:.1f}s ({total / elapsed:.1f} docs/sec): "
+          f"{counts['parsed']} parsed, {counts['cached']} from cache, "
+          f"{counts['empty']} without skills", file=sys.stderr)
+    if conn is not None:
+        print(f"   profiles: {counts['created']} created, {counts['updated']} updated, "
+              f"{counts['existing']} skipped (existing jobseeker), {counts['employer']} skipped (employer email)",
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
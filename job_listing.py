@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Job Listing Queries for JobSync
+===============================
+
+Keyset pagination for the ``/jobs`` page. Jobs are ordered newest first by
+``(posted_at, id)`` and a page continues strictly after the last row of the
+previous one, so every page costs one index range scan of ``limit + 1``
+rows however deep it is and however large the ``jobs`` table grows.
+
+Location, job type and keyword filters are applied in SQL. Keywords are
+looked up in the ``jobs_fts`` full-text index rather than with a substring
+LIKE over every job's text, so the walk down the ``posted_at`` index only
+tests each row's id against the matching set. The cursor is an opaque
+URL-safe token encoding the ``(posted_at, id)`` of the last row.
+"""
+
+import base64
+import binascii
+import json
+
+from job_search import build_match_query
+
+JOBS_PAGE_SIZE = 20
+MAX_JOBS_PAGE_SIZE = 100
+
+JOB_TYPES = ('full-time', 'part-time', 'contract', 'internship')
+
+
+def encode_cursor(posted_at, job_id):
+    """Opaque token for the position after a (posted_at, id) row"""
+    payload = json.dumps([posted_at, job_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """(posted_at, id) from a cursor token, or None if it is missing or malformed"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        posted_at, job_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if not isinstance(posted_at, str) or not isinstance(job_id, int):
+        return None
+    return posted_at, job_id
+
+
+def parse_page_size(value, default=JOBS_PAGE_SIZE):
+    """Page size from a query parameter, clamped to 1..MAX_JOBS_PAGE_SIZE"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(MAX_JOBS_PAGE_SIZE, size))
+
+
+def _like_pattern(text):
+    """Substring LIKE pattern with %, _ and the escape character escaped"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def build_jobs_query(keyword='', location='', job_type='', after=None,
+                     exclude_employer_id=None, limit=JOBS_PAGE_SIZE):
+    """SQL and parameters for one page of jobs, fetching one extra row
+
+    The extra row only tells the caller whether a next page exists.
+    """
+    conditions = []
+    params = []
+
+    if exclude_employer_id is not None:
+        conditions.append('j.employer_id != ?')
+        params.append(exclude_employer_id)
+    if job_type:
+        conditions.append('j.job_type = ?')
+        params.append(job_type)
+    if location:
+        conditions.append("j.location LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(location))
+    match = build_match_query(keyword)
+    if match:
+        # Same columns the keyword filter has always searched. The unary +
+        # keeps the planner walking posted_at instead of sorting the matches.
+        conditions.append('+j.id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)')
+        params.append(f'{{title description skills}} : ({match})')
+    if after is not None:
+        conditions.append('(j.posted_at, j.id) < (?, ?)')
+        params.extend(after)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    sql = f'''
+        SELECT j.*, u.company_name, u.username as employer_name
+        FROM jobs j
+        JOIN users u ON j.employer_id = u.id
+        {where}
+        ORDER BY j.posted_at DESC, j.id DESC
+        LIMIT ?
+    '''
+    params.append(limit + 1)
+    return sql, params
+
+
+def fetch_jobs_page(conn, keyword='', location='', job_type='', after=None,
+                    exclude_employer_id=None, limit=JOBS_PAGE_SIZE):
+    """(rows, next cursor) for one page; the cursor is None on the last page"""
+    sql, params = build_jobs_query(keyword, location, job_type, after, exclude_employer_id, limit)
+    rows = conn.execute(sql, params).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last['posted_at'], last['id'])
+    return rows, next_cursor
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Full-Text Job Search for JobSync
+================================
+
+Searches the ``jobs_fts`` FTS5 index (created by migration 4 and kept in
+sync with ``jobs`` by triggers) instead of shipping job descriptions to the
+browser. Results are ranked by bm25 with title and skills hits weighted
+above description hits, and come with a highlighted snippet.
+
+User input is never passed to MATCH as-is: every word is quoted, so FTS5
+operators in the text cannot cause syntax errors. A trailing ``*`` makes a
+word a prefix query, and the last word is a prefix by default so results
+follow the user while they type.
+
+The text rank can optionally be blended with the candidate's compatibility
+score: a fixed pool of the ``BLEND_POOL_SIZE`` best text matches is
+re-ranked by ``(1 - blend) * relevance + blend * compatibility`` and pages
+are cut from that one ranking, so consecutive pages never overlap. Blended
+results end with the pool.
+
+Offset paging makes SQLite rank every match before the page, so plain
+results end after the ``MAX_SEARCH_RESULTS`` best matches; past that a
+more specific query is the way on.
+"""
+
+import html
+import re
+
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 50
+MAX_QUERY_TERMS = 16
+
+# bm25 column weights: title, description, requirements, skills
+BM25_WEIGHTS = (10.0, 1.0, 2.0, 5.0)
+
+# Text matches re-ranked when blending with compatibility
+BLEND_POOL_SIZE = 100
+# Deepest match plain paging reaches, which bounds the rows one page ranks
+MAX_SEARCH_RESULTS = 500
+
+SNIPPET_TOKENS = 16
+_MARK_START, _MARK_END = '\x02', '\x03'
+
+_TERM_PATTERN = re.compile(r'\w+\*?', re.UNICODE)
+
+
+def build_match_query(text, prefix_last=True):
+    """Safe FTS5 MATCH expression for free text, or None if it has no words"""
+    terms = _TERM_PATTERN.findall(text or '')[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+
+    parts = []
+    for position, term in enumerate(terms):
+        is_prefix = term.endswith('*') or (prefix_last and position == len(terms) - 1)
+        word = term.rstrip('*')
+        parts.append(f'"{word}"*' if is_prefix else f'"{word}"')
+    return ' '.join(parts)
+
+
+def render_snippet(snippet):
+    """HTML-escape a snippet and turn the match markers into <mark> tags"""
+    escaped = html.escape(snippet or '')
+    return escaped.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def build_search_query(match, exclude_employer_id=None, limit=SEARCH_PAGE_SIZE):
+    """SQL and parameters for the ``limit`` best text matches of a MATCH expression"""
+    conditions = ['jobs_fts MATCH ?']
+    params = [match]
+    if exclude_employer_id is not None:
+        conditions.append('j.employer_id != ?')
+        params.append(exclude_employer_id)
+    params.append(limit)
+
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    sql = f'''
+        SELECT j.id, j.title, j.skills, j.location, j.job_type, j.salary, j.posted_at,
+               u.company_name, u.username as employer_name,
+               bm25(jobs_fts, {weights}) AS rank,
+               snippet(jobs_fts, -1, '{_MARK_START}', '{_MARK_END}', '…', {SNIPPET_TOKENS}) AS snippet
+        FROM jobs_fts
+        JOIN jobs j ON j.id = jobs_fts.rowid
+        JOIN users u ON j.employer_id = u.id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY rank
+        LIMIT ?
+    '''
+    return sql, params
+
+
+def search_jobs(conn, text, limit=SEARCH_PAGE_SIZE, offset=0, exclude_employer_id=None,
+                score_jobs=None, blend=0.0):
+    """(results, next offset) for one page of ranked job matches for free text
+
+    ``score_jobs(rows)`` returns ``{job_id: compatibility}`` and is only
+    called when ``blend`` is above zero. The next offset is None on the
+    last page.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return [], None
+
+    blend = max(0.0, min(1.0, blend)) if score_jobs else 0.0
+    # Blended pages re-rank the same pool; plain pages stop at the result cap
+    last = BLEND_POOL_SIZE if blend else MAX_SEARCH_RESULTS
+    offset = max(0, offset)
+    if offset >= last:
+        return [], None
+    end = min(offset + limit, last)
+    if blend:
+        pool_size = BLEND_POOL_SIZE
+    else:
+        # One extra row tells whether a next page exists
+        pool_size = end + 1 if end < last else end
+
+    sql, params = build_search_query(match, exclude_employer_id, pool_size)
+    rows = conn.execute(sql, params).fetchall()
+    if not rows:
+        return [], None
+
+    # bm25 is negative and lower is better; relevance is relative to the best hit
+    best_rank = rows[0]['rank'] or -1.0
+    compatibility = score_jobs(rows) if blend else {}
+
+    results = []
+    for row in rows:
+        relevance = int(round(row['rank'] / best_rank * 100)) if best_rank else 0
+        result = {
+            'job_id': row['id'],
+            'title': row['title'],
+            'company': row['company_name'] or row['employer_name'],
+            'location': row['location'],
+            'job_type': row['job_type'],
+            'salary': row['salary'],
+            'skills': row['skills'],
+            'posted_at': row['posted_at'],
+            'snippet': render_snippet(row['snippet']),
+            'bm25': round(row['rank'], 4),
+            'relevance': relevance,
+        }
+        if blend:
+            result['compatibility_score'] = compatibility.get(row['id'], 0)
+            result['score'] = round((1 - blend) * relevance + blend * result['compatibility_score'], 2)
+        results.append(result)
+
+    if blend:
+        # Stable sort: ties keep their text rank, so the order is the same on every page
+        results.sort(key=lambda result: result['score'], reverse=True)
+    next_offset = end if len(results) > end else None
+    return results[offset:end], next_offset
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Application Match Details for JobSync
+=====================================
+
+Materializes the compatibility breakdown of every application in the
+``application_match_details`` table when the application is submitted, so
+reporting endpoints read stored numbers instead of re-running the matcher.
+
+Each row records the matcher version it was computed with. When the
+vocabulary or synonym table changes, a background backfill recomputes the
+stale rows in batches.
+"""
+
+import threading
+
+APPLICATION_MATCH_DETAILS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS application_match_details (
+        application_id INTEGER PRIMARY KEY,
+        semantic_score INTEGER NOT NULL,
+        exact_matches INTEGER NOT NULL,
+        semantic_matches INTEGER NOT NULL,
+        missing_skills INTEGER NOT NULL,
+        coverage_percentage REAL NOT NULL,
+        matcher_version TEXT NOT NULL,
+        computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (application_id) REFERENCES applications (id)
+    )
+'''
+
+UPSERT_MATCH_DETAILS = '''
+    INSERT OR REPLACE INTO application_match_details
+        (application_id, semantic_score, exact_matches, semantic_matches,
+         missing_skills, coverage_percentage, matcher_version, computed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+
+# Applications with skills on both sides whose details are missing or stale
+STALE_APPLICATIONS_QUERY = '''
+    SELECT a.id, a.job_id, j.skills AS job_skills, up.skills AS candidate_skills
+    FROM applications a
+    JOIN jobs j ON a.job_id = j.id
+    JOIN user_profiles up ON a.applicant_id = up.user_id
+    LEFT JOIN application_match_details md ON md.application_id = a.id
+    WHERE a.id > ?
+      AND j.skills IS NOT NULL AND j.skills != ''
+      AND up.skills IS NOT NULL AND up.skills != ''
+      AND (md.application_id IS NULL OR md.matcher_version != ?)
+    ORDER BY a.id
+    LIMIT ?
+'''
+
+BACKFILL_BATCH_SIZE = 200
+
+
+def breakdown_counts(details):
+    """Match counts and coverage of a compatibility breakdown
+
+    Breakdowns of pairs with an empty side carry only the skill lists, so
+    the counts are taken from those.
+    """
+    breakdown = details.get('match_breakdown')
+    if breakdown is None:
+        breakdown = {
+            'exact_matches': len(details.get('matched', [])),
+            'semantic_matches': len(details.get('semantic_matches', [])),
+            'missing_skills': len(details.get('missing', [])),
+            'coverage_percentage': 0,
+        }
+    return breakdown
+
+
+def match_details_row(application_id, details, matcher_version):
+    """Parameters for UPSERT_MATCH_DETAILS from a compatibility breakdown"""
+    breakdown = breakdown_counts(details)
+    return (
+        application_id,
+        details.get('score', 0),
+        breakdown['exact_matches'],
+        breakdown['semantic_matches'],
+        breakdown['missing_skills'],
+        breakdown['coverage_percentage'],
+        matcher_version,
+    )
+
+
+class MatchDetailsStore:
+    """Stored compatibility breakdowns with a background backfill"""
+
+    def __init__(self, connect, compute_details, matcher_version, batch_size=BACKFILL_BATCH_SIZE):
+        """``compute_details(conn, job_id, job_skills, candidate_skills)`` returns a breakdown"""
+        self.connect = connect
+        self.compute_details = compute_details
+        self.matcher_version = matcher_version
+        self.batch_size = batch_size
+        self.last_backfill = None
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def ensure_schema(self, conn):
+        """Create the table if this database does not have it yet"""
+        if not self._schema_ready:
+            conn.execute(APPLICATION_MATCH_DETAILS_SCHEMA)
+            self._schema_ready = True
+
+    def store(self, conn, application_id, details):
+        """Store the breakdown of one application; caller commits"""
+        self.ensure_schema(conn)
+        conn.execute(UPSERT_MATCH_DETAILS, match_details_row(application_id, details, self.matcher_version()))
+
+    def has_stale(self, conn):
+        """True when at least one application needs (re)computing"""
+        self.ensure_schema(conn)
+        return conn.execute(STALE_APPLICATIONS_QUERY, (0, self.matcher_version(), 1)).fetchone() is not None
+
+    @property
+    def backfill_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_backfill(self):
+        """Start a background backfill unless one is already running"""
+        with self._lock:
+            if self.backfill_running:
+                return False
+            self._thread = threading.Thread(target=self.run_backfill, name='match-details-backfill', daemon=True)
+            self._thread.start()
+            return True
+
+    def backfill(self, matcher_version):
+        """Recompute rows missing or stale for a version; returns the count"""
+        conn = self.connect()
+        try:
+            self.ensure_schema(conn)
+            total = 0
+            last_id = 0
+            while True:
+                rows = conn.execute(
+                    STALE_APPLICATIONS_QUERY, (last_id, matcher_version, self.batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+
+                conn.executemany(UPSERT_MATCH_DETAILS, [
+                    match_details_row(row[0], self.compute_details(conn, row[1], row[2], row[3]), matcher_version)
+                    for row in rows
+                ])
+                conn.commit()
+
+                total += len(rows)
+                last_id = rows[-1][0]
+            return total
+        finally:
+            conn.close()
+
+    def run_backfill(self):
+        """Backfill until the rows match the current matcher version; blocks"""
+        try:
+            # Go again if the matcher was refitted while this pass ran
+            matcher_version = None
+            count = 0
+            while matcher_version != self.matcher_version():
+                matcher_version = self.matcher_version()
+                count += self.backfill(matcher_version)
+            self.last_backfill = {'matcher_version': matcher_version, 'rows': count}
+            if count:
+                print(f"✅ Backfilled match details for {count} applications")
+        except Exception as e:
+            print(f"Error backfilling match details: {e}")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Matcher Strategy Registry for JobSync
+=====================================
+
+Every way of scoring a job/candidate pair sits behind one interface:
+
+- ``tfidf``: TF-IDF cosine similarity of ``SkillMatcher`` (the default)
+- ``basic``: plain skill overlap with partial-match credit
+- ``report``: the synonym-based percentage used by the Excel report
+- ``embedding``: cosine similarity of dense skill embeddings
+
+The registry scores with a primary strategy and can shadow-score a sample
+of pairs with a second one, recording how far the two disagree. Each
+strategy keeps a latency histogram, so a faster engine can be compared on
+live traffic before it is switched on.
+
+Everything that produces a score (request handlers, match details, the
+rescore CLI) goes through a registry from ``build_registry``, so they all
+agree on the strategy selected by ``JOBSYNC_MATCHER``.
+"""
+
+import bisect
+import random
+import threading
+import time
+
+# Latency histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, elapsed_ms)] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return None
+        threshold = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= threshold:
+                return bound
+        return round(self.max_ms, 3)
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f'<={bound}ms' for bound in self.buckets] + [f'>{self.buckets[-1]}ms']
+            return {
+                'count': self.count,
+                'mean_ms': round(self.total_ms / self.count, 3) if self.count else None,
+                'p50_ms': self.percentile(0.5),
+                'p99_ms': self.percentile(0.99),
+                'max_ms': round(self.max_ms, 3),
+                'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+            }
+
+
+class MatcherStrategy:
+    """A way of scoring a job/candidate pair as a 0-100 percentage"""
+
+    name = None
+
+    @property
+    def available(self):
+        return True
+
+    def score(self, job_skills, user_skills):
+        """Percentage, or None when this strategy cannot score the pair"""
+        raise NotImplementedError
+
+    def cache_text(self, skills_text):
+        """Form of a skills string that scores are cached under
+
+        Strings with the same form must score alike; the raw string is
+        always safe.
+        """
+        return skills_text
+
+
+class TfidfStrategy(MatcherStrategy):
+    name = 'tfidf'
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+
+    def score(self, job_skills, user_skills):
+        return self.matcher.calculate_semantic_similarity(job_skills, user_skills)
+
+    def cache_text(self, skills_text):
+        # TF-IDF only sees the preprocessed skills
+        return self.matcher.preprocess_skills(skills_text)
+
+
+class BasicOverlapStrategy(MatcherStrategy):
+    name = 'basic'
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+
+    def score(self, job_skills, user_skills):
+        return self.matcher.basic_compatibility(job_skills, user_skills)
+
+
+class ReportSynonymStrategy(MatcherStrategy):
+    """``JobSyncReportGenerator.calculate_skill_match_percentage``
+
+    The report module pulls in pandas and faker, so it is imported on first
+    use and the strategy reports itself unavailable without them.
+    """
+
+    name = 'report'
+
+    def __init__(self):
+        self._generator = None
+        self._import_error = None
+
+    @property
+    def available(self):
+        return self._load() is not None
+
+    def _load(self):
+        if self._generator is None and self._import_error is None:
+            try:
+                from generate_excel_report import JobSyncReportGenerator
+                self._generator = JobSyncReportGenerator()
+            except ImportError as e:
+                self._import_error = e
+        return self._generator
+
+    def score(self, job_skills, user_skills):
+        generator = self._load()
+        if generator is None:
+            return None
+        required = [skill for skill in job_skills.split(',') if skill.strip()]
+        candidate = [skill for skill in user_skills.split(',') if skill.strip()]
+        return int(round(generator.calculate_skill_match_percentage(candidate, required)))
+
+
+class EmbeddingStrategy(MatcherStrategy):
+    name = 'embedding'
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    @property
+    def available(self):
+        return self.embeddings.available
+
+    def score(self, job_skills, user_skills):
+        similarity = self.embeddings.similarity(job_skills, user_skills)
+        if similarity is None:
+            return None
+        return int(round(max(0, min(100, similarity * 100))))
+
+
+class MatcherRegistry:
+    """Named strategies with a primary, an optional shadow and latency stats"""
+
+    def __init__(self, fallback='tfidf'):
+        self.strategies = {}
+        self.histograms = {}
+        self.fallback = fallback
+        self.primary = fallback
+        self.shadow = None
+        self.shadow_rate = 0.0
+        self.fallbacks = 0
+        self.shadow_stats = {}
+        self._lock = threading.Lock()
+
+    def register(self, strategy):
+        self.strategies[strategy.name] = strategy
+        self.histograms[strategy.name] = LatencyHistogram()
+
+    def configure(self, primary=None, shadow=None, shadow_rate=0.0):
+        """Select the primary and shadow strategies; unknown names raise ValueError"""
+        primary = primary or self.fallback
+        for name in (primary, shadow):
+            if name and name not in self.strategies:
+                raise ValueError(f"Unknown matcher strategy '{name}'; choose from {sorted(self.strategies)}")
+        self.primary = primary
+        self.shadow = shadow if shadow != primary else None
+        self.shadow_rate = max(0.0, min(1.0, shadow_rate))
+
+    @property
+    def active(self):
+        """Name of the strategy actually scoring, after availability fallback"""
+        if self.strategies[self.primary].available:
+            return self.primary
+        return self.fallback
+
+    def _timed_score(self, name, job_skills, user_skills):
+        start = time.perf_counter()
+        score = self.strategies[name].score(job_skills, user_skills)
+        self.histograms[name].record(time.perf_counter() - start)
+        return score
+
+    def score(self, job_skills, user_skills):
+        """Score with the primary strategy, falling back when it cannot"""
+        name = self.active
+        score = self._timed_score(name, job_skills, user_skills)
+        if score is None and name != self.fallback:
+            with self._lock:
+                self.fallbacks += 1
+            score = self._timed_score(self.fallback, job_skills, user_skills)
+
+        if self.shadow and self.strategies[self.shadow].available and random.random() < self.shadow_rate:
+            self._compare(score, self._timed_score(self.shadow, job_skills, user_skills))
+
+        return score or 0
+
+    def _compare(self, score, shadow_score):
+        with self._lock:
+            stats = self.shadow_stats.setdefault(self.shadow, {
+                'compared': 0, 'unscored': 0, 'total_abs_diff': 0, 'max_abs_diff': 0,
+            })
+            if shadow_score is None:
+                stats['unscored'] += 1
+                return
+            diff = abs((score or 0) - shadow_score)
+            stats['compared'] += 1
+            stats['total_abs_diff'] += diff
+            stats['max_abs_diff'] = max(stats['max_abs_diff'], diff)
+
+    def stats(self):
+        with self._lock:
+            shadow = {
+                name: {
+                    'compared': stats['compared'],
+                    'unscored': stats['unscored'],
+                    'mean_abs_diff': round(stats['total_abs_diff'] / stats['compared'], 2) if stats['compared'] else None,
+                    'max_abs_diff': stats['max_abs_diff'],
+                }
+                for name, stats in self.shadow_stats.items()
+            }
+        return {
+            'primary': self.primary,
+            'active': self.active,
+            'shadow': self.shadow,
+            'shadow_rate': self.shadow_rate,
+            'fallbacks': self.fallbacks,
+            'strategies': {
+                name: {'available': strategy.available, 'latency': self.histograms[name].snapshot()}
+                for name, strategy in self.strategies.items()
+            },
+            'shadow_comparison': shadow,
+        }
+
+
+def build_registry(matcher, embeddings, primary=None, shadow=None, shadow_rate=0.0):
+    """Registry of every built-in strategy, configured like ``configure``"""
+    registry = MatcherRegistry()
+    registry.register(TfidfStrategy(matcher))
+    registry.register(BasicOverlapStrategy(matcher))
+    registry.register(ReportSynonymStrategy())
+    registry.register(EmbeddingStrategy(embeddings))
+    registry.configure(primary, shadow, shadow_rate)
+    return registry
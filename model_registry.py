@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Process-wide Model Registry for JobSync
+=======================================
+
+Heavy models (the spaCy resume NER pipeline) are loaded once per process,
+on first use, and shared by every thread. Concurrent first uses wait for a
+single load instead of each loading a copy.
+
+Loading a model in the gunicorn master before workers fork (see
+``gunicorn.conf.py``) lets every worker share the master's copy
+copy-on-write. ``stats()`` reports load time, resident memory growth and
+the process that loaded each model, so a worker can tell whether its model
+was inherited from the master.
+"""
+
+import os
+import resource
+import threading
+import time
+
+
+def process_rss_mb():
+    """Current resident set size of this process in MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    # Peak instead of current where /proc is unavailable; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if os.uname().sysname == 'Darwin' else 1024), 1)
+
+
+class ModelRegistry:
+    """Named models loaded lazily once per process and shared across threads"""
+
+    def __init__(self):
+        self._models = {}
+        self._errors = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, name, loader):
+        """The model registered under ``name``, loading it with ``loader()`` on first use
+
+        A failed load is remembered and re-raised instead of retried, so a
+        missing model does not cost a load attempt on every parse.
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                raise self._errors[name]
+            # One lock per model, so loading one does not block the others
+            load_lock = self._loading.setdefault(name, threading.Lock())
+
+        with load_lock:
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                raise self._errors[name]
+
+            rss_before = process_rss_mb()
+            started = time.perf_counter()
+            try:
+                model = loader()
+            except Exception as e:
+                with self._lock:
+                    self._errors[name] = e
+                raise
+
+            stats = {
+                'load_seconds': round(time.perf_counter() - started, 3),
+                'rss_before_mb': rss_before,
+                'rss_after_mb': process_rss_mb(),
+                'loaded_by_pid': os.getpid(),
+                'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+            stats['rss_delta_mb'] = round(stats['rss_after_mb'] - rss_before, 1)
+            with self._lock:
+                self._models[name] = model
+                self._stats[name] = stats
+            print(f"✅ Loaded model '{name}' in {stats['load_seconds']}s (+{stats['rss_delta_mb']} MB RSS)")
+            return model
+
+    def loaded(self, name):
+        return name in self._models
+
+    def stats(self):
+        pid = os.getpid()
+        with self._lock:
+            models = {
+                name: {**stats, 'inherited_from_parent': stats['loaded_by_pid'] != pid}
+                for name, stats in self._stats.items()
+            }
+            errors = {name: str(error) for name, error in self._errors.items()}
+        return {
+            'pid': pid,
+            'rss_mb': process_rss_mb(),
+            'models': models,
+            'errors': errors,
+        }
+
+
+# Shared by every module of the process
+model_registry = ModelRegistry()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+PDF Text Extraction for JobSync
+===============================
+
+Extracts resume text page by page. Pages are yielded as they are
+extracted and joined once at the end, instead of growing one string.
+
+Text comes from pluggable backends tried in order: ``pypdf2`` reads the
+text straight from the content streams, ``pdfplumber`` runs full layout
+analysis. A later backend only runs when the earlier one found too little
+text (scanned pages, unusual encodings) or failed, and every backend's
+latency and the fallback rate are recorded.
+
+Documents with many pages are split into page ranges that a process pool
+extracts in parallel; the pages are still yielded in order. The pool
+processes are forked, and forking a process that already runs threads can
+leave locks those threads held stuck in the children, so a server starts
+the pool with ``start_pool`` before it starts any thread. A pool that was
+not started up front is only started while the caller is the sole
+thread; otherwise long documents are extracted in the calling thread. Every
+extraction runs under a page budget and a time budget, so a pathological
+PDF cannot pin a worker:
+
+- pages past ``max_pages`` are never opened
+- extraction stops at the next page boundary once the time budget is spent
+- pool processes also arm an interval timer, which interrupts a single
+  page that runs past the deadline
+
+Usage:
+    python pdf_extraction.py resume.pdf [--workers 4] [--backends pdfplumber]
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+import pdfplumber
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+from matcher_strategies import LatencyHistogram
+
+PDF_MAX_PAGES = 30
+PDF_TIME_BUDGET = 15.0  # seconds per document
+
+# Documents shorter than this are extracted in the calling process
+PARALLEL_MIN_PAGES = 6
+PAGES_PER_TASK = 3
+
+# Fast path first; later backends only run when it finds too little text
+DEFAULT_BACKENDS = ('pypdf2', 'pdfplumber')
+# Real resumes in ENGINEERING/ have 1,100+ characters per page; a result
+# under this is a scanned page or an encoding the fast path cannot read
+MIN_CHARS_PER_PAGE = 200
+
+
+class ExtractionTimeout(Exception):
+    """The time budget ran out in the middle of a page"""
+
+
+def _timed_page(number, extract_text):
+    """Page dict with the text of one page and how long it took"""
+    started = time.perf_counter()
+    try:
+        text = extract_text() or ''
+        error = None
+    except ExtractionTimeout:
+        raise
+    except Exception as e:
+        text = ''
+        error = str(e)
+
+    stats = {'page': number, 'text': text, 'seconds': time.perf_counter() - started}
+    if error:
+        stats['error'] = error
+    return stats
+
+
+class PdfplumberBackend:
+    """Full layout analysis; slow but handles complex layouts"""
+
+    name = 'pdfplumber'
+    available = True
+
+    def open(self, path):
+        """Context manager for the parsed document"""
+        return pdfplumber.open(path)
+
+    def page_count(self, document):
+        return len(document.pages)
+
+    def iter_page_range(self, document, start, stop, deadline=None):
+        """Yield page dicts for pages [start, stop) (1-based) until the deadline"""
+        for page in document.pages[start - 1:stop - 1]:
+            if deadline is not None and time.time() >= deadline:
+                return
+            try:
+                yield _timed_page(page.page_number, page.extract_text)
+            finally:
+                # Drop the parsed layout objects as soon as the page is done
+                page.close()
+
+
+class PyPDF2Backend:
+    """Text-only extraction from the page content streams"""
+
+    name = 'pypdf2'
+
+    @property
+    def available(self):
+        return PyPDF2 is not None
+
+    def open(self, path):
+        """Context manager for the parsed document; the reader keeps no file open"""
+        return contextlib.nullcontext(PyPDF2.PdfReader(path))
+
+    def page_count(self, document):
+        return len(document.pages)
+
+    def iter_page_range(self, document, start, stop, deadline=None):
+        """Yield page dicts for pages [start, stop) (1-based) until the deadline"""
+        for number in range(start, stop):
+            if deadline is not None and time.time() >= deadline:
+                return
+            yield _timed_page(number, document.pages[number - 1].extract_text)
+
+
+PDF_BACKENDS = {backend.name: backend for backend in (PyPDF2Backend(), PdfplumberBackend())}
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+def _extract_range(backend_name, path, start, stop, deadline):
+    """Pool task: pages of one range, interrupted when the deadline passes"""
+    pages = []
+    # Pool processes run tasks on their main thread, so a timer signal can
+    # interrupt even a single slow page
+    use_timer = hasattr(signal, 'setitimer')
+    if use_timer:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return pages
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+    backend = PDF_BACKENDS[backend_name]
+    try:
+        with backend.open(path) as document:
+            for page in backend.iter_page_range(document, start, stop, deadline):
+                pages.append(page)
+    except ExtractionTimeout:
+        pass
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return pages
+
+
+def _start_worker():
+    """Pool task that only makes the executor launch its processes"""
+
+
+def _pool_context():
+    # Fork: spawn and forkserver children re-import __main__, which for
+    # ``python app.py`` would start a second app in every pool process.
+    # Forked children only ever run _extract_range.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+class PDFExtractor:
+    """Budgeted, optionally page-parallel PDF text extraction over backends"""
+
+    def __init__(self, max_pages=PDF_MAX_PAGES, time_budget=PDF_TIME_BUDGET, workers=0,
+                 parallel_min_pages=PARALLEL_MIN_PAGES, pages_per_task=PAGES_PER_TASK,
+                 backends=DEFAULT_BACKENDS, min_chars_per_page=MIN_CHARS_PER_PAGE):
+        for name in backends:
+            if name not in PDF_BACKENDS:
+                raise ValueError(f"Unknown PDF backend '{name}'; choose from {sorted(PDF_BACKENDS)}")
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+        self.workers = workers
+        self.parallel_min_pages = parallel_min_pages
+        self.pages_per_task = pages_per_task
+        self.backends = [name for name in backends if PDF_BACKENDS[name].available]
+        if not self.backends:
+            raise ValueError(f"None of the PDF backends {list(backends)} is installed")
+        self.min_chars_per_page = min_chars_per_page
+
+        self.histograms = {name: LatencyHistogram() for name in self.backends}
+        self._counts = {name: {'attempts': 0, 'accepted': 0, 'errors': 0} for name in self.backends}
+        self._documents = 0
+        self._fallbacks = 0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def start_pool(self):
+        """Fork the extraction processes now; returns False if there is nothing to start
+
+        Call before the process starts threads of its own.
+        """
+        with self._lock:
+            if self._pool is not None or self.workers <= 1:
+                return False
+            pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+            # A forking executor launches all its processes on the first submit
+            pool.submit(_start_worker).result()
+            self._pool = pool
+            return True
+
+    def _get_pool(self):
+        """The started pool, or None when starting it now would fork a threaded process"""
+        if self._pool is None and threading.active_count() == 1:
+            self.start_pool()
+        return self._pool
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def iter_pages(self, path, document=None, deadline=None, backend=None):
+        """Yield page dicts in page order within the page and time budgets
+
+        ``document`` is the file already opened with the backend, which
+        defaults to the first configured one.
+        """
+        backend = backend or self.backends[0]
+        if deadline is None:
+            deadline = time.time() + self.time_budget
+        with contextlib.ExitStack() as stack:
+            if document is None:
+                document = stack.enter_context(PDF_BACKENDS[backend].open(path))
+            last = min(PDF_BACKENDS[backend].page_count(document), self.max_pages)
+
+            pool = self._get_pool() if self.workers > 1 and last >= self.parallel_min_pages else None
+            if pool is None:
+                yield from PDF_BACKENDS[backend].iter_page_range(document, 1, last + 1, deadline)
+                return
+
+        # Pool processes open the file themselves
+        futures = [
+            pool.submit(_extract_range, backend, path, start, min(start + self.pages_per_task, last + 1), deadline)
+            for start in range(1, last + 1, self.pages_per_task)
+        ]
+        try:
+            for future in futures:
+                try:
+                    range_pages = future.result(timeout=max(0.0, deadline - time.time()))
+                except FutureTimeoutError:
+                    return
+                yield from range_pages
+                if time.time() >= deadline:
+                    return
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _extract_with(self, backend, path, deadline):
+        """Text and per-page stats of a PDF from one backend"""
+        started = time.perf_counter()
+        texts = []
+        page_stats = []
+        # One parse of the file serves the page count and the pages
+        with PDF_BACKENDS[backend].open(path) as document:
+            pages = PDF_BACKENDS[backend].page_count(document)
+            for page in self.iter_pages(path, document, deadline, backend):
+                texts.append(page['text'])
+                stats = {key: value for key, value in page.items() if key != 'text'}
+                stats['seconds'] = round(stats['seconds'], 4)
+                stats['chars'] = len(page['text'])
+                page_stats.append(stats)
+
+        expected = min(pages, self.max_pages)
+        truncated = None
+        if len(page_stats) < expected:
+            truncated = 'time_budget'
+        elif pages > self.max_pages:
+            truncated = 'page_budget'
+
+        return {
+            'text': '\n'.join(text for text in texts if text).strip(),
+            'backend': backend,
+            'page_count': pages,
+            'pages_extracted': len(page_stats),
+            'truncated': truncated,
+            'parallel': self._pool is not None and expected >= self.parallel_min_pages,
+            'seconds': round(time.perf_counter() - started, 4),
+            'pages': page_stats,
+        }
+
+    def _enough_text(self, result):
+        return len(result['text']) >= self.min_chars_per_page * max(1, result['pages_extracted'])
+
+    def extract(self, path):
+        """Text of a PDF with per-page timing stats, falling back across backends
+
+        All backends share one time budget. The result of the last backend
+        tried is used unless an earlier one found more text.
+        """
+        started = time.perf_counter()
+        deadline = time.time() + self.time_budget
+        best = None
+        tried = []
+        last_error = None
+
+        for backend in self.backends:
+            attempt_started = time.perf_counter()
+            try:
+                result = self._extract_with(backend, path, deadline)
+                error = None
+            except Exception as e:
+                result = None
+                error = e
+            self.histograms[backend].record(time.perf_counter() - attempt_started)
+
+            with self._lock:
+                self._counts[backend]['attempts'] += 1
+                if error is not None:
+                    self._counts[backend]['errors'] += 1
+
+            tried.append(backend)
+            if error is not None:
+                last_error = error
+                continue
+            if best is None or len(result['text']) > len(best['text']):
+                best = result
+            if self._enough_text(result):
+                break
+
+        with self._lock:
+            self._documents += 1
+            if len(tried) > 1:
+                self._fallbacks += 1
+            if best is not None:
+                self._counts[best['backend']]['accepted'] += 1
+
+        if best is None:
+            raise last_error
+        best['backends_tried'] = tried
+        best['seconds'] = round(time.perf_counter() - started, 4)
+        return best
+
+    def stats(self):
+        with self._lock:
+            counts = {name: dict(values) for name, values in self._counts.items()}
+            documents = self._documents
+            fallbacks = self._fallbacks
+        return {
+            'backends': self.backends,
+            'min_chars_per_page': self.min_chars_per_page,
+            'documents': documents,
+            'fallbacks': fallbacks,
+            'fallback_rate': round(fallbacks / documents, 3) if documents else None,
+            'per_backend': {
+                name: {**counts[name], 'latency': self.histograms[name].snapshot()}
+                for name in self.backends
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract the text of a PDF with per-page stats')
+    parser.add_argument('pdf')
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--max-pages', type=int, default=PDF_MAX_PAGES)
+    parser.add_argument('--time-budget', type=float, default=PDF_TIME_BUDGET)
+    parser.add_argument('--backends', default=','.join(DEFAULT_BACKENDS),
+                        help='comma-separated backends in the order to try them')
+    parser.add_argument('--text', action='store_true', help='include the extracted text')
+    args = parser.parse_args()
+
+    extractor = PDFExtractor(args.max_pages, args.time_budget, args.workers,
+                             backends=args.backends.split(','))
+    try:
+        result = extractor.extract(args.pdf)
+    finally:
+        extractor.close()
+    if not args.text:
+        result['chars'] = len(result.pop('text'))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Bulk Re-scoring of JobSync Applications
+=======================================
+
+Recomputes ``applications.compatibility_score`` for every application after
+the synonym table, the vocabulary or the matcher itself changed.
+
+Applications are streamed in id order in keyset chunks of
+``applications JOIN jobs JOIN user_profiles`` and scored on a process pool
+with the strategy selected by ``JOBSYNC_MATCHER`` (the vectorized TF-IDF
+matcher by default), exactly as the app scores them. The parent writes each chunk back with
+``executemany`` in one transaction together with a checkpoint row, so an
+interrupted run picks up after the last committed chunk.
+
+Usage:
+    python rescore_applications.py [--workers 4] [--chunk-size 2000] [--matcher tfidf] [--restart]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from matcher_strategies import build_registry
+from skill_embeddings import SkillEmbeddings
+from skill_matching import SkillMatcher, SKILL_VECTORIZER_PATH
+from skill_requirements import SkillRequirementStore, intern_requirements, weighted_pair_score
+
+DATABASE_PATH = 'jobportal.db'
+
+RESCORE_CHECKPOINTS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS rescore_checkpoints (
+        matcher_version TEXT PRIMARY KEY,
+        last_application_id INTEGER NOT NULL DEFAULT 0,
+        rescored INTEGER NOT NULL DEFAULT 0,
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP
+    )
+'''
+
+APPLICATIONS_CHUNK_QUERY = '''
+    SELECT a.id, a.job_id, j.skills AS job_skills, up.skills AS candidate_skills
+    FROM applications a
+    JOIN jobs j ON a.job_id = j.id
+    LEFT JOIN user_profiles up ON a.applicant_id = up.user_id
+    WHERE a.id > ?
+    ORDER BY a.id
+    LIMIT ?
+'''
+
+# Matcher and strategy registry of each worker process, loaded once by the
+# pool initializer
+_worker_matcher = None
+_worker_registry = None
+
+
+def load_registry(matcher, strategy):
+    """Strategy registry over ``matcher``, with the embeddings when saved"""
+    embeddings = SkillEmbeddings(matcher)
+    embeddings.load()
+    return build_registry(matcher, embeddings, strategy)
+
+
+def _init_worker(vectorizer_path, strategy):
+    global _worker_matcher, _worker_registry
+    _worker_matcher = SkillMatcher(vectorizer_path=vectorizer_path)
+    _worker_matcher.load_vectorizer()
+    _worker_registry = load_registry(_worker_matcher, strategy)
+
+
+def score_rows(matcher, registry, rows, requirements):
+    """Scores of (id, job_id, job_skills, candidate_skills) rows, aligned with ``rows``
+
+    ``requirements`` holds the canonical-skill requirements of the jobs in
+    ``rows`` that have any; those are scored with ``weighted_pair_score``.
+    """
+    requirements = intern_requirements(matcher.normalizer, requirements)
+    plain = [row for row in rows if row[1] not in requirements]
+    pairs = [(job_skills, candidate) for _, _, job_skills, candidate in plain]
+    if registry.active == 'tfidf':
+        # Vectorized equivalent of TfidfStrategy
+        plain_scores = matcher.score_pairs(pairs)
+    else:
+        plain_scores = [registry.score(job_skills, candidate) if job_skills and candidate else 0
+                        for job_skills, candidate in pairs]
+    scores = {row[0]: score for row, score in zip(plain, plain_scores)}
+
+    return [
+        scores[application_id] if application_id in scores
+        else weighted_pair_score(requirements[job_id], matcher.normalizer.known_skill_ids(candidate))
+        for application_id, job_id, _, candidate in rows
+    ]
+
+
+def _score_chunk(rows, requirements):
+    """Score one chunk of (id, job_id, job_skills, candidate_skills) in a worker"""
+    scores = score_rows(_worker_matcher, _worker_registry, rows, requirements)
+    return [(score, row[0]) for row, score in zip(rows, scores)]
+
+
+def get_connection(database):
+    conn = sqlite3.connect(database, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL;')
+    conn.execute('PRAGMA synchronous=NORMAL;')
+    return conn
+
+
+def load_corpus(conn):
+    rows = conn.execute('''
+        SELECT skills FROM jobs WHERE skills IS NOT NULL AND skills != ''
+        UNION ALL
+        SELECT skills FROM user_profiles WHERE skills IS NOT NULL AND skills != ''
+    ''').fetchall()
+    return [row[0] for row in rows]
+
+
+def prepare_matcher(conn, vectorizer_path):
+    """Matcher with a persisted vocabulary the workers can load as well"""
+    matcher = SkillMatcher(vectorizer_path=vectorizer_path)
+    if not matcher.load_vectorizer():
+        print("🔧 No saved vocabulary, fitting one on the current corpus...")
+        if matcher.fit_corpus(load_corpus(conn)):
+            matcher.save_vectorizer()
+    return matcher
+
+
+def read_checkpoint(conn, matcher_version, restart):
+    """(last_application_id, rescored, completed_at) of this matcher version"""
+    conn.execute(RESCORE_CHECKPOINTS_SCHEMA)
+    if restart:
+        conn.execute('DELETE FROM rescore_checkpoints WHERE matcher_version = ?', (matcher_version,))
+    conn.execute(
+        'INSERT OR IGNORE INTO rescore_checkpoints (matcher_version) VALUES (?)', (matcher_version,)
+    )
+    conn.commit()
+    row = conn.execute('''
+        SELECT last_application_id, rescored, completed_at FROM rescore_checkpoints
+        WHERE matcher_version = ?
+    ''', (matcher_version,)).fetchone()
+    return row
+
+
+def write_chunk(conn, matcher_version, updates, last_id):
+    """Store one chunk of scores and advance the checkpoint atomically"""
+    with conn:
+        conn.executemany('UPDATE applications SET compatibility_score = ? WHERE id = ?', updates)
+        conn.execute('''
+            UPDATE rescore_checkpoints
+            SET last_application_id = ?, rescored = rescored + ?, updated_at = CURRENT_TIMESTAMP
+            WHERE matcher_version = ?
+        ''', (last_id, len(updates), matcher_version))
+
+
+def read_chunks(conn, last_id, chunk_size):
+    """Yield keyset chunks of application rows after ``last_id``"""
+    while True:
+        rows = conn.execute(APPLICATIONS_CHUNK_QUERY, (last_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def rescore(database, workers, chunk_size, restart, vectorizer_path, strategy=None):
+    conn = get_connection(database)
+    matcher = prepare_matcher(conn, vectorizer_path)
+    # Workers resolve the same strategy; fall back like the app does
+    strategy = load_registry(matcher, strategy).active
+    matcher_version = f'{strategy}:{matcher.version_tag}'
+    print(f"🧮 Matcher version {matcher_version} ({'corpus' if matcher.corpus_mode else 'pairwise'} mode)")
+
+    last_id, rescored, completed_at = read_checkpoint(conn, matcher_version, restart)
+    if completed_at:
+        print(f"✅ Already rescored {rescored} applications for this matcher version (use --restart to redo)")
+        conn.close()
+        return
+
+    total = conn.execute('SELECT COUNT(*) FROM applications').fetchone()[0]
+    remaining = conn.execute('SELECT COUNT(*) FROM applications WHERE id > ?', (last_id,)).fetchone()[0]
+    if last_id:
+        print(f"↩️  Resuming after application {last_id} ({rescored} already rescored)")
+    print(f"🚀 Rescoring {remaining} of {total} applications with {workers} workers")
+
+    requirement_store = SkillRequirementStore(matcher)
+    start = time.perf_counter()
+    done = 0
+    # Workers only score; the parent owns every write. Keep a bounded number
+    # of chunks in flight and commit them strictly in id order, so the
+    # checkpoint never skips an uncommitted chunk.
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(vectorizer_path, strategy)) as executor:
+        in_flight = deque()
+        chunks = read_chunks(conn, last_id, chunk_size)
+        for rows in chunks:
+            requirements = requirement_store.load_canonical(conn, {row[1] for row in rows})
+            in_flight.append((rows[-1][0], executor.submit(_score_chunk, rows, requirements)))
+            while len(in_flight) >= workers * 2:
+                done += _commit_next(conn, matcher_version, in_flight)
+                _report_progress(done, remaining, start)
+        while in_flight:
+            done += _commit_next(conn, matcher_version, in_flight)
+            _report_progress(done, remaining, start)
+
+    with conn:
+        conn.execute('''
+            UPDATE rescore_checkpoints SET completed_at = CURRENT_TIMESTAMP WHERE matcher_version = ?
+        ''', (matcher_version,))
+    conn.close()
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0
+    print(f"\n✅ Rescored {done} applications in {elapsed:.1f}s ({rate:.0f} applications/sec)")
+
+
+def _commit_next(conn, matcher_version, in_flight):
+    last_id, future = in_flight.popleft()
+    updates = future.result()
+    write_chunk(conn, matcher_version, updates, last_id)
+    return len(updates)
+
+
+def _report_progress(done, remaining, start):
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0
+    percent = done / remaining * 100 if remaining else 100
+    sys.stdout.write(f"\r📈 {done}/{remaining} ({percent:.1f}%) - {rate:.0f} applications/sec")
+    sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute compatibility scores of all applications')
+    parser.add_argument('--database', default=DATABASE_PATH)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--vectorizer', default=SKILL_VECTORIZER_PATH,
+                        help='persisted vocabulary shared by the app and the workers')
+    parser.add_argument('--matcher', default=os.environ.get('JOBSYNC_MATCHER', 'tfidf'),
+                        help='scoring strategy; defaults to the app setting JOBSYNC_MATCHER')
+    parser.add_argument('--restart', action='store_true',
+                        help='ignore the checkpoint of the current matcher version')
+    args = parser.parse_args()
+
+    try:
+        rescore(args.database, args.workers, args.chunk_size, args.restart, args.vectorizer, args.matcher)
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted; run again to resume from the last committed chunk")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
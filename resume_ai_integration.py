@@ -10,7 +10,8 @@ for automatic skill extraction and profile completion.
 import os
 import sys
 import json
-import pdfplumber
+import re
+import threading
 import docx
 from pathlib import Path
 
@@ -18,23 +19,51 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from train_resume_parser import ResumeParser
+    from train_resume_parser import ResumeParser, MAX_INFERENCE_TOKENS
 except ImportError:
     print("❌ ResumeParser not found. Please run training first.")
     ResumeParser = None
+    MAX_INFERENCE_TOKENS = 0
+
+from pdf_extraction import PDFExtractor, PDF_MAX_PAGES, PDF_TIME_BUDGET
+from resume_parse_cache import (
+    ResumeParseCache, file_sha256, model_fingerprint,
+    RESUME_PARSE_CACHE_DIR, RESUME_PARSE_CACHE_MAX_BYTES,
+)
+
+# Fields taken from extract_additional_info's regexes before NER, which
+# only fills them when the regexes find nothing. On resume_dataset/ the
+# regexes find as many emails and more phone numbers than the model does
+RULE_BASED_FIELDS = ('email', 'phone')
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b')
+YEARS_EXPERIENCE_PATTERN = re.compile(r'(\d+)[\+]?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)', re.IGNORECASE)
+DEGREE_PATTERN = re.compile(
+    r'(Bachelor|Master|PhD|B\.S\.|M\.S\.|B\.A\.|M\.A\.).*?(?:in\s+)?([A-Za-z\s]+?)(?:\s|,|\.|\n)', re.IGNORECASE
+)
 
 class JobSyncResumeAI:
     """AI-powered resume parser for JobSync application"""
     
-    def __init__(self):
+    def __init__(self, cache_dir=RESUME_PARSE_CACHE_DIR, cache_max_bytes=RESUME_PARSE_CACHE_MAX_BYTES,
+                 pdf_workers=0, pdf_max_pages=PDF_MAX_PAGES, pdf_time_budget=PDF_TIME_BUDGET,
+                 load_parser=True, ner_max_tokens=MAX_INFERENCE_TOKENS, rule_based_fields=RULE_BASED_FIELDS):
         self.parser = None
-        self.initialize_parser()
+        self.cache = None
+        self.rule_based_fields = frozenset(rule_based_fields)
+        self.pdf_extractor = PDFExtractor(pdf_max_pages, pdf_time_budget, pdf_workers)
+        # Text extraction alone (e.g. in ingestion worker processes) needs no model
+        if load_parser:
+            self.initialize_parser(ner_max_tokens)
+            self.initialize_cache(cache_dir, cache_max_bytes)
     
-    def initialize_parser(self):
+    def initialize_parser(self, max_tokens=MAX_INFERENCE_TOKENS):
         """Initialize the trained AI parser"""
         try:
             if ResumeParser:
-                self.parser = ResumeParser()
+                # The model itself is loaded on the first parse
+                self.parser = ResumeParser(max_tokens=max_tokens)
                 print("✅ AI Resume Parser initialized successfully")
             else:
                 print("❌ AI Parser not available - using fallback methods")
@@ -42,16 +71,37 @@ class JobSyncResumeAI:
             print(f"⚠️ Error initializing AI parser: {e}")
             print("Using fallback parsing methods")
     
+    def initialize_cache(self, cache_dir, max_bytes):
+        """Content-hash cache of parses made with the loaded model"""
+        # Checks the model directory instead of self.parser.nlp, which would load the model
+        if not self.parser or not max_bytes or not os.path.isdir(self.parser.model_path):
+            return
+        try:
+            fingerprint = model_fingerprint(self.parser.model_path, self.inference_settings())
+            self.cache = ResumeParseCache(fingerprint, cache_dir, max_bytes)
+        except OSError as e:
+            print(f"⚠️ Resume parse cache disabled: {e}")
+    
+    def inference_settings(self):
+        """Settings besides the model that change parse results"""
+        return {**self.parser.inference_settings(), 'rule_based_fields': sorted(self.rule_based_fields)}
+    
+    def preload(self):
+        """Load the NER model now instead of on the first parse; True if it loaded"""
+        return bool(self.parser and self.parser.nlp)
+    
+    def extract_pdf(self, file_path):
+        """Extract text from PDF file with per-page timing stats"""
+        result = self.pdf_extractor.extract(file_path)
+        if result['truncated']:
+            print(f"⚠️ PDF extraction stopped at {result['pages_extracted']}/{result['page_count']} pages "
+                  f"({result['truncated']}): {file_path}")
+        return result
+    
     def extract_text_from_pdf(self, file_path):
         """Extract text from PDF file"""
         try:
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+            return self.extract_pdf(file_path)['text']
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
             return ""
@@ -95,6 +145,17 @@ class JobSyncResumeAI:
     def parse_resume_with_ai(self, file_path):
         """Parse resume using trained AI model"""
         
+        # Same bytes and same model give the same parse
+        cache_key = None
+        if self.cache:
+            try:
+                cache_key = file_sha256(file_path)
+                cached = self.cache.get(cache_key)
+                if cached:
+                    return cached['result']
+            except OSError:
+                cache_key = None
+        
         # Extract text from file
         text = self.extract_text_from_file(file_path)
         
@@ -108,6 +169,10 @@ class JobSyncResumeAI:
                 
                 # Post-process and enhance results
                 enhanced_result = self.enhance_parse_result(result, text)
+                
+                # Only model parses are cached; fallbacks may succeed next time
+                if cache_key:
+                    self.cache.put(cache_key, text, enhanced_result)
                 return enhanced_result
                 
             except Exception as e:
@@ -117,6 +182,33 @@ class JobSyncResumeAI:
             # Use fallback parsing
             return self.fallback_parse_from_text(text)
     
+    def parse_texts(self, items, batch_size=32, n_process=1):
+        """Parse many (text, context) pairs in NER batches; yields (result, context)
+        
+        Empty texts get the empty fallback result without reaching the model.
+        """
+        if not self.parser or not self.parser.nlp:
+            for text, context in items:
+                result = self.fallback_parse_from_text(text) if text else self.fallback_parse_result()
+                yield result, context
+            return
+        
+        empty = []
+        
+        def with_text():
+            for text, context in items:
+                if text:
+                    yield text, (text, context)
+                else:
+                    empty.append(context)
+        
+        for parsed, (text, context) in self.parser.parse_resumes(with_text(), batch_size, n_process, as_tuples=True):
+            while empty:
+                yield self.fallback_parse_result(), empty.pop(0)
+            yield self.enhance_parse_result(parsed, text), context
+        while empty:
+            yield self.fallback_parse_result(), empty.pop(0)
+    
     def enhance_parse_result(self, ai_result, original_text):
         """Enhance AI parsing results with additional processing"""
         
@@ -129,9 +221,9 @@ class JobSyncResumeAI:
         # Extract additional information using regex
         additional_info = self.extract_additional_info(original_text)
         
-        # Merge additional information
+        # Merge additional information; rule-based fields override NER
         for key, value in additional_info.items():
-            if key not in enhanced or not enhanced[key]:
+            if key in self.rule_based_fields or key not in enhanced or not enhanced[key]:
                 enhanced[key] = value
         
         # Calculate confidence score
@@ -171,33 +263,28 @@ class JobSyncResumeAI:
     
     def extract_additional_info(self, text):
         """Extract additional information using regex patterns"""
-        import re
         
         additional = {}
         
         # Extract email if not found
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            additional['email'] = emails[0]
+        email = EMAIL_PATTERN.search(text)
+        if email:
+            additional['email'] = email.group()
         
         # Extract phone if not found
-        phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            additional['phone'] = f"({phones[0][0]}) {phones[0][1]}-{phones[0][2]}"
+        phone = PHONE_PATTERN.search(text)
+        if phone:
+            additional['phone'] = f"({phone.group(1)}) {phone.group(2)}-{phone.group(3)}"
         
         # Extract years of experience
-        exp_pattern = r'(\d+)[\+]?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
-        exp_matches = re.findall(exp_pattern, text, re.IGNORECASE)
+        exp_matches = YEARS_EXPERIENCE_PATTERN.findall(text)
         if exp_matches:
             additional['years_experience'] = max([int(x) for x in exp_matches])
         
         # Extract degree information
-        degree_pattern = r'(Bachelor|Master|PhD|B\.S\.|M\.S\.|B\.A\.|M\.A\.).*?(?:in\s+)?([A-Za-z\s]+?)(?:\s|,|\.|\n)'
-        degree_matches = re.findall(degree_pattern, text, re.IGNORECASE)
-        if degree_matches:
-            additional['degree'] = f"{degree_matches[0][0]} in {degree_matches[0][1].strip()}"
+        degree = DEGREE_PATTERN.search(text)
+        if degree:
+            additional['degree'] = f"{degree.group(1)} in {degree.group(2).strip()}"
         
         return additional
     
@@ -314,6 +401,21 @@ class JobSyncResumeAI:
             }
         }
 
+_shared_resume_ai = None
+_shared_resume_ai_lock = threading.Lock()
+
+def get_resume_ai(**options):
+    """The process-wide JobSyncResumeAI, created with ``options`` on first call
+    
+    Later calls return the same instance and ignore their options.
+    """
+    global _shared_resume_ai
+    if _shared_resume_ai is None:
+        with _shared_resume_ai_lock:
+            if _shared_resume_ai is None:
+                _shared_resume_ai = JobSyncResumeAI(**options)
+    return _shared_resume_ai
+
 def integrate_with_jobsync():
     """Integration function for JobSync application"""
     
@@ -321,7 +423,7 @@ def integrate_with_jobsync():
     def parse_uploaded_resume(file_path):
         """Parse uploaded resume and return structured data"""
         
-        ai_parser = JobSyncResumeAI()
+        ai_parser = get_resume_ai()
         result = ai_parser.parse_resume_with_ai(file_path)
         
         return result.get('jobsync_formatted', {})
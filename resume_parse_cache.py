@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Resume Parse Cache for JobSync
+==============================
+
+Content-addressed on-disk cache of resume parses. An entry is keyed by the
+SHA-256 of the uploaded file's bytes and stores the extracted text and the
+parse result, so re-uploading a resume, or the same file reaching several
+accounts, skips text extraction and NER entirely.
+
+Entries live in a directory named after the model fingerprint: the
+``meta.json`` version plus a hash of every model file, because retraining
+does not bump the version. A retrained model gets an empty directory;
+the directories of other fingerprints are left alone, since a process
+still running the previous model may be reading them.
+
+The directory of the loaded model is bounded in bytes; when it grows past
+the limit the least recently used entries are evicted. Entries of every
+model are pruned by age and total size with the cleanup command:
+
+    python resume_parse_cache.py --max-age-days 30 --max-mb 256
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+RESUME_PARSE_CACHE_DIR = 'resume_parse_cache'
+RESUME_PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the shape of cached results changes
+CACHE_FORMAT_VERSION = 1
+
+# Evict down to this fraction of the limit, so eviction is not run on every put
+EVICTION_TARGET = 0.9
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """Hex SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_fingerprint(model_path, settings=None):
+    """Hash of the model version, of every file of the model directory and
+    of the inference ``settings`` that change parse results"""
+    digest = hashlib.sha256(f'format:{CACHE_FORMAT_VERSION}'.encode('utf-8'))
+    if settings:
+        digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    try:
+        with open(os.path.join(model_path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        digest.update(f"{meta.get('name')}:{meta.get('version')}".encode('utf-8'))
+    except (OSError, ValueError):
+        pass
+
+    for root, dirs, files in os.walk(model_path):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, model_path).encode('utf-8'))
+            digest.update(file_sha256(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def cache_entries(directory):
+    """(path, last access, size) of every entry under a directory"""
+    entries = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+    return entries
+
+
+def cleanup(cache_dir=RESUME_PARSE_CACHE_DIR, max_bytes=None, max_age_seconds=None):
+    """Prune the entries of every model fingerprint; returns (removed, bytes left)
+
+    Entries not read or written for ``max_age_seconds`` are removed, then the
+    least recently used ones until all fingerprints together fit ``max_bytes``.
+    Directories left empty are removed too.
+    """
+    entries = sorted(cache_entries(cache_dir), key=lambda entry: entry[1])
+    size = sum(entry[2] for entry in entries)
+    cutoff = time.time() - max_age_seconds if max_age_seconds is not None else None
+
+    removed = 0
+    for path, accessed, entry_size in entries:
+        expired = cutoff is not None and accessed < cutoff
+        if not expired and (max_bytes is None or size <= max_bytes):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        size -= entry_size
+        removed += 1
+
+    for root, _, _ in os.walk(cache_dir, topdown=False):
+        if root != cache_dir:
+            try:
+                # Only succeeds on directories that are empty by now
+                os.rmdir(root)
+            except OSError:
+                pass
+    return removed, size
+
+
+class ResumeParseCache:
+    """Size-bounded LRU cache of parse results on disk, per model fingerprint"""
+
+    def __init__(self, fingerprint, cache_dir=RESUME_PARSE_CACHE_DIR,
+                 max_bytes=RESUME_PARSE_CACHE_MAX_BYTES):
+        self.fingerprint = fingerprint
+        self.cache_dir = cache_dir
+        self.directory = os.path.join(cache_dir, fingerprint[:16])
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def _entries(self):
+        return cache_entries(self.directory)
+
+    def get(self, key):
+        """Cached entry for a file hash, or None"""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            # The modification time doubles as the LRU access time
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key, text, result):
+        """Store the text and result of a parse; returns False if it could not be written"""
+        path = self._path(key)
+        payload = json.dumps({'text': text, 'result': result}).encode('utf-8')
+        try:
+            # An overwritten entry no longer counts towards the size
+            replaced_size = os.path.getsize(path)
+        except OSError:
+            replaced_size = 0
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            print(f"Error writing resume parse cache entry: {e}")
+            return False
+
+        with self._lock:
+            self._size += len(payload) - replaced_size
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self.evict()
+        return True
+
+    def evict(self):
+        """Remove least recently used entries until under the size target"""
+        with self._lock:
+            # Other processes share the directory, so measure instead of trusting _size
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            size = sum(entry[2] for entry in entries)
+            target = self.max_bytes * EVICTION_TARGET
+            for path, _, entry_size in entries:
+                if size <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= entry_size
+                self.evictions += 1
+            self._size = size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'model_fingerprint': self.fingerprint[:16],
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+            }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Prune the resume parse cache of every model')
+    parser.add_argument('--cache-dir', default=RESUME_PARSE_CACHE_DIR)
+    parser.add_argument('--max-age-days', type=float, help='remove entries unused for this many days')
+    parser.add_argument('--max-mb', type=float, help='then remove the least recently used entries down to this size')
+    args = parser.parse_args()
+    if args.max_age_days is None and args.max_mb is None:
+        parser.error('give --max-age-days, --max-mb or both')
+
+    removed, size = cleanup(
+        args.cache_dir,
+        max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None,
+        max_age_seconds=args.max_age_days * 86400 if args.max_age_days is not None else None,
+    )
+    print(f"🧹 Removed {removed} cached parses; {size / (1024 * 1024):.1f} MB left in {args.cache_dir}")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Background Resume Parsing Queue for JobSync
+===========================================
+
+``/upload_resume`` only saves the file and enqueues a parse job here; a
+pool of worker threads runs the AI parser and updates ``user_profiles``
+when it finishes. The queue lives in the ``resume_parse_jobs`` table, so
+jobs survive restarts and are shared by every app process.
+
+A worker claims a job by leasing it. If the process dies mid-parse the
+lease expires and another worker picks the job up again, up to
+``max_attempts`` times; a job whose last lease expires is marked failed,
+so a resume that crashes or hangs the parser is not retried forever.
+"""
+
+import json
+import os
+import threading
+import time
+
+RESUME_PARSE_JOBS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS resume_parse_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        file_path TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        lease_expires_at REAL,
+        worker TEXT,
+        result TEXT,
+        error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at TIMESTAMP,
+        finished_at TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+RESUME_PARSE_JOBS_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_resume_parse_jobs_status ON resume_parse_jobs (status, id)',
+    'CREATE INDEX IF NOT EXISTS idx_resume_parse_jobs_user ON resume_parse_jobs (user_id, id)',
+)
+
+# Oldest job that is waiting, or running under an expired lease with
+# attempts left
+CLAIMABLE_JOB_QUERY = '''
+    SELECT id FROM resume_parse_jobs
+    WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < ? AND attempts < ?)
+    ORDER BY id
+    LIMIT 1
+'''
+
+# Jobs whose last attempt's lease expired: the parser crashed or hung on them
+FAIL_EXHAUSTED_JOBS = '''
+    UPDATE resume_parse_jobs
+    SET status = 'failed', error = ?, lease_expires_at = NULL, finished_at = CURRENT_TIMESTAMP
+    WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?
+'''
+
+PARSE_WORKERS = 2
+PARSE_LEASE_SECONDS = 300
+PARSE_MAX_ATTEMPTS = 3
+# Workers also poll, to pick up jobs enqueued by other processes
+PARSE_POLL_INTERVAL = 2.0  # seconds
+
+
+class ResumeParseQueue:
+    """SQLite-backed resume parse jobs processed by worker threads
+
+    ``parse(file_path)`` returns a JSON-serializable result and
+    ``on_complete(conn, job, result)`` applies it to the profile; the queue
+    commits afterwards.
+    """
+
+    def __init__(self, connect, parse, on_complete, workers=PARSE_WORKERS,
+                 lease_seconds=PARSE_LEASE_SECONDS, max_attempts=PARSE_MAX_ATTEMPTS,
+                 poll_interval=PARSE_POLL_INTERVAL):
+        self.connect = connect
+        self.parse = parse
+        self.on_complete = on_complete
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+
+        self._schema_ready = False
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._metrics = {'processed': 0, 'failed': 0, 'retried': 0, 'parse_seconds': 0.0}
+
+    def ensure_schema(self, conn):
+        """Create the table and its indexes if this database does not have them yet"""
+        if not self._schema_ready:
+            conn.execute(RESUME_PARSE_JOBS_SCHEMA)
+            for statement in RESUME_PARSE_JOBS_INDEXES:
+                conn.execute(statement)
+            self._schema_ready = True
+
+    def enqueue(self, conn, user_id, file_path, filename):
+        """Add a parse job and wake a worker; returns the job id"""
+        self.ensure_schema(conn)
+        cursor = conn.execute(
+            'INSERT INTO resume_parse_jobs (user_id, file_path, filename) VALUES (?, ?, ?)',
+            (user_id, file_path, filename)
+        )
+        conn.commit()
+        self._wakeup.set()
+        return cursor.lastrowid
+
+    def status(self, conn, job_id, user_id=None):
+        """Public view of one job, or None if it does not exist (for this user)"""
+        self.ensure_schema(conn)
+        query = 'SELECT * FROM resume_parse_jobs WHERE id = ?'
+        params = [job_id]
+        if user_id is not None:
+            query += ' AND user_id = ?'
+            params.append(user_id)
+        row = conn.execute(query, params).fetchone()
+        return job_status(row) if row else None
+
+    def latest_pending(self, conn, user_id):
+        """Id of the user's newest job that has not finished yet"""
+        self.ensure_schema(conn)
+        row = conn.execute('''
+            SELECT id FROM resume_parse_jobs
+            WHERE user_id = ? AND status IN ('queued', 'running')
+            ORDER BY id DESC
+            LIMIT 1
+        ''', (user_id,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        """Start the worker threads unless they are already running"""
+        with self._lock:
+            if self.running or self.workers <= 0:
+                return False
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._work, name=f'resume-parser-{index}', daemon=True)
+                for index in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            return True
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _claim(self, conn, worker):
+        """Lease the oldest claimable job; returns its row or None"""
+        now = time.time()
+        # IMMEDIATE takes the write lock first, so two workers never claim one job
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            exhausted = conn.execute(FAIL_EXHAUSTED_JOBS, (
+                f'Parsing did not finish within {self.max_attempts} attempts', now, self.max_attempts
+            )).rowcount
+            if exhausted:
+                with self._lock:
+                    self._metrics['failed'] += exhausted
+
+            row = conn.execute(CLAIMABLE_JOB_QUERY, (now, self.max_attempts)).fetchone()
+            if row is None:
+                conn.commit()
+                return None
+            conn.execute('''
+                UPDATE resume_parse_jobs
+                SET status = 'running', attempts = attempts + 1, lease_expires_at = ?,
+                    worker = ?, started_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (now + self.lease_seconds, worker, row[0]))
+            job = conn.execute('SELECT * FROM resume_parse_jobs WHERE id = ?', (row[0],)).fetchone()
+            conn.commit()
+            return job
+        except Exception:
+            conn.rollback()
+            raise
+
+    def process_one(self, worker='main'):
+        """Claim and process one job; returns False when the queue is empty"""
+        conn = self.connect()
+        try:
+            self.ensure_schema(conn)
+            job = self._claim(conn, worker)
+            if job is None:
+                return False
+
+            started = time.perf_counter()
+            try:
+                result = self.parse(job['file_path'])
+                self.on_complete(conn, job, result)
+                conn.execute('''
+                    UPDATE resume_parse_jobs
+                    SET status = 'done', result = ?, error = NULL, lease_expires_at = NULL,
+                        finished_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (json.dumps(result), job['id']))
+                conn.commit()
+                outcome = 'processed'
+            except Exception as e:
+                conn.rollback()
+                retry = job['attempts'] < self.max_attempts
+                conn.execute('''
+                    UPDATE resume_parse_jobs
+                    SET status = ?, error = ?, lease_expires_at = NULL,
+                        finished_at = CASE WHEN ? THEN NULL ELSE CURRENT_TIMESTAMP END
+                    WHERE id = ?
+                ''', ('queued' if retry else 'failed', str(e), retry, job['id']))
+                conn.commit()
+                outcome = 'retried' if retry else 'failed'
+                print(f"❌ Resume parse job {job['id']} failed (attempt {job['attempts']}): {e}")
+
+            with self._lock:
+                self._metrics[outcome] += 1
+                self._metrics['parse_seconds'] += time.perf_counter() - started
+            return True
+        finally:
+            conn.close()
+
+    def _work(self):
+        worker = f'{os.getpid()}:{threading.current_thread().name}'
+        while not self._stopping.is_set():
+            try:
+                if self.process_one(worker):
+                    continue
+            except Exception as e:
+                print(f"Error in resume parse worker: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def stats(self, conn=None):
+        with self._lock:
+            metrics = dict(self._metrics)
+        parse_seconds = metrics.pop('parse_seconds')
+        handled = metrics['processed'] + metrics['failed'] + metrics['retried']
+        stats = {
+            'workers': self.workers,
+            'running': self.running,
+            'avg_parse_ms': round(parse_seconds / handled * 1000, 1) if handled else None,
+            **metrics,
+        }
+        if conn is not None:
+            self.ensure_schema(conn)
+            stats['jobs'] = {
+                row[0]: row[1]
+                for row in conn.execute('SELECT status, COUNT(*) FROM resume_parse_jobs GROUP BY status')
+            }
+        return stats
+
+
+def job_status(row):
+    """JSON-friendly view of a resume_parse_jobs row"""
+    return {
+        'job_id': row['id'],
+        'status': row['status'],
+        'filename': row['filename'],
+        'attempts': row['attempts'],
+        'result': json.loads(row['result']) if row['result'] else None,
+        'error': row['error'] if row['status'] == 'failed' else None,
+        'created_at': row['created_at'],
+        'finished_at': row['finished_at'],
+    }
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Dense Skill Embeddings for JobSync
+==================================
+
+Optional embedding engine that places every canonical skill in a dense
+vector space, so related skills (e.g. "react" and "javascript") score as
+similar even when they share no words. Vectors are learned offline from
+skill co-occurrence in the local ``resume_dataset`` plus the skills already
+in the database: a positive PMI matrix reduced with truncated SVD.
+
+Jobs and profiles are embedded as the normalized mean of their skill
+vectors and served from an in-process IVF index (k-means coarse quantizer),
+which only scans the few clusters closest to the query.
+
+The bundled spaCy model ships without word vectors, so it cannot provide
+them. When no embeddings file exists the engine reports itself unavailable
+and callers stay on the TF-IDF path.
+
+Train with:  python skill_embeddings.py
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.cluster import KMeans
+from sklearn.decomposition import TruncatedSVD
+
+# Where trained skill vectors are persisted
+SKILL_EMBEDDINGS_PATH = 'skill_embeddings.npz'
+# Offline training corpus shipped with the repository
+RESUME_DATASET_PATH = os.path.join('resume_dataset', 'resumes_structured.json')
+
+EMBEDDING_DIM = 64
+
+# Below this many vectors a flat scan beats probing clusters
+IVF_MIN_SIZE = 256
+# Clusters scanned per query
+IVF_NPROBE = 4
+
+
+def load_resume_skill_lists(path=RESUME_DATASET_PATH):
+    """Skills strings of every resume in the structured dataset"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            resumes = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error loading resume dataset: {e}")
+        return []
+    return [', '.join(resume.get('skills', [])) for resume in resumes if resume.get('skills')]
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class SkillEmbeddings:
+    """Dense vectors for canonical skills, learned from co-occurrence"""
+
+    def __init__(self, matcher, path=SKILL_EMBEDDINGS_PATH):
+        self.matcher = matcher
+        self.path = path
+        self.skills = []
+        self.skill_index = {}
+        self.vectors = None
+        self.version = None
+
+    @property
+    def available(self):
+        return self.vectors is not None
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1] if self.available else 0
+
+    def _known_positions(self, skills_text):
+        return [self.skill_index[skill] for skill in self.matcher.normalizer.normalize(skills_text)
+                if skill in self.skill_index]
+
+    def train(self, documents, dim=EMBEDDING_DIM):
+        """Learn skill vectors from skills strings; returns the skill count"""
+        normalize = self.matcher.normalizer.normalize
+        skill_sets = [set(normalize(document)) for document in documents]
+        skills = sorted(set().union(*skill_sets)) if skill_sets else []
+        if len(skills) < 3:
+            return 0
+
+        # Document x skill incidence, then skill x skill co-occurrence counts
+        skill_index = {skill: i for i, skill in enumerate(skills)}
+        rows, cols = [], []
+        for row, skill_set in enumerate(skill_sets):
+            for skill in skill_set:
+                rows.append(row)
+                cols.append(skill_index[skill])
+        incidence = csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                               shape=(len(skill_sets), len(skills)))
+        cooccurrence = (incidence.T @ incidence).toarray()
+
+        # Positive PMI; the diagonal carries no association information
+        np.fill_diagonal(cooccurrence, 0)
+        total = cooccurrence.sum()
+        marginals = cooccurrence.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pmi = np.log(cooccurrence * total / (marginals @ marginals.T))
+        ppmi = np.nan_to_num(np.maximum(pmi, 0), nan=0.0, posinf=0.0, neginf=0.0)
+
+        # Skills never seen alongside another keep a zero vector and are ignored
+        svd = TruncatedSVD(n_components=min(dim, len(skills) - 1), random_state=0)
+        vectors = svd.fit_transform(ppmi)
+        self._install(skills, _normalize_rows(vectors).astype(np.float32))
+        return len(skills)
+
+    def _install(self, skills, vectors):
+        self.skills = list(skills)
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+        self.vectors = vectors
+        self.version = hashlib.sha1(vectors.tobytes()).hexdigest()[:16]
+
+    def save(self, path=None):
+        """Persist skill vectors; written to a temp file then swapped in"""
+        path = path or self.path
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, skills=np.array(self.skills), vectors=self.vectors)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """Load persisted vectors; returns False when none are available"""
+        path = path or self.path
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                self._install(data['skills'].tolist(), data['vectors'].astype(np.float32))
+            print(f"✅ Loaded {len(self.skills)} skill embeddings")
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading skill embeddings: {e}")
+            return False
+
+    def embed(self, skills_text):
+        """Unit-length mean vector of the known skills, or None"""
+        if not self.available:
+            return None
+        positions = self._known_positions(skills_text)
+        if not positions:
+            return None
+        vector = self.vectors[positions].mean(axis=0)
+        norm = np.linalg.norm(vector)
+        return (vector / norm).astype(np.float32) if norm else None
+
+    def similarity(self, skills_a, skills_b):
+        """Cosine similarity of two skills strings, or None if unknown"""
+        vector_a = self.embed(skills_a)
+        vector_b = self.embed(skills_b)
+        if vector_a is None or vector_b is None:
+            return None
+        return float(np.dot(vector_a, vector_b))
+
+
+class IVFIndex:
+    """Inverted-file ANN index over unit vectors, scored by dot product
+
+    ``build`` clusters the vectors with k-means into about sqrt(n) lists;
+    queries scan only the ``nprobe`` lists whose centroids are closest.
+    Small collections use a single list, i.e. an exact flat scan.
+    """
+
+    def __init__(self, owner_type, nprobe=IVF_NPROBE):
+        self.owner_type = owner_type
+        self.nprobe = nprobe
+        self.version = None
+        self.data_version = None
+        self.centroids = None
+        self.lists = []
+        self.assignment = {}
+        self._stacked = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.assignment)
+
+    def build(self, version, vectors, data_version=None):
+        """Replace the index contents with {owner_id: vector}"""
+        owner_ids = list(vectors)
+        matrix = np.array([vectors[owner_id] for owner_id in owner_ids], dtype=np.float32)
+
+        if len(owner_ids) >= IVF_MIN_SIZE:
+            kmeans = KMeans(n_clusters=int(np.sqrt(len(owner_ids))), n_init=1, random_state=0).fit(matrix)
+            centroids = kmeans.cluster_centers_.astype(np.float32)
+            labels = kmeans.labels_
+        else:
+            centroids = np.zeros((1, matrix.shape[1] if len(owner_ids) else 0), dtype=np.float32)
+            labels = np.zeros(len(owner_ids), dtype=int)
+
+        lists = [{} for _ in range(len(centroids))]
+        assignment = {}
+        for owner_id, label, vector in zip(owner_ids, labels.tolist(), matrix):
+            lists[label][owner_id] = vector
+            assignment[owner_id] = label
+
+        with self._lock:
+            self.version = version
+            self.data_version = data_version
+            self.centroids = centroids
+            self.lists = lists
+            self.assignment = assignment
+            self._stacked = [None] * len(lists)
+
+    def _nearest_lists(self, vector, count):
+        if len(self.lists) == 1:
+            return [0]
+        distances = np.linalg.norm(self.centroids - vector, axis=1)
+        return np.argsort(distances)[:count].tolist()
+
+    def add(self, owner_id, vector):
+        """Insert or replace one owner in its nearest list"""
+        with self._lock:
+            self.remove(owner_id)
+            if self.centroids is None:
+                return
+            label = self._nearest_lists(vector, 1)[0]
+            self.lists[label][owner_id] = np.asarray(vector, dtype=np.float32)
+            self.assignment[owner_id] = label
+            self._stacked[label] = None
+
+    def remove(self, owner_id):
+        """Drop one owner from the index"""
+        with self._lock:
+            label = self.assignment.pop(owner_id, None)
+            if label is not None:
+                self.lists[label].pop(owner_id, None)
+                self._stacked[label] = None
+
+    def _list_matrix(self, label):
+        stacked = self._stacked[label]
+        if stacked is None:
+            members = self.lists[label]
+            stacked = (list(members), np.array(list(members.values()), dtype=np.float32))
+            self._stacked[label] = stacked
+        return stacked
+
+    def top_k(self, query_vector, k, exclude=None):
+        """Return up to k (owner_id, similarity) pairs, best first"""
+        scored_ids = []
+        scored = []
+        with self._lock:
+            if self.centroids is None or not self.assignment:
+                return []
+            for label in self._nearest_lists(query_vector, self.nprobe):
+                owner_ids, matrix = self._list_matrix(label)
+                if owner_ids:
+                    scored_ids.extend(owner_ids)
+                    scored.append(matrix @ query_vector)
+
+        if not scored_ids:
+            return []
+        similarities = np.concatenate(scored)
+        if exclude:
+            excluded = set(exclude)
+            similarities[[i for i, owner_id in enumerate(scored_ids) if owner_id in excluded]] = -np.inf
+
+        count = min(k, len(scored_ids))
+        top = np.argpartition(-similarities, count - 1)[:count]
+        top = top[np.argsort(-similarities[top])]
+        return [(scored_ids[i], float(similarities[i])) for i in top if similarities[i] != -np.inf]
+
+
+if __name__ == '__main__':
+    import sqlite3
+
+    from skill_matching import SkillMatcher
+
+    documents = load_resume_skill_lists()
+    try:
+        conn = sqlite3.connect('jobportal.db')
+        documents += [row[0] for row in conn.execute('''
+            SELECT skills FROM jobs WHERE skills IS NOT NULL AND skills != ''
+            UNION ALL
+            SELECT skills FROM user_profiles WHERE skills IS NOT NULL AND skills != ''
+        ''')]
+        conn.close()
+    except sqlite3.Error as e:
+        print(f"Skipping database skills: {e}")
+
+    embeddings = SkillEmbeddings(SkillMatcher())
+    count = embeddings.train(documents)
+    if count:
+        embeddings.save()
+        print(f"✅ Trained {count} skill embeddings ({embeddings.dim} dims) on {len(documents)} documents")
+        print(f"💾 Saved to {SKILL_EMBEDDINGS_PATH}")
+    else:
+        print("❌ Not enough skills to train embeddings")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Skill Inverted Index for JobSync
+================================
+
+In-memory inverted index from vocabulary term to the jobs or profiles whose
+stored skill vector contains it. Ranking a query vector only touches the
+postings of its own terms, so owners sharing no term with the query are
+never scored, and the best hits are selected with a bounded heap.
+
+Indexes live in process memory, so each records the ``data_versions``
+counter of its owner type it was built at; the counter is bumped by
+triggers on every write, including writes from other processes.
+"""
+
+import heapq
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def read_data_version(conn, owner_type):
+    """Change counter of jobs or profiles, or None on an unmigrated database"""
+    try:
+        row = conn.execute('SELECT version FROM data_versions WHERE owner_type = ?', (owner_type,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+class SkillInvertedIndex:
+    """Term -> {owner_id: weight} postings over stored skill vectors"""
+
+    def __init__(self, owner_type):
+        self.owner_type = owner_type
+        self.vocabulary = None
+        self.data_version = None
+        self.postings = {}
+        self.vectors = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def build(self, vocabulary, vectors, data_version=None):
+        """Replace the index contents with {owner_id: (indices, weights)}"""
+        postings = {}
+        for owner_id, (indices, weights) in vectors.items():
+            for term, weight in zip(indices.tolist(), weights.tolist()):
+                postings.setdefault(term, {})[owner_id] = weight
+
+        with self._lock:
+            self.vocabulary = vocabulary
+            self.data_version = data_version
+            self.postings = postings
+            self.vectors = dict(vectors)
+
+    def add(self, owner_id, vector):
+        """Insert or replace the postings of one owner"""
+        with self._lock:
+            self.remove(owner_id)
+            indices, weights = vector
+            for term, weight in zip(indices.tolist(), weights.tolist()):
+                self.postings.setdefault(term, {})[owner_id] = weight
+            self.vectors[owner_id] = vector
+
+    def remove(self, owner_id):
+        """Drop every posting of one owner"""
+        with self._lock:
+            vector = self.vectors.pop(owner_id, None)
+            if vector is None:
+                return
+            for term in vector[0].tolist():
+                term_postings = self.postings.get(term)
+                if term_postings is not None:
+                    term_postings.pop(owner_id, None)
+                    if not term_postings:
+                        del self.postings[term]
+
+    def top_k(self, query_vector, k, exclude=None):
+        """Return up to k (owner_id, similarity) pairs, best first"""
+        indices, weights = query_vector
+        scores = {}
+        with self._lock:
+            for term, query_weight in zip(indices.tolist(), weights.tolist()):
+                for owner_id, weight in self.postings.get(term, {}).items():
+                    scores[owner_id] = scores.get(owner_id, 0.0) + query_weight * weight
+
+        if exclude:
+            for owner_id in exclude:
+                scores.pop(owner_id, None)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+RECOMMENDATION_CACHE_TTL = 600  # seconds
+
+
+class RecommendationCache:
+    """Per-user cache of ranked results with targeted invalidation
+
+    An entry is served only while the user's skills string, the vocabulary
+    and the jobs ``data_versions`` counter it was computed against are all
+    unchanged. The counter lives in the database, so a job posted by any
+    process invalidates every entry at once. Entries also expire after
+    ``ttl`` seconds, since edits to job display fields do not move it.
+    """
+
+    def __init__(self, max_entries=10000, ttl=RECOMMENDATION_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, skills, vocabulary, jobs_version, k):
+        """Cached results for a user, or None on a miss"""
+        with self._lock:
+            entry = self.entries.get(user_id)
+            if (entry is None or entry['skills'] != skills or entry['vocabulary'] != vocabulary
+                    or entry['jobs_version'] != jobs_version or entry['k'] < k
+                    or entry['expires_at'] <= time.monotonic()):
+                return None
+            self.entries.move_to_end(user_id)
+            return entry['results'][:k]
+
+    def put(self, user_id, skills, vocabulary, jobs_version, k, results):
+        """Store results computed for a user against ``jobs_version``"""
+        with self._lock:
+            self.entries[user_id] = {
+                'skills': skills,
+                'vocabulary': vocabulary,
+                'jobs_version': jobs_version,
+                'k': k,
+                'results': results,
+                'expires_at': time.monotonic() + self.ttl,
+            }
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        """Drop one user's entry after their skills changed"""
+        with self._lock:
+            self.entries.pop(user_id, None)
@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+Skill Matching Engine for JobSync
+=================================
+
+TF-IDF based skill matcher used to score jobseekers against job postings.
+
+The matcher can run in two modes:
+- corpus mode: the vectorizer is fitted once on every ``jobs.skills`` and
+  ``user_profiles.skills`` value, persisted to disk and reused via
+  ``transform`` only. It is refitted in the background when the corpus drifts.
+- pair mode: the legacy behaviour, fitting a fresh vocabulary on the two
+  documents being compared. Used until a corpus vectorizer is available.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+# Where the corpus-fitted vectorizer is persisted between restarts
+SKILL_VECTORIZER_PATH = 'skill_vectorizer.pkl'
+
+# Refit once this many skill documents changed since the last fit...
+REFIT_MIN_CHANGES = 25
+# ...or once the changes amount to this fraction of the fitted corpus
+REFIT_DRIFT_RATIO = 0.1
+# A single new document introducing this share of unseen terms forces a refit
+REFIT_OOV_RATIO = 0.3
+
+# Distinct skills strings memoized by the normalizer
+NORMALIZER_CACHE_SIZE = 65536
+# Candidate skill indexes kept for detailed matching
+CANDIDATE_INDEX_CACHE_SIZE = 4096
+
+# Compatibility results cache bounds
+COMPATIBILITY_CACHE_SIZE = 50000
+COMPATIBILITY_CACHE_TTL = 3600  # seconds
+
+
+class SkillNormalizer:
+    """Compiled skill normalization with interned integer skill IDs
+
+    The synonym table is compiled once into a token -> canonical skill map.
+    Canonical skills of stored jobs and profiles are interned to stable
+    integer IDs, so coverage checks become integer set operations; request
+    input is only looked up, so it cannot grow the table. Results are
+    memoized by input string.
+    """
+
+    SPLIT_PATTERN = re.compile(r'[,;|/\n\r]+')
+    CLEAN_PATTERN = re.compile(r'[^\w\s+#.]')
+
+    def __init__(self, synonyms):
+        self.synonyms = dict(synonyms)
+        self._skill_ids = {}
+        self._intern_lock = threading.Lock()
+
+        # Compile synonyms straight to their cleaned canonical form
+        self._canonical = {
+            token: self._clean(canonical) for token, canonical in self.synonyms.items()
+        }
+
+        self.normalize = lru_cache(maxsize=NORMALIZER_CACHE_SIZE)(self._normalize)
+        self.skill_ids = lru_cache(maxsize=NORMALIZER_CACHE_SIZE)(self._skill_ids_for)
+        self.listed_skills = lru_cache(maxsize=NORMALIZER_CACHE_SIZE)(self._listed_skills)
+
+    def _clean(self, skill):
+        """Remove special characters except + and # and normalize whitespace"""
+        return ' '.join(self.CLEAN_PATTERN.sub(' ', skill).split())
+
+    def canonical(self, skill):
+        """Canonical form of one lowercased, stripped skill"""
+        canonical = self._canonical.get(skill)
+        if canonical is None:
+            canonical = self._clean(skill)
+        return canonical
+
+    def synonym(self, skill):
+        """Synonym-table replacement of one lowercased skill, without cleaning"""
+        return self.synonyms.get(skill, skill)
+
+    def intern(self, skill):
+        """Stable integer ID for a canonical skill of a stored job or profile"""
+        skill_id = self._skill_ids.get(skill)
+        if skill_id is None:
+            with self._intern_lock:
+                skill_id = self._skill_ids.setdefault(skill, len(self._skill_ids))
+        return skill_id
+
+    def _normalize(self, skills_text):
+        """Canonical skills of a skills string, in order"""
+        if not skills_text:
+            return ()
+
+        canonical_skills = []
+        for skill in self.SPLIT_PATTERN.split(skills_text.lower()):
+            skill = skill.strip()
+            if skill:
+                skill = self.canonical(skill)
+                if skill:
+                    canonical_skills.append(skill)
+        return tuple(canonical_skills)
+
+    def _skill_ids_for(self, skills_text):
+        """Sorted unique canonical skill IDs of a stored job's or profile's skills"""
+        return tuple(sorted({self.intern(skill) for skill in self.normalize(skills_text)}))
+
+    def known_skill_ids(self, skills_text):
+        """IDs of the skills of any skills string that are already interned
+
+        Not memoized: a skill interned later must show up on the next call.
+        Skills never interned cannot be in a stored requirement, so leaving
+        them out changes no coverage check against one.
+        """
+        skill_ids = self._skill_ids
+        return frozenset(skill_ids[skill] for skill in self.normalize(skills_text) if skill in skill_ids)
+
+    def _listed_skills(self, skills_text):
+        """Comma-separated skills, stripped and lowercased, as entered"""
+        if not skills_text:
+            return ()
+        return tuple(skill.strip().lower() for skill in skills_text.split(','))
+
+
+class CompatibilityCache:
+    """Bounded LRU + TTL cache of compatibility results
+
+    Keys are a hash of the result kind and the two skill strings. Every
+    lookup carries the matcher version; when it differs from the version
+    the cached entries were computed with, the cache is cleared first, so
+    a refitted vocabulary or edited synonym table never serves old results.
+    Cached values are shared and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=COMPATIBILITY_CACHE_SIZE, ttl=COMPATIBILITY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def _key(self, kind, job_text, user_text):
+        """Content hash of one cached computation"""
+        return hashlib.sha1(f"{kind}\0{job_text}\0{user_text}".encode('utf-8')).digest()
+
+    def get_or_compute(self, kind, version, job_text, user_text, compute):
+        """Return the cached result for the pair, computing it on a miss"""
+        key = self._key(kind, job_text, user_text)
+        now = time.monotonic()
+
+        with self._lock:
+            if version != self.version:
+                if self.entries:
+                    self.invalidations += 1
+                self.entries.clear()
+                self.version = version
+
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.hits += 1
+                    self.entries.move_to_end(key)
+                    return entry[1]
+                del self.entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            # Skip the store if the matcher changed while computing
+            if version == self.version:
+                self.entries[key] = (now + self.ttl, value)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+
+        return value
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+class SubstringIndex:
+    """Trigram index answering "which strings contain, or are contained in, q?"
+
+    If one string of three or more characters is a substring of another,
+    the other contains its first trigram. Looking up the query's trigrams
+    and first trigram therefore yields a superset of the related strings,
+    which callers verify with a real substring test.
+    """
+
+    def __init__(self, strings):
+        self.strings = strings
+        self.prefixes = {}
+        self.trigrams = {}
+        self.short = []
+
+        for position, string in enumerate(strings):
+            if len(string) < 3:
+                self.short.append(position)
+                continue
+            self.prefixes.setdefault(string[:3], []).append(position)
+            for gram in {string[i:i + 3] for i in range(len(string) - 2)}:
+                self.trigrams.setdefault(gram, []).append(position)
+
+    def candidates(self, query):
+        """Positions of strings that may contain or be contained in query"""
+        if len(query) < 3:
+            # A short query can sit inside any string
+            return set(range(len(self.strings)))
+
+        found = set(self.short)
+        for gram in {query[i:i + 3] for i in range(len(query) - 2)}:
+            found.update(self.prefixes.get(gram, ()))
+        found.update(self.trigrams.get(query[:3], ()))
+        return found
+
+
+class CandidateSkills:
+    """A candidate's listed skills, indexed for detailed matching"""
+
+    def __init__(self, normalizer, skills_text):
+        self.skills = normalizer.listed_skills(skills_text)
+        self.skill_set = frozenset(self.skills)
+        self.normalized = tuple(normalizer.synonym(skill) for skill in self.skills)
+        self.skills_index = SubstringIndex(self.skills)
+        self.normalized_index = SubstringIndex(self.normalized)
+
+    def find_related(self, job_skill, job_normalized):
+        """First listed skill related to a job skill by substring or synonym"""
+        positions = self.skills_index.candidates(job_skill) | self.normalized_index.candidates(job_normalized)
+        for position in sorted(positions):
+            user_skill = self.skills[position]
+            user_normalized = self.normalized[position]
+            if (user_skill in job_skill or job_skill in user_skill or
+                    user_normalized in job_normalized or job_normalized in user_normalized):
+                return user_skill
+        return None
+
+
+class SkillMatcher:
+    """Advanced skill matching using TF-IDF and cosine similarity"""
+
+    def __init__(self, vectorizer_path=None):
+        self.vectorizer = self._build_vectorizer()
+        self.vectorizer_path = vectorizer_path
+
+        # Corpus-fitted state, swapped as a whole by fit_corpus/load_vectorizer
+        self.corpus_vectorizer = None
+        self.corpus_signature = None
+        self.corpus_size = 0
+        self.corpus_fitted_at = None
+
+        # Drift tracking for background refits
+        self.changes_since_fit = 0
+        self._refit_lock = threading.Lock()
+        self._refit_thread = None
+
+        self.skill_synonyms = {
+            'js': 'javascript',
+            'ts': 'typescript',
+            'py': 'python',
+            'ml': 'machine learning',
+            'ai': 'artificial intelligence',
+            'db': 'database',
+            'sql': 'structured query language',
+            'nosql': 'non relational database',
+            'api': 'application programming interface',
+            'ui': 'user interface',
+            'ux': 'user experience',
+            'css3': 'css',
+            'html5': 'html',
+            'es6': 'javascript',
+            'react.js': 'react',
+            'vue.js': 'vue',
+            'node.js': 'nodejs',
+            'express.js': 'express',
+            'mongodb': 'mongo database',
+            'postgresql': 'postgres',
+            'mysql': 'my sql database',
+            'aws': 'amazon web services',
+            'gcp': 'google cloud platform',
+            'k8s': 'kubernetes',
+            'docker': 'containerization',
+            'ci/cd': 'continuous integration continuous deployment',
+            'devops': 'development operations',
+            'frontend': 'front end development',
+            'backend': 'back end development',
+            'fullstack': 'full stack development'
+        }
+        self.compile_synonyms()
+
+    def compile_synonyms(self):
+        """(Re)compile the synonym table; call after editing skill_synonyms"""
+        self.normalizer = SkillNormalizer(self.skill_synonyms)
+        self.synonyms_version = hashlib.sha1(
+            repr(sorted(self.skill_synonyms.items())).encode('utf-8')
+        ).hexdigest()
+        self.candidate_skills = lru_cache(maxsize=CANDIDATE_INDEX_CACHE_SIZE)(
+            lambda skills_text: CandidateSkills(self.normalizer, skills_text)
+        )
+
+    def _build_vectorizer(self):
+        """Create an unfitted TF-IDF vectorizer with the matcher settings"""
+        return TfidfVectorizer(
+            lowercase=True,
+            stop_words='english',
+            ngram_range=(1, 2),  # Include both unigrams and bigrams
+            max_features=1000,
+            token_pattern=r'\b[a-zA-Z][a-zA-Z0-9+#.]*\b'  # Include tech terms like C++, C#, .NET
+        )
+
+    def preprocess_skills(self, skills_text):
+        """Preprocess and normalize skills text"""
+        return ' '.join(self.normalizer.normalize(skills_text))
+
+    # ------------------------------------------------------------------
+    # Corpus vocabulary
+    # ------------------------------------------------------------------
+
+    @property
+    def version(self):
+        """Changes whenever the vocabulary or the synonym table changes"""
+        return (self.corpus_signature, self.synonyms_version)
+
+    @property
+    def version_tag(self):
+        """``version`` as a string, for tagging stored results"""
+        return f"{self.corpus_signature or 'pairwise'}:{self.synonyms_version}"
+
+    @property
+    def corpus_mode(self):
+        """True when scoring uses the corpus-fitted vectorizer"""
+        return self.corpus_vectorizer is not None
+
+    def compute_corpus_signature(self, documents):
+        """Order-independent fingerprint of a preprocessed corpus"""
+        digest = hashlib.sha1()
+        for document in sorted(documents):
+            digest.update(document.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def fit_corpus(self, skills_texts):
+        """Fit the vectorizer once on the whole skills corpus"""
+        documents = [doc for doc in (self.preprocess_skills(text) for text in skills_texts) if doc]
+        if not documents:
+            return False
+
+        signature = self.compute_corpus_signature(documents)
+        if signature == self.corpus_signature:
+            self.changes_since_fit = 0
+            return True
+
+        vectorizer = self._build_vectorizer()
+        try:
+            vectorizer.fit(documents)
+        except ValueError as e:
+            # Empty vocabulary, e.g. a corpus made only of stop words
+            print(f"Error fitting skill corpus vectorizer: {e}")
+            return False
+
+        self._install_corpus_vectorizer(vectorizer, signature, len(documents), time.time())
+        return True
+
+    def _install_corpus_vectorizer(self, vectorizer, signature, corpus_size, fitted_at):
+        """Swap in a fitted vectorizer; readers see either the old or the new one"""
+        self.corpus_vectorizer = vectorizer
+        self.corpus_signature = signature
+        self.corpus_size = corpus_size
+        self.corpus_fitted_at = fitted_at
+        self.changes_since_fit = 0
+
+    def save_vectorizer(self, path=None):
+        """Persist the corpus-fitted vectorizer to disk"""
+        path = path or self.vectorizer_path
+        if not path or not self.corpus_mode:
+            return False
+
+        state = {
+            'vectorizer': self.corpus_vectorizer,
+            'signature': self.corpus_signature,
+            'corpus_size': self.corpus_size,
+            'fitted_at': self.corpus_fitted_at,
+        }
+
+        # Write to a temp file first so readers never see a partial pickle
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(tmp_path, path)
+        return True
+
+    def load_vectorizer(self, path=None):
+        """Load a previously persisted corpus vectorizer"""
+        path = path or self.vectorizer_path
+        if not path or not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+            self._install_corpus_vectorizer(
+                state['vectorizer'], state['signature'], state['corpus_size'], state['fitted_at']
+            )
+            return True
+        except Exception as e:
+            print(f"Error loading skill vectorizer from {path}: {e}")
+            return False
+
+    def note_corpus_change(self, skills_text):
+        """Record a changed skills document; returns True when a refit is due"""
+        if not self.corpus_mode:
+            return True
+
+        self.changes_since_fit += 1
+        if self.changes_since_fit >= max(REFIT_MIN_CHANGES, self.corpus_size * REFIT_DRIFT_RATIO):
+            return True
+
+        # Terms the fitted vocabulary has never seen cannot contribute to
+        # any score, so a document made largely of them is drift on its own
+        document = self.preprocess_skills(skills_text)
+        if not document:
+            return False
+        terms = set(self.corpus_vectorizer.build_analyzer()(document))
+        if not terms:
+            return False
+        unseen = len(terms - self.corpus_vectorizer.vocabulary_.keys())
+        return unseen / len(terms) >= REFIT_OOV_RATIO
+
+    def refit(self, load_corpus, on_refit=None):
+        """Refit the corpus vectorizer now; True when a new vocabulary was installed
+
+        ``load_corpus`` returns the current list of skills strings. ``on_refit``
+        is called with the matcher after a new vocabulary has been installed.
+        """
+        previous_signature = self.corpus_signature
+        if not self.fit_corpus(load_corpus()) or self.corpus_signature == previous_signature:
+            return False
+        self.save_vectorizer()
+        print(f"✅ Skill vocabulary refitted on {self.corpus_size} documents")
+        if on_refit:
+            on_refit(self)
+        return True
+
+    def refit_in_background(self, load_corpus, on_refit=None):
+        """Run ``refit`` on a daemon thread unless one is already running"""
+        with self._refit_lock:
+            if self._refit_thread and self._refit_thread.is_alive():
+                return False
+
+            def refit():
+                try:
+                    self.refit(load_corpus, on_refit)
+                except Exception as e:
+                    print(f"Error refitting skill vocabulary: {e}")
+
+            self._refit_thread = threading.Thread(target=refit, name='skill-vocabulary-refit', daemon=True)
+            self._refit_thread.start()
+            return True
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def vectorize(self, documents):
+        """Vectorize preprocessed documents, returning (tfidf_matrix, vectorizer)
+
+        Corpus mode only transforms; pair mode fits a throwaway vocabulary on
+        the given documents, as the matcher always did.
+        """
+        vectorizer = self.corpus_vectorizer
+        if vectorizer is not None:
+            return vectorizer.transform(documents), vectorizer
+
+        vectorizer = self._build_vectorizer()
+        return vectorizer.fit_transform(documents), vectorizer
+
+    def calculate_semantic_similarity(self, job_skills, candidate_skills):
+        """Calculate semantic similarity using TF-IDF and cosine similarity"""
+        if not job_skills or not candidate_skills:
+            return 0
+
+        # Preprocess skills
+        job_text = self.preprocess_skills(job_skills)
+        candidate_text = self.preprocess_skills(candidate_skills)
+
+        if not job_text or not candidate_text:
+            return 0
+
+        try:
+            # Create TF-IDF vectors
+            tfidf_matrix, _ = self.vectorize([job_text, candidate_text])
+
+            # Calculate cosine similarity
+            similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
+            similarity_score = similarity_matrix[0][0]
+
+            # Convert to percentage and ensure it's between 0-100
+            percentage = max(0, min(100, similarity_score * 100))
+
+            return int(round(percentage))
+
+        except Exception as e:
+            print(f"Error calculating semantic similarity: {e}")
+            # Fallback to basic matching
+            return self.basic_compatibility(job_skills, candidate_skills)
+
+    def score_many(self, candidate, jobs):
+        """Score one candidate skills string against many job skills strings
+
+        Returns a list of percentages aligned with ``jobs``. In corpus mode the
+        whole list is scored with one sparse matrix-vector product.
+        """
+        if not jobs:
+            return []
+        if not candidate or not self.corpus_mode:
+            return [self.calculate_semantic_similarity(job_skills, candidate) for job_skills in jobs]
+
+        candidate_text = self.preprocess_skills(candidate)
+        if not candidate_text:
+            return [0] * len(jobs)
+
+        job_texts = [self.preprocess_skills(job_skills) for job_skills in jobs]
+        tfidf_matrix, _ = self.vectorize([candidate_text] + job_texts)
+
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        similarities = (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel()
+        return [int(round(score)) for score in np.clip(similarities * 100, 0, 100)]
+
+    def score_pairs(self, pairs):
+        """Score (job_skills, candidate_skills) pairs, aligned with ``pairs``
+
+        In corpus mode each side is vectorized with a single transform and the
+        pairs are scored with one row-wise sparse dot product.
+        """
+        if not pairs:
+            return []
+        if not self.corpus_mode:
+            return [self.calculate_semantic_similarity(job_skills, candidate) for job_skills, candidate in pairs]
+
+        job_matrix = self.corpus_vectorizer.transform([self.preprocess_skills(job_skills) for job_skills, _ in pairs])
+        candidate_matrix = self.corpus_vectorizer.transform([self.preprocess_skills(candidate) for _, candidate in pairs])
+        similarities = np.asarray(job_matrix.multiply(candidate_matrix).sum(axis=1)).ravel()
+        return [int(round(score)) for score in np.clip(similarities * 100, 0, 100)]
+
+    def match_details(self, job_skills, user_skills):
+        """Detailed compatibility: exact, semantic and missing skills plus key terms
+
+        Exact matches are integer ID lookups and semantic matches come from a
+        trigram index over the candidate's skills, so the cost is close to
+        linear in the number of skills. The score and the key terms share a
+        single vectorization.
+        """
+        if not job_skills or not user_skills:
+            return {'score': 0, 'matched': [], 'missing': job_skills.split(',') if job_skills else [], 'semantic_analysis': {}}
+
+        score, semantic_analysis = self._score_with_key_terms(job_skills, user_skills)
+
+        # Parse skills for detailed analysis
+        job_skills_list = [skill.strip() for skill in job_skills.split(',')]
+        job_listed = self.normalizer.listed_skills(job_skills)
+        candidate = self.candidate_skills(user_skills)
+
+        # Find exact and partial matches
+        matched_skills = []
+        missing_skills = []
+        semantic_matches = []
+
+        for job_skill, job_listed_skill in zip(job_skills_list, job_listed):
+            if job_listed_skill in candidate.skill_set:
+                matched_skills.append(job_skill)
+                continue
+
+            job_skill_lower = job_skill.lower()
+            user_skill = candidate.find_related(job_skill_lower, self.normalizer.synonym(job_skill_lower))
+            if user_skill is not None:
+                semantic_matches.append({
+                    'required': job_skill,
+                    'candidate': user_skill,
+                    'match_type': 'semantic'
+                })
+            else:
+                missing_skills.append(job_skill)
+
+        return {
+            'score': score,
+            'matched': matched_skills,
+            'missing': missing_skills,
+            'semantic_matches': semantic_matches,
+            'total_required': len(job_skills_list),
+            'semantic_analysis': semantic_analysis,
+            'match_breakdown': {
+                'exact_matches': len(matched_skills),
+                'semantic_matches': len(semantic_matches),
+                'missing_skills': len(missing_skills),
+                'coverage_percentage': ((len(matched_skills) + len(semantic_matches)) / len(job_skills_list) * 100) if job_skills_list else 0
+            }
+        }
+
+    def _score_with_key_terms(self, job_skills, user_skills):
+        """Similarity score and top TF-IDF terms from one vectorization"""
+        job_text = self.preprocess_skills(job_skills)
+        user_text = self.preprocess_skills(user_skills)
+
+        if not job_text or not user_text:
+            return 0, {}
+
+        try:
+            tfidf_matrix, vectorizer = self.vectorize([job_text, user_text])
+            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+            score = int(round(max(0, min(100, similarity * 100))))
+        except Exception as e:
+            print(f"Error in semantic analysis: {e}")
+            return self.basic_compatibility(job_skills, user_skills), {}
+
+        feature_names = vectorizer.get_feature_names_out()
+        return score, {
+            'job_key_terms': self._top_terms(tfidf_matrix[0], feature_names),
+            'candidate_key_terms': self._top_terms(tfidf_matrix[1], feature_names),
+            'tfidf_similarity': score / 100.0
+        }
+
+    def _top_terms(self, row, feature_names, limit=5):
+        """Highest weighted (term, weight) pairs of one sparse TF-IDF row"""
+        order = np.argsort(-row.data, kind='stable')[:limit]
+        return [(feature_names[row.indices[i]], float(row.data[i])) for i in order]
+
+    def basic_compatibility(self, job_skills, user_skills):
+        """Basic overlap compatibility, also the fallback when TF-IDF fails"""
+        if not job_skills or not user_skills:
+            return 0
+
+        job_skills_list = self.normalizer.listed_skills(job_skills)
+        user_skills_list = self.normalizer.listed_skills(user_skills)
+
+        # Exact matches
+        exact_matches = set(job_skills_list) & set(user_skills_list)
+
+        # Partial matches (for similar skills)
+        partial_matches = 0
+        for job_skill in job_skills_list:
+            if job_skill not in exact_matches:
+                for user_skill in user_skills_list:
+                    if user_skill not in exact_matches:
+                        # Check for partial matches
+                        if (job_skill in user_skill or user_skill in job_skill) and len(job_skill) > 2:
+                            partial_matches += 0.5
+                            break
+
+        # Calculate compatibility
+        total_matches = len(exact_matches) + partial_matches
+        compatibility = (total_matches / len(job_skills_list)) * 100 if job_skills_list else 0
+
+        return min(int(compatibility), 100)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Weighted and Required Job Skills for JobSync
+============================================
+
+Employers can weight the skills of a job and mark some as must-have. The
+requirements are stored per canonical skill in ``job_skill_requirements``.
+
+Scoring a job with requirements is a weighted dot product between the job's
+skill weights and a 0/1 candidate x skill incidence matrix. Candidates
+missing a required skill are pruned first by intersecting the postings of
+the required skills, so no score is ever computed for them.
+"""
+
+import threading
+
+import numpy as np
+
+JOB_SKILL_REQUIREMENTS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS job_skill_requirements (
+        job_id INTEGER NOT NULL,
+        skill TEXT NOT NULL,
+        weight REAL NOT NULL DEFAULT 1.0,
+        required INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (job_id, skill),
+        FOREIGN KEY (job_id) REFERENCES jobs (id)
+    )
+'''
+
+DEFAULT_SKILL_WEIGHT = 1.0
+MAX_SKILL_WEIGHT = 10.0
+
+
+def parse_skill_weights(normalizer, weights_text):
+    """{canonical skill: weight} from text like 'Python=3, Docker: 2'"""
+    weights = {}
+    for item in (weights_text or '').split(','):
+        separator = '=' if '=' in item else ':'
+        name, _, value = item.rpartition(separator)
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        weight = max(0.0, min(MAX_SKILL_WEIGHT, weight))
+        for skill in normalizer.normalize(name):
+            weights[skill] = weight
+    return weights
+
+
+def parse_skill_requirements(normalizer, skills_text, required_text='', weights_text=''):
+    """[(canonical skill, weight, required)] for a job, in listing order
+
+    Returns an empty list when the employer set neither weights nor
+    must-haves, so plain jobs keep the regular similarity scoring.
+    """
+    required = set(normalizer.normalize(required_text))
+    weights = parse_skill_weights(normalizer, weights_text)
+    if not required and not weights:
+        return []
+
+    # Must-haves missing from the skills list are appended to it
+    listed = normalizer.normalize(skills_text)
+    skills = list(dict.fromkeys(listed + tuple(sorted(required.difference(listed)))))
+    return [(skill, weights.get(skill, DEFAULT_SKILL_WEIGHT), skill in required) for skill in skills]
+
+
+class SkillRequirementStore:
+    """SQLite-backed per-job skill weights and must-have flags"""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self._schema_ready = False
+
+    def ensure_schema(self, conn):
+        """Create the table if this database does not have it yet"""
+        if not self._schema_ready:
+            conn.execute(JOB_SKILL_REQUIREMENTS_SCHEMA)
+            self._schema_ready = True
+
+    def save(self, conn, job_id, requirements):
+        """Replace the requirements of one job; caller commits"""
+        self.ensure_schema(conn)
+        conn.execute('DELETE FROM job_skill_requirements WHERE job_id = ?', (job_id,))
+        conn.executemany('''
+            INSERT INTO job_skill_requirements (job_id, skill, weight, required)
+            VALUES (?, ?, ?, ?)
+        ''', [(job_id, skill, weight, int(required)) for skill, weight, required in requirements])
+
+    def load_canonical(self, conn, job_ids):
+        """{job_id: [(canonical skill, weight, required)]} for jobs that have requirements
+
+        Skill names rather than interned IDs, which are only meaningful
+        inside the process that interned them.
+        """
+        self.ensure_schema(conn)
+        job_ids = list(job_ids)
+        requirements = {}
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(f'''
+                SELECT job_id, skill, weight, required FROM job_skill_requirements
+                WHERE job_id IN ({placeholders})
+            ''', chunk).fetchall()
+            for row in rows:
+                requirements.setdefault(row[0], []).append((row[1], row[2], bool(row[3])))
+        return requirements
+
+    def load(self, conn, job_ids):
+        """{job_id: [(skill_id, weight, required)]} for jobs that have requirements"""
+        return intern_requirements(self.matcher.normalizer, self.load_canonical(conn, job_ids))
+
+
+def intern_requirements(normalizer, requirements):
+    """Replace the canonical skill names of ``load_canonical`` results with skill IDs"""
+    return {
+        job_id: [(normalizer.intern(skill), weight, required) for skill, weight, required in job_requirements]
+        for job_id, job_requirements in requirements.items()
+    }
+
+
+def weighted_pair_score(requirements, candidate_skill_ids):
+    """Weighted coverage percentage of one candidate; 0 if a must-have is missing"""
+    have = set(candidate_skill_ids)
+    if any(required and skill_id not in have for skill_id, _, required in requirements):
+        return 0
+    total = sum(weight for _, weight, _ in requirements)
+    if not total:
+        return 0
+    matched = sum(weight for skill_id, weight, _ in requirements if skill_id in have)
+    return int(round(matched / total * 100))
+
+
+class ProfileSkillIndex:
+    """Canonical skill ID -> profiles having it, for must-have pruning"""
+
+    def __init__(self):
+        self.version = None
+        self.data_version = None
+        self.postings = {}
+        self.profiles = {}
+        self._arrays = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def build(self, version, profile_skill_ids, data_version=None):
+        """Replace the contents with {user_id: skill_ids}"""
+        postings = {}
+        for user_id, skill_ids in profile_skill_ids.items():
+            for skill_id in skill_ids:
+                postings.setdefault(skill_id, set()).add(user_id)
+
+        with self._lock:
+            self.version = version
+            self.data_version = data_version
+            self.postings = postings
+            self.profiles = dict(profile_skill_ids)
+            self._arrays = {}
+
+    def add(self, user_id, skill_ids):
+        with self._lock:
+            self.remove(user_id)
+            for skill_id in skill_ids:
+                self.postings.setdefault(skill_id, set()).add(user_id)
+                self._arrays.pop(skill_id, None)
+            self.profiles[user_id] = skill_ids
+
+    def remove(self, user_id):
+        with self._lock:
+            for skill_id in self.profiles.pop(user_id, ()):
+                users = self.postings.get(skill_id)
+                if users is not None:
+                    users.discard(user_id)
+                    self._arrays.pop(skill_id, None)
+
+    def _posting_array(self, skill_id):
+        """Sorted user ids having a skill, cached until the posting changes"""
+        array = self._arrays.get(skill_id)
+        if array is None:
+            array = np.array(sorted(self.postings.get(skill_id, ())), dtype=np.int64)
+            self._arrays[skill_id] = array
+        return array
+
+    def rank(self, requirements, k):
+        """Top-k (user_id, score) by weighted coverage among qualifying profiles"""
+        skill_ids = [skill_id for skill_id, _, _ in requirements]
+        weights = np.array([weight for _, weight, _ in requirements], dtype=np.float32)
+        required = [skill_id for skill_id, _, is_required in requirements if is_required]
+        total = weights.sum()
+        if not total:
+            return []
+
+        with self._lock:
+            postings = [self._posting_array(skill_id) for skill_id in skill_ids]
+            if required:
+                # Hard filter: intersect must-have postings, smallest first
+                required_postings = sorted((self._posting_array(skill_id) for skill_id in required), key=len)
+                pool = required_postings[0]
+                for posting in required_postings[1:]:
+                    pool = np.intersect1d(pool, posting, assume_unique=True)
+            else:
+                # Only profiles sharing at least one skill can score above zero
+                pool = np.unique(np.concatenate(postings)) if postings else np.empty(0, dtype=np.int64)
+
+        if not len(pool):
+            return []
+
+        # Candidate x skill 0/1 incidence, then one weighted matrix-vector product
+        incidence = np.column_stack([np.isin(pool, posting, assume_unique=True) for posting in postings])
+        scores = incidence.astype(np.float32) @ weights / total * 100
+
+        count = min(k, len(pool))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(pool[i]), int(round(scores[i]))) for i in top if scores[i] > 0]
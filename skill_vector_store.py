@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Skill Vector Store for JobSync
+==============================
+
+Persists the L2-normalized TF-IDF skill vector of every job and jobseeker
+profile in a SQLite side table, so scoring a pair is a single sparse dot
+product with no text processing on the request path.
+
+Vectors are tagged with the corpus signature of the vocabulary they were
+built with and a hash of the skills text they encode; rows from an older
+vocabulary, or whose source text has changed since (including writes that
+bypass the app, such as seeding scripts), are treated as missing and are
+rebuilt lazily or in bulk after a refit.
+"""
+
+import hashlib
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Owner type -> (source table, key column) holding the raw skills text
+VECTOR_SOURCES = {
+    'job': ('jobs', 'id'),
+    'profile': ('user_profiles', 'user_id'),
+}
+
+SKILL_VECTORS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS skill_vectors (
+        owner_type TEXT NOT NULL,
+        owner_id INTEGER NOT NULL,
+        vocabulary TEXT NOT NULL,
+        skills_hash TEXT,
+        indices BLOB NOT NULL,
+        weights BLOB NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (owner_type, owner_id)
+    )
+'''
+
+EMPTY_VECTOR = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+
+
+def skills_hash(skills_text):
+    """Fingerprint of the skills text a vector was encoded from"""
+    return hashlib.sha1((skills_text or '').encode('utf-8')).hexdigest()
+
+
+def sparse_dot(vector_a, vector_b):
+    """Dot product of two (indices, weights) vectors with sorted indices"""
+    indices_a, weights_a = vector_a
+    indices_b, weights_b = vector_b
+    if not len(indices_a) or not len(indices_b):
+        return 0.0
+    _, pos_a, pos_b = np.intersect1d(indices_a, indices_b, assume_unique=True, return_indices=True)
+    return float(np.dot(weights_a[pos_a], weights_b[pos_b]))
+
+
+def to_csr_matrix(vectors, n_features):
+    """Stack (indices, weights) vectors into a CSR matrix, one row each"""
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(indices) for indices, _ in vectors])
+    indices = np.concatenate([vector[0] for vector in vectors]) if vectors else EMPTY_VECTOR[0]
+    weights = np.concatenate([vector[1] for vector in vectors]) if vectors else EMPTY_VECTOR[1]
+    return csr_matrix((weights, indices, indptr), shape=(len(vectors), n_features))
+
+
+class SkillVectorStore:
+    """SQLite-backed store of precomputed skill vectors"""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self._schema_ready = False
+
+    def ensure_schema(self, conn):
+        """Create the side table if this database does not have it yet"""
+        if not self._schema_ready:
+            conn.execute(SKILL_VECTORS_SCHEMA)
+            self._schema_ready = True
+
+    @property
+    def vocabulary(self):
+        """Signature of the vocabulary new vectors are built with"""
+        return self.matcher.corpus_signature
+
+    def encode(self, skills_text):
+        """Turn a skills string into a sorted (indices, weights) vector"""
+        document = self.matcher.preprocess_skills(skills_text)
+        if not document:
+            return EMPTY_VECTOR
+
+        row = self.matcher.corpus_vectorizer.transform([document])
+        row.sort_indices()
+        return row.indices.astype(np.int32), row.data.astype(np.float32)
+
+    def upsert(self, conn, owner_type, owner_id, skills_text):
+        """Store the vector for one job or profile; caller commits"""
+        if not self.matcher.corpus_mode:
+            return None
+
+        self.ensure_schema(conn)
+        vector = self.encode(skills_text)
+        conn.execute('''
+            INSERT OR REPLACE INTO skill_vectors
+                (owner_type, owner_id, vocabulary, skills_hash, indices, weights, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (owner_type, owner_id, self.vocabulary, skills_hash(skills_text),
+              vector[0].tobytes(), vector[1].tobytes()))
+        return vector
+
+    def _current_rows(self, conn, owner_type, owner_ids=None):
+        """(owner_id, skills, stored vector or None) of owners, None when stale
+
+        A stored vector is current only if it was built with this vocabulary
+        from the skills text the source row holds now.
+        """
+        table, key = VECTOR_SOURCES[owner_type]
+        query = f'''
+            SELECT s.{key}, s.skills, v.skills_hash, v.indices, v.weights
+            FROM {table} s
+            LEFT JOIN skill_vectors v
+                ON v.owner_type = ? AND v.owner_id = s.{key} AND v.vocabulary = ?
+        '''
+        if owner_ids is None:
+            chunks = [None]
+        else:
+            # Chunk to stay below SQLite's bound-parameter limit
+            chunks = [owner_ids[start:start + 500] for start in range(0, len(owner_ids), 500)]
+
+        for chunk in chunks:
+            if chunk is None:
+                rows = conn.execute(query, (owner_type, self.vocabulary)).fetchall()
+            else:
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f'{query} WHERE s.{key} IN ({placeholders})',
+                                    (owner_type, self.vocabulary, *chunk)).fetchall()
+            for row in rows:
+                vector = None
+                if row[3] is not None and row[2] == skills_hash(row[1]):
+                    vector = (np.frombuffer(row[3], dtype=np.int32), np.frombuffer(row[4], dtype=np.float32))
+                yield row[0], row[1], vector
+
+    def get_vectors(self, conn, owner_type, owner_ids):
+        """Fetch current vectors by id, building any missing or stale ones"""
+        if not self.matcher.corpus_mode or not owner_ids:
+            return {}
+
+        self.ensure_schema(conn)
+        vectors = {}
+        stale = False
+        for owner_id, skills_text, vector in self._current_rows(conn, owner_type, list(owner_ids)):
+            if vector is None:
+                vector = self.upsert(conn, owner_type, owner_id, skills_text)
+                stale = True
+            vectors[owner_id] = vector
+        if stale:
+            conn.commit()
+
+        return vectors
+
+    def get_vector(self, conn, owner_type, owner_id):
+        """Fetch a single vector, or None if the owner does not exist"""
+        return self.get_vectors(conn, owner_type, [owner_id]).get(owner_id)
+
+    def score(self, conn, job_id, user_id):
+        """Compatibility percentage from stored vectors, or None if unavailable"""
+        job_vector = self.get_vector(conn, 'job', job_id)
+        profile_vector = self.get_vector(conn, 'profile', user_id)
+        if job_vector is None or profile_vector is None:
+            return None
+
+        similarity = sparse_dot(job_vector, profile_vector)
+        return int(round(max(0, min(100, similarity * 100))))
+
+    def score_many(self, conn, user_id, job_ids):
+        """Score one profile against many jobs, or None if unavailable
+
+        Stacks the stored job vectors into a CSR matrix and scores them all
+        with one sparse matrix-vector product. Returns {job_id: percentage}.
+        """
+        profile_vector = self.get_vector(conn, 'profile', user_id)
+        if profile_vector is None:
+            return None
+
+        job_ids = list(job_ids)
+        job_vectors = self.get_vectors(conn, 'job', job_ids)
+        matrix = to_csr_matrix([job_vectors.get(job_id, EMPTY_VECTOR) for job_id in job_ids],
+                               len(self.matcher.corpus_vectorizer.vocabulary_))
+
+        profile = np.zeros(matrix.shape[1], dtype=np.float32)
+        profile[profile_vector[0]] = profile_vector[1]
+        similarities = np.clip(matrix @ profile * 100, 0, 100)
+        return {job_id: int(round(score)) for job_id, score in zip(job_ids, similarities)}
+
+    def rebuild(self, conn):
+        """Re-encode every job and profile whose vector is missing or stale"""
+        if not self.matcher.corpus_mode:
+            return 0
+
+        self.ensure_schema(conn)
+        count = 0
+        for owner_type in VECTOR_SOURCES:
+            for owner_id, skills_text, vector in list(self._current_rows(conn, owner_type)):
+                if vector is None:
+                    self.upsert(conn, owner_type, owner_id, skills_text)
+                    count += 1
+
+        # Drop vectors left over from earlier vocabularies
+        conn.execute('DELETE FROM skill_vectors WHERE vocabulary != ?', (self.vocabulary,))
+        conn.commit()
+        return count
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Compatibility cache checks for app.calculate_compatibility
+
+Strategies other than TF-IDF read the raw skills strings, so two strings
+that only preprocess alike must not share a cached score.
+"""
+
+import os
+
+# Importing app must not start its background threads
+os.environ.setdefault('JOBSYNC_DEFER_BACKGROUND_WORKERS', '1')
+
+import app as jobsync_app
+
+
+def scores_with(strategy, pairs):
+    """Cached and uncached scores of pairs under one primary strategy"""
+    registry = jobsync_app.matcher_registry
+    previous = registry.primary
+    registry.primary = strategy
+    try:
+        jobsync_app.compatibility_cache.entries.clear()
+        uncached = [registry.score(job_skills, user_skills) for job_skills, user_skills in pairs]
+        jobsync_app.compatibility_cache.entries.clear()
+        cached = [jobsync_app.calculate_compatibility(job_skills, user_skills) for job_skills, user_skills in pairs]
+        return cached, uncached
+    finally:
+        registry.primary = previous
+
+
+def test_basic_scores_are_cached_per_raw_string():
+    pairs = [
+        ('javascript', 'js'),
+        ('javascript', 'javascript'),
+        ('python; java', 'python'),
+        ('python, java', 'python'),
+    ]
+    cached, uncached = scores_with('basic', pairs)
+    assert cached == uncached
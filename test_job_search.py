@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Pagination checks for job_search.py
+
+Fills an in-memory database with more matching jobs than the blend pool
+holds and pages through the results; no job may appear on two pages.
+"""
+
+import sqlite3
+
+import job_search
+from db_migrations import MIGRATIONS
+from job_search import BLEND_POOL_SIZE, search_jobs
+
+JOB_COUNT = BLEND_POOL_SIZE + 50
+
+
+def build_database():
+    """Jobs whose text rank and compatibility disagree, with the FTS index"""
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, company_name TEXT)')
+    conn.execute('''
+        CREATE TABLE jobs (
+            id INTEGER PRIMARY KEY, employer_id INTEGER, title TEXT, description TEXT,
+            requirements TEXT, skills TEXT, salary TEXT, location TEXT, job_type TEXT, posted_at TIMESTAMP
+        )
+    ''')
+    conn.execute("INSERT INTO users (id, username, company_name) VALUES (1, 'employer', 'Acme')")
+    conn.executemany('''
+        INSERT INTO jobs (employer_id, title, description, requirements, skills, location, job_type)
+        VALUES (1, ?, ?, '', 'Python', 'Remote', 'full-time')
+    ''', [(f'Job {i}', ' '.join(['python'] * (i % 7 + 1) + ['filler'] * (i % 11))) for i in range(JOB_COUNT)])
+
+    # The FTS table and its triggers from the jobs_fts migration
+    for version, _, steps in MIGRATIONS:
+        if version == 4:
+            for step in steps:
+                conn.execute(step)
+    return conn
+
+
+def compatibility(rows):
+    return {row['id']: row['id'] * 37 % 101 for row in rows}
+
+
+def collect_pages(conn, limit, **options):
+    """Job ids of every page, following next_offset until it runs out"""
+    pages = []
+    offset = 0
+    while offset is not None:
+        results, offset = search_jobs(conn, 'python', limit=limit, offset=offset, **options)
+        pages.append([result['job_id'] for result in results])
+    return pages
+
+
+def test_blended_pages_do_not_overlap():
+    """Blended pages partition one re-ranked pool and stop where it ends"""
+    conn = build_database()
+    pages = collect_pages(conn, 30, score_jobs=compatibility, blend=0.5)
+    job_ids = [job_id for page in pages for job_id in page]
+
+    assert len(job_ids) == len(set(job_ids)) == BLEND_POOL_SIZE
+    assert search_jobs(conn, 'python', limit=30, offset=BLEND_POOL_SIZE,
+                       score_jobs=compatibility, blend=0.5) == ([], None)
+
+
+def test_text_pages_do_not_overlap():
+    """Unblended pages reach every match, and the last one has no next offset"""
+    conn = build_database()
+    pages = collect_pages(conn, 40)
+    job_ids = [job_id for page in pages for job_id in page]
+
+    assert len(job_ids) == len(set(job_ids)) == JOB_COUNT
+    assert all(pages)
+
+
+def test_text_pages_stop_at_the_result_cap(monkeypatch):
+    """Plain paging never ranks past MAX_SEARCH_RESULTS matches"""
+    monkeypatch.setattr(job_search, 'MAX_SEARCH_RESULTS', 100)
+    conn = build_database()
+    pages = collect_pages(conn, 40)
+    job_ids = [job_id for page in pages for job_id in page]
+
+    assert len(job_ids) == len(set(job_ids)) == 100
+    assert search_jobs(conn, 'python', limit=40, offset=10 ** 9) == ([], None)
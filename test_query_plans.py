@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Query plan checks for the JobSync route queries
+
+Runs EXPLAIN QUERY PLAN for the SQL the routes run, imported from app.py,
+job_listing.py and job_search.py, against a migrated copy of jobportal.db
+and checks that each query uses the index added for it and does not fall
+back to a full scan or a temporary sort.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+# Importing app must not start its background threads
+os.environ.setdefault('JOBSYNC_DEFER_BACKGROUND_WORKERS', '1')
+
+import app as jobsync_app
+from db_migrations import migrate
+from job_listing import build_jobs_query
+from job_search import build_match_query, build_search_query
+
+# (description, SQL, parameters, index the plan must use); the SQL is the
+# routes' own, so a route query that stops using its index fails here
+ROUTE_QUERIES = [
+    # users.email is UNIQUE, so its automatic index already serves logins
+    ('login', jobsync_app.LOGIN_QUERY, ('demo@example.com', 'x'), 'sqlite_autoindex_users_1'),
+    ('profile lookup', jobsync_app.PROFILE_QUERY, (1,), 'idx_user_profiles_user'),
+    ('apply_job duplicate check', jobsync_app.APPLICATION_EXISTS_QUERY, (1, 1), 'idx_applications_job_applicant'),
+    ('jobseeker dashboard applications', jobsync_app.JOBSEEKER_APPLICATIONS_QUERY, (1,),
+     'idx_applications_applicant'),
+    ('employer dashboard jobs', jobsync_app.EMPLOYER_JOBS_QUERY, (1,), 'idx_jobs_employer'),
+    ('employer dashboard applications', jobsync_app.EMPLOYER_APPLICATIONS_QUERY, (1,),
+     'idx_applications_employer'),
+    ('job listing', *build_jobs_query(), 'idx_jobs_posted_at'),
+    ('job listing next page', *build_jobs_query(after=('2025-05-30 09:24:21', 3)), 'idx_jobs_posted_at'),
+    ('job listing by type', *build_jobs_query(job_type='full-time', after=('2025-05-30 09:24:21', 3)),
+     'idx_jobs_type_posted_at'),
+    # Keywords are a set lookup in jobs_fts, not a LIKE over every job's text
+    ('job listing by keyword', *build_jobs_query(keyword='python', after=('2025-05-30 09:24:21', 3)),
+     'idx_jobs_posted_at'),
+    ('job search', *build_search_query(build_match_query('python developer'), exclude_employer_id=1),
+     'jobs_fts VIRTUAL TABLE'),
+    ('evaluation data', jobsync_app.EVALUATION_APPLICATIONS_QUERY, (), 'idx_applications_applied_at'),
+    ('newsfeed', jobsync_app.NEWSFEED_QUERY, (1,), 'idx_news_posts_created_at'),
+    ('post comments', jobsync_app.POST_COMMENTS_QUERY, (1,), 'idx_post_comments_post'),
+    ('chat history', jobsync_app.CHAT_HISTORY_QUERY, (), 'idx_chat_messages_timestamp'),
+]
+
+# bm25 is computed per match, so ranked search sorts its matches; the check
+# is that it reads them from the FTS index rather than scanning jobs
+SORTED_BY_RANK = {'job search'}
+
+
+def migrated_copy():
+    """Connection to a migrated temporary copy of jobportal.db"""
+    workdir = tempfile.mkdtemp(prefix='jobsync_plans_')
+    path = os.path.join(workdir, 'jobportal.db')
+    shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobportal.db'), path)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    # Let the planner see realistic statistics
+    conn.execute('ANALYZE')
+    return conn, workdir
+
+
+def query_plan(conn, sql, params):
+    """EXPLAIN QUERY PLAN detail lines"""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def plan_problems(plan, index, allow_sort=False):
+    """Why a plan is not acceptable; empty when it is"""
+    problems = []
+    if not any(index in line for line in plan):
+        problems.append(f'does not use {index}')
+    if not allow_sort and any('TEMP B-TREE' in line for line in plan):
+        problems.append('sorts with a temporary b-tree')
+    return problems
+
+
+def test_query_plans():
+    """Every route query uses its index without an unexpected temporary sort"""
+    conn, workdir = migrated_copy()
+    try:
+        failures = {}
+        for description, sql, params, index in ROUTE_QUERIES:
+            problems = plan_problems(query_plan(conn, sql, params), index, description in SORTED_BY_RANK)
+            if problems:
+                failures[description] = problems
+        assert not failures, failures
+    finally:
+        conn.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    print("🔍 Checking query plans of route queries...")
+    conn, workdir = migrated_copy()
+    failed = 0
+    for description, sql, params, index in ROUTE_QUERIES:
+        plan = query_plan(conn, sql, params)
+        problems = plan_problems(plan, index, description in SORTED_BY_RANK)
+        print(f"{'❌' if problems else '✅'} {description}")
+        for line in plan:
+            print(f"     {line}")
+        for problem in problems:
+            print(f"     ⚠️ {problem}")
+        failed += bool(problems)
+    conn.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{len(ROUTE_QUERIES) - failed}/{len(ROUTE_QUERIES)} queries use their indexes")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Requirement checks for app.recommend_jobs
+
+Recommends jobs from the inverted index on a migrated copy of jobportal.db,
+then gives the top jobs weights and a must-have the candidate lacks; the
+index path must honor them as the /jobs scoring does.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+# Importing app must not start its background threads
+os.environ.setdefault('JOBSYNC_DEFER_BACKGROUND_WORKERS', '1')
+
+import app as jobsync_app
+from db_migrations import migrate
+from skill_requirements import JOB_SKILL_REQUIREMENTS_SCHEMA
+
+
+def test_index_recommendations_honor_requirements():
+    workdir = tempfile.mkdtemp(prefix='jobsync_recommend_')
+    try:
+        database = os.path.join(workdir, 'jobportal.db')
+        shutil.copy('jobportal.db', database)
+        conn = sqlite3.connect(database)
+        conn.row_factory = sqlite3.Row
+        migrate(conn)
+        # Created by init_db, which the committed database predates
+        conn.execute(JOB_SKILL_REQUIREMENTS_SCHEMA)
+
+        profile = conn.execute('''
+            SELECT * FROM user_profiles WHERE skills IS NOT NULL AND skills != '' ORDER BY user_id LIMIT 1
+        ''').fetchone()
+        jobsync_app.recommendation_cache.entries.clear()
+        before = jobsync_app.recommend_jobs(conn, profile, 10)
+        assert len(before) >= 2
+
+        # The best job now needs a skill nobody has; the second is weighted
+        missing_job, weighted_job = before[0]['job_id'], before[1]['job_id']
+        candidate_skill = jobsync_app.skill_matcher.normalizer.normalize(profile['skills'])[0]
+        store = jobsync_app.skill_requirement_store
+        store.save(conn, missing_job, [('cobol-mainframe-assembler', 1, True)])
+        store.save(conn, weighted_job, [(candidate_skill, 3, False), ('cobol-mainframe-assembler', 1, False)])
+        conn.commit()
+
+        jobsync_app.recommendation_cache.entries.clear()
+        after = {result['job_id']: result['compatibility_score']
+                 for result in jobsync_app.recommend_jobs(conn, profile, 10)}
+        assert missing_job not in after
+        assert after[weighted_job] == 75
+        conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Rescoring checks for rescore_applications.py
+
+Builds a small throwaway database, stores application scores the way
+apply_job does and runs the bulk rescore over it; scores must come out
+unchanged, including those of jobs with weighted and must-have skills.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from rescore_applications import rescore
+from skill_matching import SkillMatcher
+from skill_requirements import SkillRequirementStore, parse_skill_requirements, weighted_pair_score
+
+SCHEMA = [
+    'CREATE TABLE jobs (id INTEGER PRIMARY KEY, skills TEXT)',
+    'CREATE TABLE user_profiles (user_id INTEGER PRIMARY KEY, skills TEXT)',
+    '''CREATE TABLE applications (
+        id INTEGER PRIMARY KEY, job_id INTEGER, applicant_id INTEGER, compatibility_score INTEGER
+    )''',
+]
+
+# (skills, required skills, skill weights) per job
+JOBS = {
+    1: ('Python, Flask, Docker, SQL', 'Python', 'Docker=3, SQL=2'),
+    2: ('JavaScript, React, CSS', '', ''),
+}
+
+PROFILES = {
+    10: 'Python, Flask',
+    11: 'Python, Docker, SQL, Git',
+    12: 'React, JavaScript, HTML',
+}
+
+
+def build_database(workdir):
+    """Database and saved vocabulary with applications scored as apply_job does"""
+    database = os.path.join(workdir, 'jobportal.db')
+    vectorizer_path = os.path.join(workdir, 'skill_vectorizer.pkl')
+
+    matcher = SkillMatcher(vectorizer_path=vectorizer_path)
+    matcher.fit_corpus([skills for skills, _, _ in JOBS.values()] + list(PROFILES.values()))
+    matcher.save_vectorizer()
+
+    conn = sqlite3.connect(database)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    store = SkillRequirementStore(matcher)
+    for job_id, (skills, required, weights) in JOBS.items():
+        conn.execute('INSERT INTO jobs (id, skills) VALUES (?, ?)', (job_id, skills))
+        requirements = parse_skill_requirements(matcher.normalizer, skills, required, weights)
+        if requirements:
+            store.save(conn, job_id, requirements)
+    conn.executemany('INSERT INTO user_profiles (user_id, skills) VALUES (?, ?)', PROFILES.items())
+
+    for job_id, (skills, _, _) in JOBS.items():
+        requirements = store.load(conn, [job_id]).get(job_id)
+        for user_id, candidate in PROFILES.items():
+            if requirements:
+                score = weighted_pair_score(requirements, matcher.normalizer.skill_ids(candidate))
+            else:
+                score = matcher.score_pairs([(skills, candidate)])[0]
+            conn.execute(
+                'INSERT INTO applications (job_id, applicant_id, compatibility_score) VALUES (?, ?, ?)',
+                (job_id, user_id, score)
+            )
+    conn.commit()
+    return conn, database, vectorizer_path
+
+
+def stored_scores(conn):
+    return dict(conn.execute('SELECT id, compatibility_score FROM applications').fetchall())
+
+
+def test_rescore_keeps_weighted_scores():
+    """Rescoring reproduces the weighted and plain scores apply_job stored"""
+    workdir = tempfile.mkdtemp(prefix='jobsync_rescore_')
+    try:
+        conn, database, vectorizer_path = build_database(workdir)
+        before = stored_scores(conn)
+        # Weighted job: the weights decide the score, a missing must-have zeroes it
+        assert (before[1], before[2], before[3]) == (29, 86, 0)
+
+        rescore(database, workers=1, chunk_size=2, restart=True, vectorizer_path=vectorizer_path, strategy='tfidf')
+
+        assert stored_scores(conn) == before
+        conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
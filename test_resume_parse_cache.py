@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Size accounting and cleanup checks for resume_parse_cache.py
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from resume_parse_cache import ResumeParseCache, cache_entries, cleanup
+
+
+def test_overwriting_an_entry_keeps_the_size_exact():
+    cache_dir = tempfile.mkdtemp(prefix='jobsync_parse_cache_')
+    try:
+        cache = ResumeParseCache('a' * 64, cache_dir)
+        for _ in range(5):
+            assert cache.put('ab' * 32, 'resume text', {'skills': 'Python'})
+
+        on_disk = sum(size for _, _, size in cache_entries(cache.directory))
+        assert cache.stats()['size_bytes'] == on_disk
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def test_other_models_survive_until_cleanup():
+    """Opening a cache leaves other fingerprints alone; cleanup prunes them all"""
+    cache_dir = tempfile.mkdtemp(prefix='jobsync_parse_cache_')
+    try:
+        old = ResumeParseCache('a' * 64, cache_dir)
+        old.put('ab' * 32, 'old text', {'skills': 'Python'})
+        stale_path = old._path('ab' * 32)
+        a_month_ago = time.time() - 30 * 86400
+        os.utime(stale_path, (a_month_ago, a_month_ago))
+
+        new = ResumeParseCache('b' * 64, cache_dir)
+        new.put('cd' * 32, 'new text', {'skills': 'SQL'})
+        assert os.path.exists(stale_path)
+
+        removed, _ = cleanup(cache_dir, max_age_seconds=7 * 86400)
+        assert removed == 1
+        assert not os.path.exists(old.directory)
+        assert new.get('cd' * 32) is not None
+
+        removed, size = cleanup(cache_dir, max_bytes=0)
+        assert (removed, size) == (1, 0)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Lease checks for resume_parse_queue.py
+
+Uses a throwaway database and plays the part of a worker that died or hung
+mid-parse by leaving a job running under a lease that has already expired.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from resume_parse_queue import PARSE_MAX_ATTEMPTS, ResumeParseQueue
+
+
+def build_queue(workdir, parsed):
+    """Queue over a temp database whose parser records the files it was given"""
+    database = os.path.join(workdir, 'jobportal.db')
+
+    def connect():
+        conn = sqlite3.connect(database)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def parse(file_path):
+        parsed.append(file_path)
+        return {'skills': 'Python'}
+
+    return ResumeParseQueue(connect, parse, lambda conn, job, result: None, workers=0), connect
+
+
+def expire_lease(connect, job_id, attempts):
+    """Leave a job as a dead worker would: running, with its lease in the past"""
+    conn = connect()
+    conn.execute('''
+        UPDATE resume_parse_jobs SET status = 'running', attempts = ?, lease_expires_at = ?
+        WHERE id = ?
+    ''', (attempts, time.time() - 1, job_id))
+    conn.commit()
+    conn.close()
+
+
+def job_row(connect, job_id):
+    conn = connect()
+    row = conn.execute('SELECT * FROM resume_parse_jobs WHERE id = ?', (job_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def test_expired_lease_is_retried_while_attempts_remain():
+    workdir = tempfile.mkdtemp(prefix='jobsync_parse_queue_')
+    try:
+        parsed = []
+        queue, connect = build_queue(workdir, parsed)
+        conn = connect()
+        job_id = queue.enqueue(conn, 1, 'resume.pdf', 'resume.pdf')
+        conn.close()
+        expire_lease(connect, job_id, PARSE_MAX_ATTEMPTS - 1)
+
+        assert queue.process_one()
+        row = job_row(connect, job_id)
+        assert (row['status'], row['attempts']) == ('done', PARSE_MAX_ATTEMPTS)
+        assert parsed == ['resume.pdf']
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def test_expired_lease_after_last_attempt_fails_the_job():
+    """A job whose final lease ran out is failed, not handed to another worker"""
+    workdir = tempfile.mkdtemp(prefix='jobsync_parse_queue_')
+    try:
+        parsed = []
+        queue, connect = build_queue(workdir, parsed)
+        conn = connect()
+        job_id = queue.enqueue(conn, 1, 'resume.pdf', 'resume.pdf')
+        conn.close()
+        expire_lease(connect, job_id, PARSE_MAX_ATTEMPTS)
+
+        assert not queue.process_one()
+        row = job_row(connect, job_id)
+        assert (row['status'], row['attempts']) == ('failed', PARSE_MAX_ATTEMPTS)
+        assert row['lease_expires_at'] is None and row['finished_at'] is not None
+        assert parsed == []
+        assert queue.stats()['failed'] == 1
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Interning checks for skill_matching.SkillNormalizer
+
+Only skills of stored jobs and profiles are interned; scoring arbitrary
+request input must leave the skill ID table as it was.
+"""
+
+from skill_matching import SkillMatcher
+from skill_requirements import intern_requirements, weighted_pair_score
+
+
+def test_request_input_is_not_interned():
+    matcher = SkillMatcher()
+    normalizer = matcher.normalizer
+    normalizer.skill_ids('Python, Flask')
+    interned = dict(normalizer._skill_ids)
+
+    for i in range(200):
+        job_skills, user_skills = f'Python, Skill{i}', f'python, Other{i}, skill{i}'
+        matcher.basic_compatibility(job_skills, user_skills)
+        matcher.match_details(job_skills, user_skills)
+        normalizer.known_skill_ids(user_skills)
+
+    assert normalizer._skill_ids == interned
+    assert matcher.basic_compatibility('Python, Skill7', 'python, skill7') == 100
+
+
+def test_requirements_see_skills_interned_after_a_lookup():
+    """A skill looked up before a stored job interns it still counts"""
+    matcher = SkillMatcher()
+    normalizer = matcher.normalizer
+    assert normalizer.known_skill_ids('Rust, Go') == frozenset()
+
+    requirements = intern_requirements(normalizer, {1: [('rust', 2, True), ('go', 1, False)]})[1]
+    assert weighted_pair_score(requirements, normalizer.known_skill_ids('Rust, Go')) == 100
+    assert weighted_pair_score(requirements, normalizer.known_skill_ids('Go')) == 0